@@ -1,382 +1,1149 @@
-import abstractstrategy
-import checkerboard
-
-
-class Minimax:
-    """The Minimax class uses minimax algorithm for determining the best move for the AI player in checkers. Generic
-    minimax algorithm is enhanced with alpha beta pruning (which does not change the decision of the minimax
-    algorithm) and utility function is replaced by heuristic evaluation function (approximation) at the specified
-    cutoff (we call this parameter max_plies). We use utility and heuristic evaluation function interchangeably in
-    this code. """
-
-    # the following variables are designed to be shared by all instances of Minimax class.
-    pos_infinity = float("inf")
-    neg_infinity = float("-inf")
-    # actual utilities of terminal (leaf) nodes in search tree
-    utility_win = 1000000  # actual utility of winning
-    utility_lose = -1000000  # actual utility of losing
-    utility_tie = 0  # actual utility of a draw
-
-    def __init__(self, max_player, min_player, max_plies, strategy):
-        """ the max_player - the player whose best move we are determining. the min_player - the other player. It is
-        assumed that min_player plays a perfect game. max_plies - a parameter indicating where the cutoff should be
-        applied strategy - an instance of the class containing heuristic evaluation function """
-
-        self.max_player = max_player
-        self.min_player = min_player
-        self.max_plies = max_plies
-        self.strategy = strategy
-
-    def Game_Over_Utility(self, winner):
-        """Game_Over_Utility returns the utility of the end of the game based on the winner: 'r', 'b' or None. None
-        indicates a tie - there is no winner """
-        if winner is None:  # tie
-            return Minimax.utility_tie
-        elif winner == self.max_player:  # win
-            return Minimax.utility_win
-        else:  # loss
-            return Minimax.utility_lose
-
-    def Cut_Off_Test(self, ply_counter):
-        """This method checks if sufficient depth in the search tree has been reached to apply cutoff function"""
-        return ply_counter >= self.max_plies
-
-    def Alpha_Beta_Search(self, current_board_state):
-        """This method uses alpha-beta search to determine the best move for MAX player based on the current
-        configuration of the checkerboard. It returns the action which will result in the value v (the highest
-        utility). This portion of the code is based on Figure 5.7 from our textbook (chp 5) with appropriate
-        modifications introduced
-
-        current_board_state - the representation of the current configuration of the checkerboard
-
-        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
-        path for MAX.
-        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
-        path for MIN. """
-
-        alpha = self.neg_infinity
-        beta = self.pos_infinity
-        # variable ply_counter will keep count of how many plies "deep" the search goes
-        # As suggested in out textbook, we keep a counter that is updated during every
-        # recursive call
-        ply_counter = 1
-
-        maximum_utility, best_move = self.Max_Value(current_board_state, alpha, beta, ply_counter)
-        return best_move
-
-    def Max_Value(self, current_board_state, alpha, beta, ply_counter):  # when does this return None ???
-        """This method returns the utility value of the best action from the Max player's point of view and the
-        action leading to that utility value
-
-        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
-        path for MAX.
-        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
-        path for MIN.
-        """
-
-        alpha_ = alpha
-        beta_ = beta
-
-        """this ply could be a terminal state, we can check that by using is_terminal() function implemented in 
-        checkerboard.py. In case, the current ply is terminal we do not need to approximate utility by using 
-        heuristic evaluation function, we can just return the utility of winning, losing, or a tie. """
-
-        (game_over, winner) = current_board_state.is_terminal()
-        if game_over:
-            # return actual utility
-            return self.Game_Over_Utility(winner), None
-        elif self.Cut_Off_Test(ply_counter):
-            # return approximation of the utility
-            return self.strategy(current_board_state), None
-        else:
-            # go deeper down the search tree
-
-            # v_maximum_utility is used as an index to retrieve best move from choices
-            # v_maximum_utility will never stay negative infinity since even if the loss
-            # of the game is encountered, it is marked by -1000000 > float("-inf")
-            v_maximum_utility = float("-inf")
-            # 'choices' dictionary will hold all the possible moves indexed by utility
-            # associated with the move. If there are multiple moves resulting in the
-            # same utility, then the last one encountered will be saved and selected later.
-            choices = {}
-            # actions is the list of valid actions actions should not be an empty
-            # list since we have already checked if state was terminal. If player does
-            # not have any moves then state is terminal
-            actions = current_board_state.get_actions(self.max_player)
-
-            for action in actions:
-                # this portion of the code heavily relies on algorithm outlined on Figure 5.7 on pg. 170 of our
-                # textbook. We are borrowing from the pseudocode and translating
-                resulting_child_node = current_board_state.move(action)
-                current_utility, move = self.Min_Value(resulting_child_node, alpha_, beta_, ply_counter + 1)
-                # add utility and action pair to choices
-                choices.update({current_utility: action})
-                v_maximum_utility = max(v_maximum_utility, current_utility)
-
-                if v_maximum_utility >= beta_:
-                    return v_maximum_utility, action
-                alpha_ = max(alpha_, v_maximum_utility)
-            return v_maximum_utility, choices.get(v_maximum_utility)
-
-    def Min_Value(self, current_board_state, alpha, beta, ply_counter):
-        """This method returns the utility value of the best action from the Min player's point of view, the worst
-        action from the Max player's point of view, and the action leading to that utility value
-
-        current_board_state - the representation of the current configuration of the checkerboard
-        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
-        path for MAX.
-        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
-        path for MIN."""
-
-        _alpha = alpha
-        _beta = beta
-
-        """just like in Max_Value this ply could be a terminal state, we can check that by using is_terminal() function 
-        implemented in checkerboard.py. In case, the current ply is terminal we do not need to approximate utility by 
-        using heuristic evaluation function, we can just return the utility of winning, losing, or a tie. """
-
-        (game_over, winner) = current_board_state.is_terminal()
-        if game_over:
-            # return actual utility
-            return self.Game_Over_Utility(winner), None
-        elif self.Cut_Off_Test(ply_counter):
-            # return approximation of the utility
-            return self.strategy.utility(current_board_state), None
-        else:
-            # go deeper down the search tree
-
-            # v_minimum_utility is used as an index to retrieve best move (for min)
-            # from choices
-            # v_minimum_utility will never positive infinity since even if the win
-            # of the game is encountered, it is marked by 1000000 < float("inf")
-            v_minimum_utility = float("inf")
-            # 'choices' dictionary will hold all the possible moves indexed by utility
-            # associated with the move. If there are multiple moves resulting in the
-            # same utility, then the last one encountered will be saved and selected.
-            choices = {}
-            # actions is the list of valid actions actions should not be an empty
-            # list since we have already checked if state was terminal. If player does
-            # not have any moves then state is terminal
-            actions = current_board_state.get_actions(self.min_player)
-
-            for action in actions:
-                # this portion of the code heavily relies on algorithm outlined
-                # on Figure 5.7 on pg. 170 of our textbook. We are borrowing
-                # from the pseudocode and translating
-                resulting_child_node = current_board_state.move(action)
-                current_utility, move = self.Max_Value(resulting_child_node, _alpha, _beta, ply_counter + 1)
-                # add utility and action pair to choices
-                choices.update({current_utility: action})
-                v_minimum_utility = min(v_minimum_utility, current_utility)
-                if v_minimum_utility <= _alpha:
-                    return v_minimum_utility, action
-                _beta = min(_beta, v_minimum_utility)
-            return v_minimum_utility, choices.get(v_minimum_utility)
-
-
-class AI(abstractstrategy.Strategy):
-    """AI is a checker playing strategy class using Minimax with alpha-beta pruning algorithm as a searching strategy
-    to play checkers and heuristic evaluation function - utility function to evaluate current state of the
-    checkerboard """
-
-    def __init__(self, player, game, max_plies):
-        # calls abstractstrategy.Strategy's constructor
-        super(AI, self).__init__(player, game, max_plies)
-        # instantiating a searching methodology class Minimax defined above
-        self.searching_strategy = Minimax(self.maxplayer, self.minplayer, self.maxplies, self)
-
-    def play(self, board):
-        """"play - Make a move. Given a board, play returns (newboard, action) where newboard is the result of having
-        applied action to board and action is determined via a game tree search (e.g. minimax with alpha-beta pruning).
-        """
-        print("Levan's AI player's alpha beta search In progress...")
-        # find a best move using alpha-beta pruning
-        best_move = self.searching_strategy.Alpha_Beta_Search(board)
-        # if move exists, move
-        new_board = board.move(best_move) if (best_move is not None) else board
-        return new_board, best_move
-
-    def utility(self, board):
-        """utility is heuristic evaluation function (namely, a weighted linear function) - it
-        approximates utility of the given checkerboard from the MAX player's viewpoint, in other words
-        determines strength of the current checkerboard configuration relative to the MAX player.
-
-        The following function computes several features known to be an important predictor
-        of checkers game outcome. This analysis heavily relies on the article "Basic Strategies
-        for Winning at Checkers" Written by Seth Brow available here:
-        https://www.thesprucecrafts.com/how-to-win-at-checkers-411170  """
-
-        # index of max player
-        self.maxplayer_index = board.playeridx(self.maxplayer)
-
-        # feature 1: Percentage difference of the amount of player's pawns and enemy's pawns
-        # feature 2: Percentage difference of the amount of player's kings and enemy's kings
-        pawn_p_difference, king_p_difference = self.Pawn_Perc_Diff(board)
-
-        # feature 3: the difference between the amount of pieces on the home row for MAX player and the amount of
-        # enemy pieces on the enemy home row
-        relative_home_row_count = self.Home_Row_Pieces(board)
-
-        # feature 4: how close are the pawns to becoming the king relative to enemy
-        relative_getting_kinged = self.Distance_From_Kinged(board)
-
-        # feature 5: difference between the amount of MAX player (this is bad for MAX player) and enemy pieces on the
-        # edge columns (this is good for MAX player)
-        relative_edge_count = self.Edge_Piece_Count(board)
-
-        # w_{i} is the weight for the ith feature weights here are simply chosen based on our intuition. Machine
-        # learning would be the best way to determine these weights
-        w_1, w_2, w_3, w_4, w_5 = 2, 3, 5, 5, 2
-
-        utility = int(
-            w_1 * pawn_p_difference +
-            w_2 * king_p_difference +
-            w_3 * relative_home_row_count +
-            w_4 * relative_getting_kinged +
-            w_5 * relative_edge_count)
-
-        return utility if (utility is not None) else 0
-
-    def Pawn_Perc_Diff(self, board):
-        """Pawn_Diff returns Percentage difference of the amount of player's pawns and enemy's pawns and Percentage
-        difference of the amount of player's kings and enemy's kings.
-
-        Percentage difference here is calculated to equal the change in value, divided by the average of the 2
-        numbers, all multiplied by 100. We retain + or - sign, since we want to evaluate from MAX player's point of
-        view.
-
-        The reasoning behind using percentage difference instead of the simple difference is to account for the fact
-        that advantage of number of pieces is far more important when the total amount of pieces on the board is
-        small. "With only 12 pieces on the board, to begin with, you may quickly end up with an 8-7 piece advantage.
-        This may not seem like a big deal, but if you can trade four pieces, you suddenly have a 4-3 advantage,
-        which is a tremendous amount of power." """
-
-        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
-        # testing purposes only
-        self.maxplayer_index = board.playeridx(self.maxplayer)
-
-        board.recount_pieces()  # just to make sure pieces are correctly counted
-        # the following lists contain number of pieces indexed by playerindex
-        pawns = board.get_pawnsN()
-        kings = board.get_kingsN()
-
-        # player indices
-        max_player_index = self.maxplayer_index
-        min_player_index = (max_player_index + 1) % 2
-
-        # number of pieces (pawns and king) for each player
-        player_pawns = pawns[max_player_index]
-        player_kings = kings[max_player_index]
-        enemy_pawns = pawns[min_player_index]
-        enemy_kings = kings[min_player_index]
-
-        # calculations of Percentage difference for each piece type
-        pawn_difference = int((player_pawns - enemy_pawns) / (
-                (player_pawns + enemy_pawns) / 2.0) * 100) if player_pawns + enemy_pawns > 0 else 0
-        king_difference = int((player_kings - enemy_kings) / (
-                (player_kings + enemy_kings) / 2.0) * 100) if player_kings + enemy_kings > 0 else 0
-
-        return pawn_difference, king_difference
-
-    def Home_Row_Pieces(self, board):
-        """Home_Row_Pieces return the difference between the amount of pieces on the home   row for maxplayer and
-        enemy. Keeping pieces on the home row is a good strategy since it will prevent enemy from getting their
-        pieces kinged.
-
-        reasoning: "Your opponent cannot get any kinged checkers without advancing into one of your four home spaces.
-        Keeping these spaces occupied guarantees that your opponent will get no kings until your checkers move.
-        Generally speaking, you probably won't move these checkers until you are forced to capture an opposing piece,
-        or if you are running low on checkers."
-
-        board - current board state"""
-
-        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
-        # testing purposes only
-        self.maxplayer_index = board.playeridx(self.maxplayer)
-
-        # figure out what is the legal direction for the max player
-        direction = board.pawnmoves[self.maxplayer][0][0]
-        # according to the direction, assign home and enemy's home rows accordingly
-        home_row, enemy_home_row = (7, 0) if direction < 0 else (0, 7)
-
-        home_row_piece_count = 0
-        # traverse home row
-        for c in range(board.coloffset[home_row], board.cols, board.step):
-            # there is a piece and piece belongs to the MAX player, then increment count
-            if board.board[home_row][c] and \
-                    board.board[home_row][c] in board.players[self.maxplayer_index]:
-                home_row_piece_count += 1
-
-        enemy_home_piece_count = 0
-        # traverse enemy home row
-        for c in range(board.coloffset[enemy_home_row], board.cols, board.step):
-            # there is a piece and piece belongs to the enemy, then increment count
-            if board.board[enemy_home_row][c] and \
-                    board.board[enemy_home_row][c] in board.players[(self.maxplayer_index + 1) % 2]:
-                enemy_home_piece_count += 1
-
-        return home_row_piece_count - enemy_home_piece_count
-
-    def Distance_From_Kinged(self, board):
-        """Distance_From_Kinged return the total distances of enemy's pawns from getting kinged (the bigger this
-        number is the better for MAX player) minus the total distances of MAX player's pawns from getting kinged (the
-        smaller this number is the better for the MAX player)
-
-        reasoning: "A kinged piece is incredibly powerful, and generally speaking, the player who kings more checkers
-        will win. While capturing opposing checkers is generally a good thing, your biggest concern should always be
-        kinging your own checkers."
-
-        board - current board state"""
-
-        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
-        # testing purposes only
-        self.maxplayer_index = board.playeridx(self.maxplayer)
-
-        max_player_total = 0
-        enemy_total = 0
-
-        # for each existing piece on the board
-        for (row, column, piece) in board:
-            # figure out index of the owner of the pieces and whether piece is king or a pawn
-            player_index, is_king = checkerboard.CheckerBoard.identifypiece(piece)
-            # if piece is pawn
-            if not is_king:
-                # count distances using disttoking() method provided in checkerboard.py
-                distance_to_kinged = board.disttoking(board.pawns[player_index], row)
-                if player_index == self.maxplayer_index:
-                    max_player_total += distance_to_kinged
-                else:
-                    enemy_total += distance_to_kinged
-        return enemy_total - max_player_total
-
-    def Edge_Piece_Count(self, board):
-        """Edge_Piece_Count returns the difference between the amount of maxplayer and enemy pieces on the edge
-        columns.
-        reasoning: "For beginners, the first strategy one often figures out is to place your checkers on the edge of
-        the board. This seems like a reasonable Checkers strategy because your pieces on the edge cannot be captured.
-        But as it turns out, while this may be a tempting strategy in your first games, pushing your checkers to the
-        edges is a mistake as it limits the moves you can make." """
-
-        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
-        # testing purposes only
-        self.maxplayer_index = board.playeridx(self.maxplayer)
-
-        max_player_pieces_on_edge = 0
-        enemy_pieces_on_edge = 0
-
-        for r in range(1, 7, 2):  # exclude home rows
-            if board.board[r][0]:
-                if board.board[r][0] in board.players[self.maxplayer_index]:  # if piece is MAX player's
-                    max_player_pieces_on_edge += 1
-                else:
-                    enemy_pieces_on_edge += 1
-
-        for r in range(2, 7, 2):  # exclude home rows
-            if board.board[r][7]:
-                if board.board[r][7] in board.players[self.maxplayer_index]:  # if piece is MAX player's
-                    max_player_pieces_on_edge += 1
-                else:
-                    enemy_pieces_on_edge += 1
-
-
-        return enemy_pieces_on_edge - max_player_pieces_on_edge
+import hashlib
+import json
+import time
+
+import abstractstrategy
+import checkerboard
+import evalcache
+import searchtask
+
+
+class SearchTimeout(Exception):
+    """SearchTimeout is raised inside Minimax when the hard deadline of a search has passed, it unwinds the search
+    (see Minimax.deadline)"""
+    pass
+
+
+class SearchCancelled(SearchTimeout):
+    """SearchCancelled is raised inside Minimax when the search has been cancelled with its cancel token (see
+    Minimax.cancel_token), it is handled like a timeout"""
+    pass
+
+
+class Minimax:
+    """The Minimax class uses minimax algorithm for determining the best move for the AI player in checkers. Generic
+    minimax algorithm is enhanced with alpha beta pruning (which does not change the decision of the minimax
+    algorithm) and utility function is replaced by heuristic evaluation function (approximation) at the specified
+    cutoff (we call this parameter max_plies). We use utility and heuristic evaluation function interchangeably in
+    this code. """
+
+    # the following variables are designed to be shared by all instances of Minimax class.
+    pos_infinity = float("inf")
+    neg_infinity = float("-inf")
+    # actual utilities of terminal (leaf) nodes in search tree
+    utility_win = 1000000  # actual utility of winning
+    utility_lose = -1000000  # actual utility of losing
+    utility_tie = 0  # actual utility of a draw
+    # cutoff limit for iterative deepening when only a time limit is given
+    deepest_iteration = 64
+    # search drivers which can be selected with the driver argument
+    drivers = ("alphabeta", "mtdf")
+    # the transposition table is emptied before a search once it holds this many boards
+    transposition_limit = 1000000
+    # with a deadline or a cancel token the search is interrupted at most this many nodes after it should stop
+    deadline_check_interval = 64
+
+    def __init__(self, max_player, min_player, max_plies, strategy, aspiration_width=None, driver="alphabeta",
+                 transpositions=None, move_ordering=False, late_move_reductions=False, futility_pruning=False,
+                 lmr_full_moves=3, lmr_min_depth=3, futility_margin=20, move_cache=None, analysis_cache=None,
+                 analysis_plies=2, canonical_keys=None):
+        """ the max_player - the player whose best move we are determining. the min_player - the other player. It is
+        assumed that min_player plays a perfect game. max_plies - a parameter indicating where the cutoff should be
+        applied strategy - an instance of the class containing heuristic evaluation function. aspiration_width -
+        half width of the aspiration window around the previous score, None searches with a full window. driver -
+        the search used by Search: "alphabeta" (Alpha_Beta_Search) or "mtdf" (MTDF_Search). transpositions -
+        whether to use a transposition table, by default only the mtdf driver (which requires one) uses it, or a
+        table (a dict) shared with other searches.
+        canonical_keys - key the transposition table (and the strategy's evaluation cache, see AI.utility) by the
+        canonical form of the boards under the colour flip symmetry (see CheckerBoard.canonical), a board and its
+        mirror image then share one entry and players of both colours can share a table. Only valid if the utility
+        is colour symmetric, by default it is used when the strategy's symmetric_utility is True.
+
+        Selective search options, each can be switched on separately:
+        move_ordering - order moves with killer moves and the history heuristic (see Order_Moves)
+        late_move_reductions - search the moves after the first lmr_full_moves one ply shallower when at least
+        lmr_min_depth plies remain, and again at full depth if they turn out better than the best move so far
+        futility_pruning - one ply above the cutoff skip moves if the current utility plus futility_margin cannot
+        reach alpha (cannot get below beta for MIN player)
+        Captures and promotions are never reduced or pruned, threats (see Is_Threat) are not reduced.
+
+        move_cache - optional movecache.MoveCache used for all move generation of the search (see Get_Actions), the
+        same cache can be shared by several searches
+
+        analysis_cache - optional analysiscache.AnalysisCache, a persistent transposition table consulted and filled
+        for the boards at most analysis_plies plies below the root (the root is ply 1). It requires the
+        transposition table, which is enabled with it. The utility function has to provide Evaluator_Id. """
+
+        if driver not in Minimax.drivers:
+            raise ValueError("Unknown search driver %r" % (driver,))
+        if aspiration_width is not None and not aspiration_width > 0:
+            # a window that does not widen would be searched again forever
+            raise ValueError("The aspiration width must be positive")
+
+        self.max_player = max_player
+        self.min_player = min_player
+        self.max_plies = max_plies
+        self.strategy = strategy
+        # statistics of the most recent search, e.g. number of nodes (calls to Max_Value and Min_Value) visited
+        self.stats = {"nodes": 0}
+        # root utility and principal variation (expected sequence of moves) of the most recent search
+        self.score = None
+        self.principal_variation = []
+        # triangular principal variation table: pv_table[ply_counter] is the best line found below that ply
+        self.pv_table = {}
+        # moves searched first at each ply, see Order_Moves
+        self.pv_hint = []
+        # aspiration windows: instead of (-inf, +inf) the search starts with a window of aspiration_width on each
+        # side of the score of the previous iteration or of the previous move. Scores alternate with the parity of the
+        # cutoff (who made the last move before the evaluation), so previous_score is indexed by max_plies % 2
+        self.aspiration_width = aspiration_width
+        self.previous_score = {}
+        self.driver = driver
+        # transposition table: (board, player to move) -> (depth searched below the board, lower bound of the
+        # utility, upper bound of the utility, code of the best move, see CheckerBoard.encode_action). Different move
+        # orders often lead to the same board, the table lets the search reuse the result. It is kept between
+        # searches, entries remember their depth.
+        # With canonical keys the key is the canonical form of the board and the entries are from the viewpoint of
+        # the player to move on the canonical board (see Orient_Entry).
+        if transpositions is None:
+            transpositions = driver == "mtdf" or analysis_cache is not None
+        elif analysis_cache is not None and transpositions is False:
+            raise ValueError("The analysis cache requires a transposition table")
+        if isinstance(transpositions, dict):
+            self.transposition_table = transpositions
+        else:
+            self.transposition_table = {} if transpositions else None
+        if canonical_keys is None:
+            canonical_keys = getattr(strategy, "symmetric_utility", False)
+        self.canonical_keys = canonical_keys
+        # selective search
+        self.move_ordering = move_ordering
+        self.late_move_reductions = late_move_reductions
+        self.futility_pruning = futility_pruning
+        self.lmr_full_moves = lmr_full_moves
+        self.lmr_min_depth = lmr_min_depth
+        self.futility_margin = futility_margin
+        # killer_moves[ply_counter] - codes of the last two quiet moves which caused a cutoff at that ply
+        # history[move code] - how often (weighted by the depth below) a quiet move caused a cutoff
+        self.killer_moves = {}
+        self.history = {}
+        self.move_cache = move_cache
+        # hard deadline (a time.monotonic() value) or None. A search still running at the deadline raises
+        # SearchTimeout, Iterative_Deepening_Search catches it and returns the move of the last completed iteration.
+        self.deadline = None
+        # optional cancel token (see searchtask.CancelToken) polled with the deadline, a cancelled search raises
+        # SearchCancelled and is handled like a timeout
+        self.cancel_token = None
+        # persistent transposition entries near the root, see Load_Analysis
+        self.analysis_cache = analysis_cache
+        self.analysis_plies = analysis_plies
+
+    def Game_Over_Utility(self, winner):
+        """Game_Over_Utility returns the utility of the end of the game based on the winner: 'r', 'b' or None. None
+        indicates a tie - there is no winner """
+        if winner is None:  # tie
+            return Minimax.utility_tie
+        elif winner == self.max_player:  # win
+            return Minimax.utility_win
+        else:  # loss
+            return Minimax.utility_lose
+
+    def Cut_Off_Test(self, ply_counter, reduction=0):
+        """This method checks if sufficient depth in the search tree has been reached to apply cutoff function.
+        reduction - plies skipped by late move reductions on the path to this board"""
+        return ply_counter + reduction >= self.max_plies
+
+    def New_Stats(self, *names):
+        """New_Stats returns the statistics counters of a new search, names are counters specific to the driver"""
+        stats = dict.fromkeys(("nodes", "tt_hits", "lmr_reductions", "lmr_researches", "futility_prunes",
+                                "timeouts", "cancelled",
+                                "tt_probes", "analysis_hits"), 0)
+        stats.update(dict.fromkeys(names, 0))
+        return stats
+
+    def Get_Actions(self, board, player, key=None):
+        """Get_Actions returns the actions of player on board, from the move cache when there is one. key - the
+        transposition table key of the board if already computed. The actions must not be modified."""
+        if self.move_cache is None:
+            return board.get_actions(player)
+        if key is not None and key[1] != player:
+            # the canonical key of a board with black to move is the flipped board, not the move cache key
+            key = None
+        return self.move_cache.get_actions(board, player, key)
+
+    def Is_Tactical(self, board, action):
+        """Is_Tactical checks if an action captures a piece or crowns a pawn, such moves are exempt from late move
+        reductions and futility pruning"""
+        if len(action[1]) > 2:
+            return True  # capture
+        last_row = action[-1][0]
+        return (last_row == 0 or last_row == board.rows - 1) and board.ispawn(board.get(*action[0]))
+
+    def Is_Threat(self, board, action, resulting_board, opponent):
+        """Is_Threat checks if a quiet action threatens something the opponent has to answer, such moves are not
+        reduced: the action moves a pawn next to the row where it is crowned, or the opponent has to capture after
+        it (an exchange or a sacrifice, often setting up a multiple jump)"""
+        piece = board.get(*action[0])
+        if board.ispawn(piece) and board.disttoking(piece, action[-1][0]) == 1:  # pawns are named after players
+            return True
+        actions = self.Get_Actions(resulting_board, opponent)
+        return bool(actions) and len(actions[0][1]) > 2
+
+    def Alpha_Beta_Search(self, current_board_state, pv_hint=None):
+        """This method uses alpha-beta search to determine the best move for MAX player based on the current
+        configuration of the checkerboard. It returns the action which will result in the value v (the highest
+        utility). This portion of the code is based on Figure 5.7 from our textbook (chp 5) with appropriate
+        modifications introduced
+
+        current_board_state - the representation of the current configuration of the checkerboard
+        pv_hint - optional expected principal variation (e.g. from a shallower search), its moves are searched first
+
+        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
+        path for MAX.
+        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
+        path for MIN. """
+
+        alpha = self.neg_infinity
+        beta = self.pos_infinity
+        # variable ply_counter will keep count of how many plies "deep" the search goes
+        # As suggested in out textbook, we keep a counter that is updated during every
+        # recursive call
+        ply_counter = 1
+
+        self.stats = self.New_Stats("researches_high", "researches_low")
+        self.pv_table = {}
+        self.pv_hint = pv_hint or []
+
+        previous = self.previous_score.get(self.max_plies % 2)
+        if self.aspiration_width is not None and previous is not None:
+            # the true score is expected to be close to the previous one, a narrower window prunes more
+            width = self.aspiration_width
+            alpha = previous - width
+            beta = previous + width
+
+        while True:
+            maximum_utility, best_move = self.Max_Value(current_board_state, alpha, beta, ply_counter)
+            if maximum_utility <= alpha and alpha != self.neg_infinity:
+                # fail low: the score is at most maximum_utility, lower alpha and search again with a wider window
+                self.stats["researches_low"] += 1
+                width *= 2
+                alpha = self.Widen(maximum_utility - width)
+                self.pv_hint = self.pv_table.get(ply_counter, [])
+            elif maximum_utility >= beta and beta != self.pos_infinity:
+                # fail high: the score is at least maximum_utility, raise beta and search again
+                self.stats["researches_high"] += 1
+                width *= 2
+                beta = self.Widen(maximum_utility + width)
+                self.pv_hint = self.pv_table.get(ply_counter, [])
+            else:
+                break
+
+        self.score = maximum_utility
+        if abs(maximum_utility) < Minimax.utility_win:
+            self.previous_score[self.max_plies % 2] = maximum_utility
+        self.principal_variation = self.pv_table.get(ply_counter, [])
+        return best_move
+
+    def Search(self, current_board_state, pv_hint=None):
+        """Search determines the best move for MAX player with the selected driver (Alpha_Beta_Search or
+        MTDF_Search)"""
+        if self.transposition_table is not None and len(self.transposition_table) > Minimax.transposition_limit:
+            self.transposition_table.clear()
+        try:
+            if self.driver == "mtdf":
+                return self.MTDF_Search(current_board_state, pv_hint)
+            return self.Alpha_Beta_Search(current_board_state, pv_hint)
+        finally:
+            if self.analysis_cache is not None:
+                # entries of subtrees completed before a timeout are valid as well
+                self.analysis_cache.flush()
+
+    def MTDF_Search(self, current_board_state, pv_hint=None, first_guess=None):
+        """MTDF_Search determines the best move for MAX player with the MTD(f) algorithm (Plaat et al., "Best-First
+        Fixed-Depth Minimax Algorithms"). Instead of one search with a wide (alpha, beta) window it makes a series
+        of zero-window searches (beta - 1, beta). Each one only answers whether the utility is below beta, which
+        prunes far more than a wide window, and moves the lower or upper bound of the utility until they meet. The
+        transposition table keeps the work of the earlier searches so the later ones are cheap.
+
+        first_guess - expected utility, by default the score of the previous search with the same cutoff parity.
+        Utilities are integers, so zero-window searches with (beta - 1, beta) are exact."""
+
+        if self.transposition_table is None:
+            raise ValueError("MTD(f) requires a transposition table")
+        ply_counter = 1
+        self.stats = self.New_Stats("passes")
+        self.pv_table = {}
+        self.pv_hint = pv_hint or []
+
+        guess = first_guess
+        if guess is None:
+            guess = self.previous_score.get(self.max_plies % 2, 0)
+        lower, upper = self.neg_infinity, self.pos_infinity
+        best_move = None
+        while lower < upper:
+            beta = guess + 1 if guess == lower else guess
+            self.stats["passes"] += 1
+            guess, move = self.Max_Value(current_board_state, beta - 1, beta, ply_counter)
+            if guess < beta:
+                upper = guess  # failed low, the utility is at most guess
+            else:
+                lower = guess  # failed high, move reaches at least guess
+                best_move = move
+
+        self.score = guess
+        if abs(guess) < Minimax.utility_win:
+            self.previous_score[self.max_plies % 2] = guess
+        self.principal_variation = self.Transposition_PV(current_board_state)
+        if best_move is None and self.principal_variation:
+            best_move = self.principal_variation[0]
+        return best_move
+
+    def MultiPV_Search(self, current_board_state, k=3):
+        """MultiPV_Search returns the k best moves for MAX player as a list of (move, score, principal variation),
+        best first. Each score is exact. The moves are found by k successive searches of the root moves, each one
+        excluding the moves found before. The searches share a transposition table (a temporary one if transpositions
+        are disabled): once the best move is known, the upper bounds stored for the other moves in the earlier
+        searches cut most of them off at once, so the cost is far below k independent searches.
+
+        stats are the totals over all k searches, score and principal_variation are those of the best move."""
+
+        ply_counter = 1
+        self.stats = self.New_Stats()
+        self.pv_hint = []
+        saved_table = self.transposition_table
+        if self.transposition_table is None:
+            self.transposition_table = {}
+        results = []
+        try:
+            actions = self.Order_Moves(self.Get_Actions(current_board_state, self.max_player), ply_counter)
+            remaining = list(actions)
+            while remaining and len(results) < k:
+                self.pv_table = {}
+                best = None
+                alpha = self.neg_infinity
+                for action in remaining:
+                    utility, _ = self.Min_Value(current_board_state.move(action), alpha, self.pos_infinity,
+                                                ply_counter + 1)
+                    if best is None or utility > alpha:
+                        # utilities of moves after the best one are upper bounds, they never replace it
+                        best = (action, utility, [action] + self.pv_table.get(ply_counter + 1, []))
+                        alpha = utility
+                results.append(best)
+                remaining.remove(best[0])
+        finally:
+            self.transposition_table = saved_table
+
+        if results:
+            (_, self.score, self.principal_variation) = results[0]
+        return results
+
+    def Transposition_PV(self, current_board_state):
+        """Transposition_PV follows the best moves stored in the transposition table from the given board to
+        rebuild the principal variation"""
+        pv = []
+        players = (self.max_player, self.min_player)
+        board = current_board_state
+        while len(pv) < self.max_plies - 1:
+            player = players[len(pv) % 2]
+            entry = self.Orient_Entry(self.transposition_table.get(self.Transposition_Key(board, player)), player)
+            if entry is None or entry[3] is None:
+                break
+            pv.append(self.Action_Of(board, player, entry[3]))
+            board = board.move(pv[-1])
+        return pv
+
+    def Action_Of(self, board, player, code, key=None):
+        """Action_Of returns the action of player on board with the given move code (see
+        CheckerBoard.encode_action). Decoding the code alone may give another capture path with the same result."""
+        encode = checkerboard.CheckerBoard.encode_action
+        for action in self.Get_Actions(board, player, key):
+            if encode(action) == code:
+                return action
+        return checkerboard.CheckerBoard.decode_action(code)
+
+    def Order_Moves(self, actions, ply_counter, tt_move=None):
+        """Order_Moves returns the actions with the move of pv_hint (the principal variation of the previous
+        iteration or of the previous attempt with a narrower window) at this ply first, followed by the best move
+        stored in the transposition table. Searching the expected best move first makes alpha-beta cut off the
+        remaining moves sooner. With move_ordering, the killer moves of this ply come next and the other moves are
+        sorted by their history score. The moves are compared by their codes (see CheckerBoard.encode_action),
+        tt_move is a code."""
+        encode = checkerboard.CheckerBoard.encode_action
+        hints = list(self.killer_moves.get(ply_counter, ())) if self.move_ordering else []
+        if tt_move is not None:
+            hints.insert(0, tt_move)
+        if ply_counter <= len(self.pv_hint):
+            hints.insert(0, encode(self.pv_hint[ply_counter - 1]))
+        if not actions or (not hints and not self.move_ordering):
+            return actions
+        coded = [(encode(action), action) for action in actions]
+        if self.move_ordering:
+            # sort is stable, moves without history keep their order
+            coded.sort(key=lambda item: -self.history.get(item[0], 0))
+        for hint in reversed(hints):
+            if coded[0][0] != hint:
+                for (index, item) in enumerate(coded):
+                    if item[0] == hint:
+                        coded.insert(0, coded.pop(index))
+                        break
+        return [action for (_, action) in coded]
+
+    def Record_Cutoff(self, board, action, ply_counter, depth):
+        """Record_Cutoff remembers a quiet move which caused a cutoff as a killer move of the ply and raises its
+        history score, the move is likely to be good in sibling positions as well"""
+        if not self.move_ordering or self.Is_Tactical(board, action):
+            return
+        code = checkerboard.CheckerBoard.encode_action(action)
+        killers = self.killer_moves.setdefault(ply_counter, [])
+        if code not in killers:
+            killers.insert(0, code)
+            del killers[2:]
+        self.history[code] = self.history.get(code, 0) + depth * depth
+
+    def Transposition_Key(self, board, player):
+        """Transposition_Key returns the transposition table key of board with player to move: (board.pack(), player)
+        or with canonical_keys the canonical form of the board, equal for the board and its mirror image"""
+        if self.canonical_keys:
+            return board.canonical(player)
+        return board.pack(), player
+
+    def Orient_Entry(self, entry, player):
+        """Orient_Entry converts a transposition table entry of a board with player to move between the viewpoint of
+        the search (utilities for MAX player, moves on the board) and, with canonical_keys, the viewpoint of the
+        table (utilities for the player to move, moves on the canonical board). Converting twice gives the entry
+        back, so the same method converts in both directions."""
+        if entry is None or not self.canonical_keys:
+            return entry
+        (depth, lower, upper, move) = entry
+        if player != self.max_player:
+            lower, upper = -upper, -lower
+        if move is not None and player != checkerboard.CheckerBoard.pawns[0]:
+            move = checkerboard.CheckerBoard.flip_code(move)
+        return depth, lower, upper, move
+
+    def Lookup_Transposition(self, key, player, depth, alpha, beta):
+        """Lookup_Transposition consults the transposition table for the board with player to move identified by
+        key. Entries searched at least as deep as required here hold a lower and an upper bound of the utility.
+        Returns (alpha, beta, utility, move): the window narrowed by the bounds, the utility if the bounds alone
+        decide the value of this node (None otherwise) and the code of the best move stored for the board (None if
+        unknown).
+        depth - plies which remain to be searched below the board"""
+        self.stats["tt_probes"] += 1
+        entry = self.Orient_Entry(self.transposition_table.get(key), player)
+        if entry is None:
+            return alpha, beta, None, None
+        (stored_depth, lower, upper, move) = entry
+        if stored_depth >= depth:
+            self.stats["tt_hits"] += 1
+            if lower >= beta:
+                return alpha, beta, lower, move
+            if upper <= alpha:
+                return alpha, beta, upper, move
+            if lower == upper:
+                return alpha, beta, lower, move
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        return alpha, beta, None, move
+
+    def Store_Transposition(self, key, player, depth, utility, alpha, beta, move):
+        """Store_Transposition saves the result of searching the board with player to move identified by key with the
+        window
+        (alpha, beta). With fail-soft alpha-beta a utility at or below alpha is an upper bound of the true utility,
+        a utility at or above beta is a lower bound and anything in between is exact. Bounds from searches of the
+        same depth are combined. The move is stored as its code (see CheckerBoard.encode_action)."""
+        if move is not None:
+            move = checkerboard.CheckerBoard.encode_action(move)
+        lower, upper = self.neg_infinity, self.pos_infinity
+        if utility > alpha:
+            lower = utility
+        if utility < beta:
+            upper = utility
+        entry = self.Orient_Entry(self.transposition_table.get(key), player)
+        if entry is not None:
+            if entry[0] == depth and max(lower, entry[1]) <= min(upper, entry[2]):
+                lower, upper = max(lower, entry[1]), min(upper, entry[2])
+            if move is None or utility <= alpha:
+                # when every move failed low none of them is known to be best, keep the stored move
+                move = entry[3] or move
+        self.transposition_table[key] = self.Orient_Entry((depth, lower, upper, move), player)
+
+    def Analysis_Evaluator(self):
+        """Analysis_Evaluator returns the name under which the entries of this search are kept in the analysis cache:
+        utilities depend on the utility function and are from the max player's viewpoint, with canonical_keys from
+        the viewpoint of the player to move so that players of both colours share the entries"""
+        if self.canonical_keys:
+            return "canonical:%s" % self.strategy.Evaluator_Id()
+        return "%s:%s" % (self.max_player, self.strategy.Evaluator_Id())
+
+    def Load_Analysis(self, key):
+        """Load_Analysis copies the analysis cache entry of the board identified by key into the transposition table
+        unless the table already holds an entry searched at least as deep"""
+        entry = self.analysis_cache.lookup(self.Analysis_Evaluator(), key)
+        if entry is not None:
+            stored = self.transposition_table.get(key)
+            if stored is None or stored[0] < entry[0]:
+                self.stats["analysis_hits"] += 1
+                self.transposition_table[key] = entry
+
+    def Save_Analysis(self, key):
+        """Save_Analysis saves the transposition table entry of the board identified by key in the analysis cache"""
+        self.analysis_cache.store(self.Analysis_Evaluator(), key, self.transposition_table[key])
+
+    def Check_Interrupt(self):
+        """Check_Interrupt raises SearchCancelled once the search has been cancelled and SearchTimeout once the
+        deadline has passed"""
+        if self.cancel_token is not None and self.cancel_token.cancelled():
+            self.stats["cancelled"] += 1
+            raise SearchCancelled()
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stats["timeouts"] += 1
+            raise SearchTimeout()
+
+    @staticmethod
+    def Widen(bound):
+        """Widen returns an aspiration window bound, or an infinite bound once the window reaches the utilities of
+        winning or losing"""
+        if bound <= Minimax.utility_lose:
+            return Minimax.neg_infinity
+        elif bound >= Minimax.utility_win:
+            return Minimax.pos_infinity
+        return bound
+
+    def Iterative_Deepening_Search(self, current_board_state, max_depth=None, time_limit=None, budget=None,
+                                   on_iteration=None):
+        """This method repeats Search with cutoffs of 2, 3, 4, ... plies and returns the best move of the
+        deepest completed search. It stops after the max_depth search or once time_limit seconds have been used
+        (max_depth defaults to max_plies when there is no time limit). The time limit is soft: a search that has been
+        started is always completed. It also stops early when a win or a loss has been found.
+
+        budget - optional clock.MoveBudget from a time manager. Its soft limit decides whether another iteration is
+        started (see MoveBudget.stop) and its hard deadline aborts a running iteration, the move of the last
+        completed iteration is returned then (or the first move to be searched if not even the 2 ply search
+        completed). A search cancelled with cancel_token is aborted the same way.
+
+        on_iteration - optional function called with (depth, best_move, score) after each completed iteration
+
+        stats are the totals over all iterations, stats["depth"] is the deepest completed cutoff and
+        stats["timeouts"] or stats["cancelled"] is 1 if an iteration was aborted."""
+
+        if max_depth is None:
+            max_depth = self.max_plies if time_limit is None and budget is None else Minimax.deepest_iteration
+        start = time.monotonic()
+        saved_max_plies = self.max_plies
+        saved_deadline = self.deadline
+        if budget is not None:
+            self.deadline = budget.deadline
+        totals = {}
+        best_move = None
+        completed = 0
+        try:
+            # a cutoff of 1 ply would evaluate the current board without looking at any move
+            for depth in range(2, max(max_depth, 2) + 1):
+                self.max_plies = depth
+                iteration_start = time.monotonic()
+                try:
+                    move = self.Search(current_board_state, self.principal_variation if depth > 2 else None)
+                finally:
+                    for (name, count) in self.stats.items():
+                        totals[name] = totals.get(name, 0) + count
+                best_move = move
+                completed = depth
+                if budget is not None:
+                    budget.update(best_move, self.score, time.monotonic() - iteration_start)
+                if on_iteration is not None:
+                    on_iteration(depth, best_move, self.score)
+                if abs(self.score) >= Minimax.utility_win or \
+                        (time_limit is not None and time.monotonic() - start >= time_limit) or \
+                        (budget is not None and budget.stop()):
+                    break
+        except SearchTimeout:
+            if best_move is None:
+                # not even the shallowest search completed, play the move which would have been searched first
+                actions = self.Order_Moves(self.Get_Actions(current_board_state, self.max_player), 1)
+                best_move = actions[0] if actions else None
+        finally:
+            self.max_plies = saved_max_plies
+            self.deadline = saved_deadline
+        self.stats = totals
+        self.stats["depth"] = completed
+        return best_move
+
+    def Max_Value(self, current_board_state, alpha, beta, ply_counter, reduction=0):  # when does this return None ???
+        """This method returns the utility value of the best action from the Max player's point of view and the
+        action leading to that utility value
+
+        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
+        path for MAX.
+        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
+        path for MIN.
+        reduction - plies skipped by late move reductions on the path to this board
+        """
+
+        alpha_ = alpha
+        beta_ = beta
+
+        """this ply could be a terminal state, we can check that by using is_terminal() function implemented in 
+        checkerboard.py. In case, the current ply is terminal we do not need to approximate utility by using 
+        heuristic evaluation function, we can just return the utility of winning, losing, or a tie. """
+
+        self.stats["nodes"] += 1
+        if (self.deadline is not None or self.cancel_token is not None) and \
+                self.stats["nodes"] % self.deadline_check_interval == 0:
+            self.Check_Interrupt()
+        self.pv_table[ply_counter] = []
+
+        (game_over, winner) = current_board_state.is_terminal()
+        if game_over:
+            # return actual utility
+            return self.Game_Over_Utility(winner), None
+        elif self.Cut_Off_Test(ply_counter, reduction):
+            # return approximation of the utility
+            return self.strategy.utility(current_board_state), None
+        else:
+            # go deeper down the search tree
+
+            # v_maximum_utility is used as an index to retrieve best move from choices
+            # v_maximum_utility will never stay negative infinity since even if the loss
+            # of the game is encountered, it is marked by -1000000 > float("-inf")
+            v_maximum_utility = float("-inf")
+            # 'choices' dictionary will hold all the possible moves indexed by utility
+            # associated with the move. If there are multiple moves resulting in the
+            # same utility, then the first one encountered is kept: once alpha is raised a later move
+            # returning the same utility has only been shown to be no better (an upper bound).
+            choices = {}
+            # actions is the list of valid actions actions should not be an empty
+            # list since we have already checked if state was terminal. If player does
+            # not have any moves then state is terminal
+            # plies which remain to be searched below this board
+            depth = self.max_plies - ply_counter - reduction
+            # consult the transposition table (if enabled), it may already hold a good enough bound for this board
+            key = tt_move = None
+            if self.transposition_table is not None:
+                key = self.Transposition_Key(current_board_state, self.max_player)
+                if self.analysis_cache is not None and ply_counter <= self.analysis_plies:
+                    self.Load_Analysis(key)
+                alpha_, beta_, stored_utility, tt_move = self.Lookup_Transposition(key, self.max_player, depth,
+                                                                                  alpha_, beta_)
+                if stored_utility is not None:
+                    move = None
+                    if tt_move is not None and ply_counter == 1:
+                        # the move returned by the search is one of the actions of the board
+                        move = self.Action_Of(current_board_state, self.max_player, tt_move, key)
+                    elif tt_move is not None:
+                        move = checkerboard.CheckerBoard.decode_action(tt_move)
+                    self.pv_table[ply_counter] = [move] if move else []
+                    return stored_utility, move
+            searched_alpha, searched_beta = alpha_, beta_
+
+            actions = self.Order_Moves(self.Get_Actions(current_board_state, self.max_player, key), ply_counter,
+                                       tt_move)
+            if depth == 1 and self.strategy.batch_evaluation:
+                # the children are evaluated, with a network it is faster to evaluate them all at once
+                self.strategy.Prefetch([current_board_state.move(action) for action in actions])
+
+            # futility pruning: one ply above the cutoff a quiet move is not expected to change the utility by more
+            # than futility_margin, if even that cannot reach alpha the move is skipped
+            futile = None
+            if self.futility_pruning and depth == 1 and ply_counter > 1 and alpha_ != self.neg_infinity:
+                futile = self.strategy.utility(current_board_state) + self.futility_margin
+                if futile > alpha_:
+                    futile = None
+
+            for (index, action) in enumerate(actions):
+                # this portion of the code heavily relies on algorithm outlined on Figure 5.7 on pg. 170 of our
+                # textbook. We are borrowing from the pseudocode and translating
+                tactical = (futile is not None or index >= self.lmr_full_moves) and \
+                    self.Is_Tactical(current_board_state, action)
+                if futile is not None and not tactical:
+                    self.stats["futility_prunes"] += 1
+                    v_maximum_utility = max(v_maximum_utility, futile)
+                    continue
+                resulting_child_node = current_board_state.move(action)
+                if self.late_move_reductions and index >= self.lmr_full_moves and depth >= self.lmr_min_depth and \
+                        ply_counter > 1 and alpha_ != self.neg_infinity and not tactical and \
+                        not self.Is_Threat(current_board_state, action, resulting_child_node, self.min_player):
+                    # late move reduction: moves ordered late are rarely best, a shallower zero-window search
+                    # checks that the move does not beat alpha, only if it does it is searched again at full depth
+                    self.stats["lmr_reductions"] += 1
+                    current_utility, move = self.Min_Value(resulting_child_node, alpha_, alpha_ + 1, ply_counter + 1,
+                                                           reduction + 1)
+                    if current_utility > alpha_:
+                        self.stats["lmr_researches"] += 1
+                        current_utility, move = self.Min_Value(resulting_child_node, alpha_, beta_, ply_counter + 1,
+                                                               reduction)
+                else:
+                    current_utility, move = self.Min_Value(resulting_child_node, alpha_, beta_, ply_counter + 1,
+                                                           reduction)
+                # add utility and action pair to choices
+                choices.setdefault(current_utility, action)
+                if current_utility > v_maximum_utility:
+                    # same tie breaking as choices: the first move reaching the best utility is kept
+                    self.pv_table[ply_counter] = [action] + self.pv_table.get(ply_counter + 1, [])
+                v_maximum_utility = max(v_maximum_utility, current_utility)
+
+                if v_maximum_utility >= beta_:
+                    best_action = action
+                    self.Record_Cutoff(current_board_state, action, ply_counter, depth)
+                    break
+                alpha_ = max(alpha_, v_maximum_utility)
+            else:
+                best_action = choices.get(v_maximum_utility)
+
+            if key is not None:
+                self.Store_Transposition(key, self.max_player, depth, v_maximum_utility, searched_alpha,
+                                         searched_beta, best_action)
+                if self.analysis_cache is not None and ply_counter <= self.analysis_plies:
+                    self.Save_Analysis(key)
+            return v_maximum_utility, best_action
+
+    def Min_Value(self, current_board_state, alpha, beta, ply_counter, reduction=0):
+        """This method returns the utility value of the best action from the Min player's point of view, the worst
+        action from the Max player's point of view, and the action leading to that utility value
+
+        current_board_state - the representation of the current configuration of the checkerboard
+        alpha - the value of the best (i.e., highest-value) choice we have found so far at any choice point along the
+        path for MAX.
+        beta - the value of the best (i.e., lowest-value) choice we have found so far at any choice point along the
+        path for MIN.
+        reduction - plies skipped by late move reductions on the path to this board"""
+
+        _alpha = alpha
+        _beta = beta
+
+        """just like in Max_Value this ply could be a terminal state, we can check that by using is_terminal() function 
+        implemented in checkerboard.py. In case, the current ply is terminal we do not need to approximate utility by 
+        using heuristic evaluation function, we can just return the utility of winning, losing, or a tie. """
+
+        self.stats["nodes"] += 1
+        if (self.deadline is not None or self.cancel_token is not None) and \
+                self.stats["nodes"] % self.deadline_check_interval == 0:
+            self.Check_Interrupt()
+        self.pv_table[ply_counter] = []
+
+        (game_over, winner) = current_board_state.is_terminal()
+        if game_over:
+            # return actual utility
+            return self.Game_Over_Utility(winner), None
+        elif self.Cut_Off_Test(ply_counter, reduction):
+            # return approximation of the utility
+            return self.strategy.utility(current_board_state), None
+        else:
+            # go deeper down the search tree
+
+            # v_minimum_utility is used as an index to retrieve best move (for min)
+            # from choices
+            # v_minimum_utility will never positive infinity since even if the win
+            # of the game is encountered, it is marked by 1000000 < float("inf")
+            v_minimum_utility = float("inf")
+            # 'choices' dictionary will hold all the possible moves indexed by utility
+            # associated with the move. If there are multiple moves resulting in the
+            # same utility, then the first one encountered is kept (see Max_Value).
+            choices = {}
+            # actions is the list of valid actions actions should not be an empty
+            # list since we have already checked if state was terminal. If player does
+            # not have any moves then state is terminal
+            depth = self.max_plies - ply_counter - reduction
+            # consult the transposition table (if enabled), see Max_Value
+            key = tt_move = None
+            if self.transposition_table is not None:
+                key = self.Transposition_Key(current_board_state, self.min_player)
+                if self.analysis_cache is not None and ply_counter <= self.analysis_plies:
+                    self.Load_Analysis(key)
+                _alpha, _beta, stored_utility, tt_move = self.Lookup_Transposition(key, self.min_player, depth,
+                                                                                  _alpha, _beta)
+                if stored_utility is not None:
+                    move = None
+                    if tt_move is not None and ply_counter == 1:
+                        # the move returned by the search is one of the actions of the board
+                        move = self.Action_Of(current_board_state, self.min_player, tt_move, key)
+                    elif tt_move is not None:
+                        move = checkerboard.CheckerBoard.decode_action(tt_move)
+                    self.pv_table[ply_counter] = [move] if move else []
+                    return stored_utility, move
+            searched_alpha, searched_beta = _alpha, _beta
+
+            actions = self.Order_Moves(self.Get_Actions(current_board_state, self.min_player, key), ply_counter,
+                                       tt_move)
+            if depth == 1 and self.strategy.batch_evaluation:
+                self.strategy.Prefetch([current_board_state.move(action) for action in actions])
+
+            # futility pruning and late move reductions mirror Max_Value
+            futile = None
+            if self.futility_pruning and depth == 1 and ply_counter > 1 and _beta != self.pos_infinity:
+                futile = self.strategy.utility(current_board_state) - self.futility_margin
+                if futile < _beta:
+                    futile = None
+
+            for (index, action) in enumerate(actions):
+                # this portion of the code heavily relies on algorithm outlined
+                # on Figure 5.7 on pg. 170 of our textbook. We are borrowing
+                # from the pseudocode and translating
+                tactical = (futile is not None or index >= self.lmr_full_moves) and \
+                    self.Is_Tactical(current_board_state, action)
+                if futile is not None and not tactical:
+                    self.stats["futility_prunes"] += 1
+                    v_minimum_utility = min(v_minimum_utility, futile)
+                    continue
+                resulting_child_node = current_board_state.move(action)
+                if self.late_move_reductions and index >= self.lmr_full_moves and depth >= self.lmr_min_depth and \
+                        ply_counter > 1 and _beta != self.pos_infinity and not tactical and \
+                        not self.Is_Threat(current_board_state, action, resulting_child_node, self.max_player):
+                    self.stats["lmr_reductions"] += 1
+                    current_utility, move = self.Max_Value(resulting_child_node, _beta - 1, _beta, ply_counter + 1,
+                                                           reduction + 1)
+                    if current_utility < _beta:
+                        self.stats["lmr_researches"] += 1
+                        current_utility, move = self.Max_Value(resulting_child_node, _alpha, _beta, ply_counter + 1,
+                                                               reduction)
+                else:
+                    current_utility, move = self.Max_Value(resulting_child_node, _alpha, _beta, ply_counter + 1,
+                                                           reduction)
+                # add utility and action pair to choices
+                choices.setdefault(current_utility, action)
+                if current_utility < v_minimum_utility:
+                    self.pv_table[ply_counter] = [action] + self.pv_table.get(ply_counter + 1, [])
+                v_minimum_utility = min(v_minimum_utility, current_utility)
+                if v_minimum_utility <= _alpha:
+                    best_action = action
+                    self.Record_Cutoff(current_board_state, action, ply_counter, depth)
+                    break
+                _beta = min(_beta, v_minimum_utility)
+            else:
+                best_action = choices.get(v_minimum_utility)
+
+            if key is not None:
+                self.Store_Transposition(key, self.min_player, depth, v_minimum_utility, searched_alpha,
+                                         searched_beta, best_action)
+                if self.analysis_cache is not None and ply_counter <= self.analysis_plies:
+                    self.Save_Analysis(key)
+            return v_minimum_utility, best_action
+
+
+class AI(abstractstrategy.Strategy):
+    """AI is a checker playing strategy class using Minimax with alpha-beta pruning algorithm as a searching strategy
+    to play checkers and heuristic evaluation function - utility function to evaluate current state of the
+    checkerboard """
+
+    # w_{i} is the weight for the ith feature of utility. The default weights here are simply chosen based on our
+    # intuition, tuned weights can be produced with tuner.py (machine learning is the best way to determine these)
+    default_weights = (2, 3, 5, 5, 2)
+
+    def __init__(self, player, game, max_plies, weights=None, aspiration_width=None, driver="alphabeta",
+                 eval_cache=None, network=None, **search_options):
+        """weights - optional weights of the utility features, either a sequence of five numbers or the path of a
+        weight file written by tuner.py. AI.default_weights are used when no weights are given.
+        aspiration_width - enables aspiration windows of this half width in the search (see Minimax)
+        driver - search algorithm, "alphabeta" or "mtdf" (see Minimax.drivers)
+        eval_cache - number of slots of an evaluation cache (see evalcache.EvalCache) remembering utilities of
+        boards, None for no cache, or an EvalCache. With canonical keys (see Minimax, by default with a symmetric
+        utility) the cache is keyed by the canonical form of the boards and can be shared with players of both
+        colours using the same weights, otherwise by the packed boards and only with players of the same colour.
+        network - optional mlp.MLP (or the path of its weight file) replacing the weighted features in utility,
+        the children of a node one ply above the cutoff are evaluated in one batch (see Prefetch)
+        search_options - other Minimax options, e.g. late_move_reductions=True"""
+        # calls abstractstrategy.Strategy's constructor
+        super(AI, self).__init__(player, game, max_plies)
+        self.eval_cache = None
+        self.weights = weights
+        self.network = network
+        if isinstance(eval_cache, evalcache.EvalCache):
+            # set after the weights and the network, which would empty a cache shared with other players
+            self.eval_cache = eval_cache
+        elif eval_cache:
+            self.eval_cache = evalcache.EvalCache(eval_cache)
+        # instantiating a searching methodology class Minimax defined above
+        self.searching_strategy = Minimax(self.maxplayer, self.minplayer, self.maxplies, self, aspiration_width,
+                                          driver, **search_options)
+
+    def play(self, board):
+        """"play - Make a move. Given a board, play returns (newboard, action) where newboard is the result of having
+        applied action to board and action is determined via a game tree search (e.g. minimax with alpha-beta pruning).
+        """
+        print("Levan's AI player's %s search In progress..." % self.searching_strategy.driver)
+        # find a best move using alpha-beta pruning (or MTD(f), which is built on it), deepening iteratively up to
+        # max_plies. The board is unchanged if there is no move.
+        return self.search(board).result()
+
+    def search(self, board, max_depth=None, budget=None, on_iteration=None, executor=None):
+        """search - Start searching for a move in the background and return a searchtask.SearchTask, a future of
+        (newboard, action) which can be awaited, cancelled and streams the best move of each iteration.
+        max_depth, budget, on_iteration - see Minimax.Iterative_Deepening_Search
+        executor - optional thread pool to search in, a new thread is used otherwise"""
+        return searchtask.SearchTask(self, board, max_depth, budget, on_iteration, executor)
+
+    @property
+    def weights(self):
+        """weights of the utility features, setting them (a sequence or the path of a weight file, see __init__)
+        empties the evaluation cache"""
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        if weights is None:
+            weights = AI.default_weights
+        elif isinstance(weights, str):
+            weights = AI.Load_Weights(weights)
+        if len(weights) != len(AI.default_weights):
+            raise ValueError("Expected %d weights" % len(AI.default_weights))
+        self._weights = tuple(weights)
+        if self.eval_cache is not None:
+            # cached utilities were computed with the old weights
+            self.eval_cache.clear()
+
+    @property
+    def network(self):
+        """network replacing the weighted features, or None. Setting it (an mlp.MLP, the path of its weight file or
+        None) empties the evaluation cache and the prefetched utilities"""
+        return self._network
+
+    @network.setter
+    def network(self, network):
+        if isinstance(network, str):
+            import mlp  # NumPy is only needed with a network
+            network = mlp.MLP.load(network)
+        self._network = network
+        # packed board -> utility of the boards evaluated by the last Prefetch
+        self.prefetched = {}
+        if self.eval_cache is not None:
+            # cached utilities were computed by the old evaluator
+            self.eval_cache.clear()
+
+    @staticmethod
+    def Load_Weights(path):
+        """Load_Weights returns the feature weights stored in a weight file written by tuner.py, a JSON object with
+        the weights in a "weights" list"""
+        with open(path) as f:
+            return tuple(json.load(f)["weights"])
+
+    def utility(self, board):
+        """utility is heuristic evaluation function (namely, a weighted linear function) - it
+        approximates utility of the given checkerboard from the MAX player's viewpoint, in other words
+        determines strength of the current checkerboard configuration relative to the MAX player.
+
+        The features are computed by Features, each is multiplied by its weight in self.weights. With an
+        evaluation cache a board which has been evaluated before is looked up instead. With canonical keys the
+        cache holds red's utility of the canonical one of a board and its flipped board (see
+        CheckerBoard.flip_packed): the utility of the flipped board is the negated utility, as is black's."""
+
+        if self.eval_cache is not None:
+            key = board.pack()
+            sign = 1
+            if self.searching_strategy.canonical_keys:
+                flipped = board.flip_packed(key)
+                if flipped < key:
+                    key = flipped
+                    sign = -sign
+                if self.maxplayer != checkerboard.CheckerBoard.pawns[0]:
+                    sign = -sign
+            utility = self.eval_cache.lookup(key)
+            if utility is not None:
+                return sign * utility
+
+        if self.network is None:
+            utility = int(sum(w * feature for (w, feature) in zip(self._weights, self.Features(board))))
+        else:
+            utility = self.prefetched.get(board.pack())
+            if utility is None:
+                utility = self.network.evaluate([board], self.maxplayer)[0]
+
+        if self.eval_cache is not None:
+            self.eval_cache.store(key, sign * utility)
+        return utility if (utility is not None) else 0
+
+    @property
+    def symmetric_utility(self):
+        """symmetric_utility is True if the utility is the same for a board with red to move and its colour flipped
+        board (see CheckerBoard.flip_packed) with black to move, and if black's utility is the negated utility of
+        red. The weighted features are symmetric, a network is not known to be."""
+        return self.network is None
+
+    @property
+    def batch_evaluation(self):
+        """batch_evaluation is True if utilities are cheaper to compute in batches (with a network), the search then
+        calls Prefetch with the children of a node before searching them"""
+        return self.network is not None
+
+    def Prefetch(self, boards):
+        """Prefetch evaluates boards in one batch, utility looks their utilities up until the next Prefetch"""
+        self.prefetched = dict(zip((board.pack() for board in boards), self.network.evaluate(boards, self.maxplayer)))
+
+    def Evaluator_Id(self):
+        """Evaluator_Id returns a name of the utility function, equal for players whose utilities are equal: the
+        weights or a digest of the network weights (see analysiscache)"""
+        if self.network is None:
+            return "linear:" + ",".join(str(w) for w in self._weights)
+        digest = hashlib.sha1()
+        for array in (self.network.w1, self.network.b1, self.network.w2, self.network.b2):
+            digest.update(array.tobytes())
+        return "mlp:%s:%s" % (digest.hexdigest()[:16], self.network.utility_scale)
+
+    def Features(self, board):
+        """Features computes several features known to be an important predictor of checkers game outcome
+        and returns them as a list in the order of the weights. This analysis heavily relies on the article "Basic
+        Strategies for Winning at Checkers" Written by Seth Brow available here:
+        https://www.thesprucecrafts.com/how-to-win-at-checkers-411170  """
+
+        # index of max player
+        self.maxplayer_index = board.playeridx(self.maxplayer)
+
+        # feature 1: Percentage difference of the amount of player's pawns and enemy's pawns
+        # feature 2: Percentage difference of the amount of player's kings and enemy's kings
+        pawn_p_difference, king_p_difference = self.Pawn_Perc_Diff(board)
+
+        # feature 3: the difference between the amount of pieces on the home row for MAX player and the amount of
+        # enemy pieces on the enemy home row
+        relative_home_row_count = self.Home_Row_Pieces(board)
+
+        # feature 4: how close are the pawns to becoming the king relative to enemy
+        relative_getting_kinged = self.Distance_From_Kinged(board)
+
+        # feature 5: difference between the amount of MAX player (this is bad for MAX player) and enemy pieces on the
+        # edge columns (this is good for MAX player)
+        relative_edge_count = self.Edge_Piece_Count(board)
+
+        return [pawn_p_difference, king_p_difference, relative_home_row_count, relative_getting_kinged,
+                relative_edge_count]
+
+    def Pawn_Perc_Diff(self, board):
+        """Pawn_Diff returns Percentage difference of the amount of player's pawns and enemy's pawns and Percentage
+        difference of the amount of player's kings and enemy's kings.
+
+        Percentage difference here is calculated to equal the change in value, divided by the average of the 2
+        numbers, all multiplied by 100. We retain + or - sign, since we want to evaluate from MAX player's point of
+        view.
+
+        The reasoning behind using percentage difference instead of the simple difference is to account for the fact
+        that advantage of number of pieces is far more important when the total amount of pieces on the board is
+        small. "With only 12 pieces on the board, to begin with, you may quickly end up with an 8-7 piece advantage.
+        This may not seem like a big deal, but if you can trade four pieces, you suddenly have a 4-3 advantage,
+        which is a tremendous amount of power." """
+
+        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
+        # testing purposes only
+        self.maxplayer_index = board.playeridx(self.maxplayer)
+
+        board.recount_pieces()  # just to make sure pieces are correctly counted
+        # the following lists contain number of pieces indexed by playerindex
+        pawns = board.get_pawnsN()
+        kings = board.get_kingsN()
+
+        # player indices
+        max_player_index = self.maxplayer_index
+        min_player_index = (max_player_index + 1) % 2
+
+        # number of pieces (pawns and king) for each player
+        player_pawns = pawns[max_player_index]
+        player_kings = kings[max_player_index]
+        enemy_pawns = pawns[min_player_index]
+        enemy_kings = kings[min_player_index]
+
+        # calculations of Percentage difference for each piece type
+        pawn_difference = int((player_pawns - enemy_pawns) / (
+                (player_pawns + enemy_pawns) / 2.0) * 100) if player_pawns + enemy_pawns > 0 else 0
+        king_difference = int((player_kings - enemy_kings) / (
+                (player_kings + enemy_kings) / 2.0) * 100) if player_kings + enemy_kings > 0 else 0
+
+        return pawn_difference, king_difference
+
+    def Home_Row_Pieces(self, board):
+        """Home_Row_Pieces return the difference between the amount of pieces on the home   row for maxplayer and
+        enemy. Keeping pieces on the home row is a good strategy since it will prevent enemy from getting their
+        pieces kinged.
+
+        reasoning: "Your opponent cannot get any kinged checkers without advancing into one of your four home spaces.
+        Keeping these spaces occupied guarantees that your opponent will get no kings until your checkers move.
+        Generally speaking, you probably won't move these checkers until you are forced to capture an opposing piece,
+        or if you are running low on checkers."
+
+        board - current board state"""
+
+        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
+        # testing purposes only
+        self.maxplayer_index = board.playeridx(self.maxplayer)
+
+        # figure out what is the legal direction for the max player
+        direction = board.pawnmoves[self.maxplayer][0][0]
+        # according to the direction, assign home and enemy's home rows accordingly
+        home_row, enemy_home_row = (7, 0) if direction < 0 else (0, 7)
+
+        home_row_piece_count = 0
+        # traverse home row
+        for c in range(board.coloffset[home_row], board.cols, board.step):
+            # there is a piece and piece belongs to the MAX player, then increment count
+            if board.board[home_row][c] and \
+                    board.board[home_row][c] in board.players[self.maxplayer_index]:
+                home_row_piece_count += 1
+
+        enemy_home_piece_count = 0
+        # traverse enemy home row
+        for c in range(board.coloffset[enemy_home_row], board.cols, board.step):
+            # there is a piece and piece belongs to the enemy, then increment count
+            if board.board[enemy_home_row][c] and \
+                    board.board[enemy_home_row][c] in board.players[(self.maxplayer_index + 1) % 2]:
+                enemy_home_piece_count += 1
+
+        return home_row_piece_count - enemy_home_piece_count
+
+    def Distance_From_Kinged(self, board):
+        """Distance_From_Kinged return the total distances of enemy's pawns from getting kinged (the bigger this
+        number is the better for MAX player) minus the total distances of MAX player's pawns from getting kinged (the
+        smaller this number is the better for the MAX player)
+
+        reasoning: "A kinged piece is incredibly powerful, and generally speaking, the player who kings more checkers
+        will win. While capturing opposing checkers is generally a good thing, your biggest concern should always be
+        kinging your own checkers."
+
+        board - current board state"""
+
+        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
+        # testing purposes only
+        self.maxplayer_index = board.playeridx(self.maxplayer)
+
+        max_player_total = 0
+        enemy_total = 0
+
+        # for the pieces of each player (see CheckerBoard.pieces), the order does not matter
+        for (player_index, mask) in enumerate(board.pieces):
+            pawn = board.pawns[player_index]
+            for (row, column) in board.mask_squares(mask):
+                # if piece is pawn
+                if board.board[row][column] == pawn:
+                    # count distances using disttoking() method provided in checkerboard.py
+                    distance_to_kinged = board.disttoking(pawn, row)
+                    if player_index == self.maxplayer_index:
+                        max_player_total += distance_to_kinged
+                    else:
+                        enemy_total += distance_to_kinged
+        return enemy_total - max_player_total
+
+    def Edge_Piece_Count(self, board):
+        """Edge_Piece_Count returns the difference between the amount of maxplayer and enemy pieces on the edge
+        columns.
+        reasoning: "For beginners, the first strategy one often figures out is to place your checkers on the edge of
+        the board. This seems like a reasonable Checkers strategy because your pieces on the edge cannot be captured.
+        But as it turns out, while this may be a tempting strategy in your first games, pushing your checkers to the
+        edges is a mistake as it limits the moves you can make." """
+
+        # this does not need to be recomputed every time (just once in Utility function), it is recomputed here for
+        # testing purposes only
+        self.maxplayer_index = board.playeridx(self.maxplayer)
+
+        max_player_pieces_on_edge = 0
+        enemy_pieces_on_edge = 0
+
+        for r in range(1, 7, 2):  # exclude home rows
+            if board.board[r][0]:
+                if board.board[r][0] in board.players[self.maxplayer_index]:  # if piece is MAX player's
+                    max_player_pieces_on_edge += 1
+                else:
+                    enemy_pieces_on_edge += 1
+
+        for r in range(2, 7, 2):  # exclude home rows
+            if board.board[r][7]:
+                if board.board[r][7] in board.players[self.maxplayer_index]:  # if piece is MAX player's
+                    max_player_pieces_on_edge += 1
+                else:
+                    enemy_pieces_on_edge += 1
+
+
+        return enemy_pieces_on_edge - max_player_pieces_on_edge
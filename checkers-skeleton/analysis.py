@@ -0,0 +1,249 @@
+'''
+analysis - Batch position analysis with the ai.AI search
+
+analyze_positions() takes a stream of positions and searches each one
+in a pool of worker processes, yielding one record per position as the
+searches finish (not necessarily in input order):
+
+    {"id": 0, "board": "bbbbbbbbbbbb........rrrrrrrrrrrr", "player": "r",
+     "move": [[5, 2], [4, 1]], "score": 0, "pv": [...], "nodes": 1234,
+     "depth": 6, "time": 0.25}
+
+A position that cannot be read or searched (e.g. a malformed line or
+board) yields an error record instead, and the other positions are
+still analyzed:
+
+    {"id": 3, "error": "Packed board must have 32 squares"}
+
+Positions are read from the input only when a worker slot is free, so
+memory use is bounded by the number of searches in flight regardless of
+the size of the input.
+
+Usage:
+    python analysis.py positions.jsonl -o results.jsonl --depth 6
+    python analysis.py positions.jsonl -o results.jsonl --time 2 --resume
+
+Input lines are JSON objects with a packed board (CheckerBoard.pack())
+and the player to move, optionally with an id:
+    {"id": "game12-move30", "board": "...", "player": "b"}
+Positions without an id are numbered by their line in the input,
+counting from 1 and including blank lines.  With --resume, ids already
+present in the output are skipped, so an interrupted run can be
+restarted with the same arguments.  Positions whose search failed are
+searched again.
+'''
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import ai
+import checkerboard
+
+
+def analyze_position(packed, player, depth=None, time_limit=None, position_id=None):
+    """analyze_position - Search one position, returns a result record
+    packed - board in CheckerBoard.pack() format
+    player - player to move
+    depth - search depth in plies, or the maximum depth with time_limit
+    time_limit - seconds for iterative deepening (soft limit)
+    """
+    board = checkerboard.CheckerBoard.unpack(packed)
+    strategy = ai.AI(player, checkerboard.CheckerBoard, depth or 1)
+    search = strategy.searching_strategy
+
+    start = time.monotonic()
+    if time_limit is None:
+        move = search.Alpha_Beta_Search(board)
+        reached = depth
+    else:
+        move = search.Iterative_Deepening_Search(board, depth, time_limit)
+        reached = search.stats["depth"]
+    elapsed = time.monotonic() - start
+
+    score = search.score
+    if math.isinf(score):
+        # no moves available, player has lost
+        score = ai.Minimax.utility_win if score > 0 else ai.Minimax.utility_lose
+    return {"id": position_id,
+            "board": packed,
+            "player": player,
+            "move": move,
+            "score": score,
+            "pv": search.principal_variation,
+            "nodes": search.stats["nodes"],
+            "depth": reached,
+            "time": elapsed}
+
+
+def normalize(position, index):
+    """normalize - Convert an input position to (position_id, packed, player)
+    position may be a dict with board/player/id keys, or a tuple
+    (board, player) where board is a CheckerBoard or a packed string.
+    index is used as the id when none is given.
+    """
+    if isinstance(position, dict):
+        board = position["board"]
+        player = position["player"]
+        position_id = position.get("id", index)
+    else:
+        (board, player) = position
+        position_id = index
+    if isinstance(board, checkerboard.CheckerBoard):
+        board = board.pack()
+    return (position_id, board, player)
+
+
+def analyze_positions(positions, depth=None, time_limit=None, workers=None,
+                      max_pending=None, skip=()):
+    """analyze_positions - Analyze a stream of positions in parallel
+    positions - iterable of positions (see normalize)
+    depth, time_limit - search limits, at least one is required
+    workers - number of worker processes (default os.cpu_count())
+    max_pending - searches in flight at once (default 2 * workers).
+        Positions are only pulled from the input when a search slot is
+        free, which bounds memory use and provides back-pressure: a slow
+        consumer of the results stops the input from being read.
+    skip - ids which should not be analyzed (e.g. already done)
+    Yields result records (see analyze_position) as searches finish, or
+    {"id": ..., "error": message} for an invalid position (error records
+    among the positions, see read_positions, are passed on) or a search
+    that failed.
+    """
+    if depth is None and time_limit is None:
+        raise ValueError("A depth or a time limit is required")
+    # a search of one ply returns no move
+    if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or depth < 2):
+        raise ValueError("The depth must be an integer of at least 2")
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    source = enumerate(positions)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}  # future -> position id
+        exhausted = False
+        while pending or not exhausted:
+            # Top up the searches in flight
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    (index, position) = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if isinstance(position, dict) and "error" in position:
+                    yield position
+                    continue
+                try:
+                    (position_id, packed, player) = normalize(position, index)
+                except KeyError as e:
+                    error = "Position without %s" % (e,)
+                except (TypeError, ValueError) as e:
+                    error = "Invalid position: %s" % (e,)
+                else:
+                    error = None
+                if error is not None:
+                    position_id = position.get("id", index) if isinstance(position, dict) else index
+                    yield {"id": position_id, "error": error}
+                    continue
+                if position_id in skip:
+                    continue
+                future = executor.submit(analyze_position, packed, player,
+                                         depth, time_limit, position_id)
+                pending[future] = position_id
+            if not pending:
+                break
+            (done, _) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                position_id = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # one bad position must not end the whole run
+                    yield {"id": position_id, "error": str(e)}
+
+
+def completed_ids(path):
+    """completed_ids - ids of the records in a partial output file
+    Error records are left out so that their positions are retried.
+    A crash may leave a truncated last line, it is removed from the file
+    so that new records can be appended after the last complete one.
+    """
+    ids = set()
+    if not os.path.exists(path):
+        return ids
+    with open(path, "r+b") as f:
+        good = 0  # offset of the end of the last complete record
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+                if "error" not in record:
+                    ids.add(record["id"])
+            except (ValueError, KeyError):
+                break
+            good += len(line)
+        f.truncate(good)
+    return ids
+
+
+def read_positions(f):
+    """read_positions - Lazily read JSON line positions from a file
+    Positions without an id get their line number as id, a line which is
+    not a JSON object gives an error record {"id": number, "error": ...}.
+    """
+    for (number, line) in enumerate(f, 1):
+        if line.strip():
+            try:
+                position = json.loads(line)
+            except ValueError as e:
+                yield {"id": number, "error": "Invalid JSON: %s" % (e,)}
+                continue
+            if not isinstance(position, dict):
+                yield {"id": number, "error": "Position is not a JSON object"}
+                continue
+            position.setdefault("id", number)
+            yield position
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch position analysis")
+    parser.add_argument("input", help="JSON lines positions, - for stdin")
+    parser.add_argument("-o", "--output", help="JSON lines results (default stdout)")
+    parser.add_argument("--depth", type=int, help="search depth in plies")
+    parser.add_argument("--time", type=float, help="seconds per position")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--resume", action="store_true",
+                        help="skip positions already in the output file")
+    args = parser.parse_args()
+    if args.depth is None and args.time is None:
+        parser.error("one of --depth or --time is required")
+    if args.depth is not None and args.depth < 2:
+        parser.error("--depth must be at least 2")
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+
+    skip = completed_ids(args.output) if args.resume else set()
+    source = sys.stdin if args.input == "-" else open(args.input)
+    if args.output:
+        out = open(args.output, "a" if args.resume else "w")
+    else:
+        out = sys.stdout
+    try:
+        for record in analyze_positions(read_positions(source), args.depth,
+                                        args.time, args.workers, skip=skip):
+            out.write(json.dumps(record) + "\n")
+            out.flush()  # every finished record survives a crash
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
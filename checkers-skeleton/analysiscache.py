@@ -0,0 +1,233 @@
+'''
+analysiscache - Persistent analysis cache shared across runs
+
+The transposition table of Minimax is lost when the process ends, so
+every game and every tournament analyses the opening positions again.
+AnalysisCache keeps transposition entries of the positions near the
+root in a SQLite database file, where the next run (or another process
+playing at the same time) finds them:
+
+    cache = analysiscache.AnalysisCache("analysis.db")
+    player = ai.AI('r', checkerboard.CheckerBoard, 8, analysis_cache=cache)
+
+Minimax consults the cache for boards at most analysis_plies plies
+below the root (see Minimax) and saves the results it found there.
+Deeper boards are far too many to be worth a database lookup, and the
+entries near the root carry the most work.
+
+An entry holds the depth searched below the board, a lower and an
+upper bound of the utility and the code of the best move (see
+CheckerBoard.encode_action), exactly as in the transposition table.  Utilities depend on the evaluation function and
+on the player they are computed for, so entries are stored per
+evaluator (see AI.Evaluator_Id); players with different weights share
+the file without sharing entries.
+
+Writes are buffered and written in one transaction by flush, which
+Minimax calls at the end of each search.  The database uses write-ahead
+logging: readers never block, concurrent writers from several processes
+wait for each other (up to timeout seconds) and a deeper entry is never
+replaced by a shallower one.  Once the file holds more than max_entries
+entries the least recently written evict_fraction of them are deleted.
+Counting the entries scans the table, so flush keeps an estimate (the
+entries at opening plus those written since, replaced and other
+processes' entries aside) and only counts once it passes max_entries.
+
+Each thread gets its own connection, so a cache can be used by a search
+running in a searchtask.SearchTask.
+'''
+
+import json
+import math
+import sqlite3
+import threading
+import time
+
+import checkerboard
+
+schema = '''
+CREATE TABLE IF NOT EXISTS analysis (
+    evaluator TEXT NOT NULL,
+    board TEXT NOT NULL,
+    player TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    lower REAL NOT NULL,
+    upper REAL NOT NULL,
+    move TEXT,
+    written REAL NOT NULL,
+    PRIMARY KEY (evaluator, board, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS analysis_written ON analysis (written);
+'''
+
+# keeps the stored entry unless the new one was searched at least as deep
+upsert = '''
+INSERT INTO analysis (evaluator, board, player, depth, lower, upper, move, written)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (evaluator, board, player) DO UPDATE SET
+    depth = excluded.depth, lower = excluded.lower, upper = excluded.upper,
+    move = excluded.move, written = excluded.written
+WHERE excluded.depth >= analysis.depth
+'''
+
+
+def utility(value):
+    "utility - Utility read from the database, integer unless infinite"
+    return value if math.isinf(value) else int(value)
+
+
+def move_code(text):
+    """move_code - Move code read from the database, files written before
+    moves were stored as codes hold the list form of the move
+    """
+    if not text:
+        return None
+    move = json.loads(text)
+    if isinstance(move, list):
+        move = checkerboard.CheckerBoard.encode_action(move)
+    return move
+
+
+class AnalysisCache:
+    """AnalysisCache - Transposition entries in a SQLite file
+    path - database file, created if missing
+    max_entries - size limit, the oldest entries are evicted beyond it
+    evict_fraction - fraction of max_entries deleted by an eviction
+    timeout - seconds a writer waits for the lock of another process
+    hits, misses - lookup counters, writes - entries flushed,
+    evictions - entries deleted
+    """
+
+    def __init__(self, path, max_entries=1000000, evict_fraction=0.1, timeout=30.0):
+        if max_entries < 1:
+            raise ValueError("AnalysisCache max_entries must be positive")
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_fraction = evict_fraction
+        self.timeout = timeout
+        self.local = threading.local()
+        # (evaluator, board, player) -> (depth, lower, upper, move) waiting for flush
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        # entries in the file, estimated (see flush)
+        self.count = len(self)
+
+    def connection(self):
+        "connection - Database connection of the calling thread"
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            # transactions are started explicitly (see flush)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(schema)
+            self.local.connection = connection
+        return connection
+
+    def lookup(self, evaluator, key):
+        """lookup - Stored (depth, lower, upper, move) of a board or None
+        key - transposition table key (board.pack(), player to move)
+        """
+        (board, player) = key
+        entry = self.pending.get((evaluator, board, player))
+        if entry is None:
+            row = self.connection().execute(
+                "SELECT depth, lower, upper, move FROM analysis "
+                "WHERE evaluator = ? AND board = ? AND player = ?", (evaluator, board, player)).fetchone()
+            if row is not None:
+                (depth, lower, upper, move) = row
+                entry = (depth, utility(lower), utility(upper), move_code(move))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, evaluator, key, entry):
+        """store - Save a transposition entry (depth, lower, upper, move),
+        it is written by the next flush
+        """
+        (board, player) = key
+        self.pending[(evaluator, board, player)] = entry
+
+    def flush(self):
+        "flush - Write the stored entries in one transaction and evict"
+        if not self.pending:
+            return
+        written = time.time()
+        rows = [(evaluator, board, player, depth, lower, upper,
+                 json.dumps(move) if move else None, written)
+                for ((evaluator, board, player), (depth, lower, upper, move)) in self.pending.items()]
+        connection = self.connection()
+        # IMMEDIATE takes the write lock at once, two processes cannot
+        # both read first and then fail to upgrade
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(upsert, rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.writes += len(rows)
+        self.pending = {}
+        # an upper bound unless other processes write, rows may replace
+        # entries
+        self.count += len(rows)
+        if self.count > self.max_entries:
+            self.count = len(self)
+            if self.count > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        "evict - Delete the least recently written entries beyond the limit"
+        keep = int(self.max_entries * (1 - self.evict_fraction))
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            count = connection.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+            # the entries of one flush share their written time, the key
+            # breaks the ties so that exactly count - keep are deleted
+            deleted = max(connection.execute(
+                "DELETE FROM analysis WHERE (evaluator, board, player) IN "
+                "(SELECT evaluator, board, player FROM analysis "
+                "ORDER BY written, evaluator, board, player LIMIT ?)",
+                (max(count - keep, 0),)).rowcount, 0)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.evictions += deleted
+        self.count = count - deleted
+
+    def clear(self):
+        "clear - Delete all entries and reset the counters"
+        self.pending = {}
+        self.connection().execute("DELETE FROM analysis")
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def close(self):
+        "close - Flush and close the connection of the calling thread"
+        self.flush()
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def hit_rate(self):
+        "hit_rate - Fraction of lookups answered from the cache"
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        "Number of entries in the database"
+        return self.connection().execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+
+    def __repr__(self):
+        return "AnalysisCache(%r, %d hits, %d misses, %d writes)" % (
+            self.path, self.hits, self.misses, self.writes)
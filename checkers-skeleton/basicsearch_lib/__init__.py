@@ -1 +1 @@
-# Module basicsearch_lib
+# Module basicsearch_lib
@@ -0,0 +1,471 @@
+'''
+benchmark - Measurements for choosing search settings
+
+Subcommands:
+    python benchmark.py drivers --depth 4 6 8
+        Search the same positions with each Minimax driver (alpha-beta
+        and MTD(f)) and compare node counts and wall time.
+    python benchmark.py selective --depth 8
+        Search the same positions with the selective search options
+        (move ordering, late move reductions, futility pruning) and
+        compare node counts, wall time and best moves with a full search.
+    python benchmark.py memory --depth 10
+        Bytes per CheckerBoard instance, time of CheckerBoard.move and
+        memory allocated by a search (tracemalloc).
+    python benchmark.py latency --depth 4 6 8 --csv latency.csv
+        Time of AI moves (as made by AI.play) at each depth, reported
+        as p50/p90/p99/max time and node counts per game phase.
+        --corpus positions.jsonl replays {"board": packed, "player": p}
+        lines instead of sampled positions.
+    python benchmark.py mcts --time 0.5 --games 4 --workers 4
+        Games between mcts.Strategy and ai.AI with the same wall time
+        per move, the players swap colors after each game.
+    python benchmark.py symmetry --depth 6 --games 4
+        Self-play games with a transposition table and an evaluation
+        cache per player, then with both shared by the two players and
+        keyed by the canonical form of the boards (colour flip
+        symmetry), and compare the hit rates.
+
+Positions are sampled from random games (see sample_positions) and the
+boardlibrary test positions.
+'''
+
+import argparse
+import csv
+import functools
+import json
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+import ai
+import boardlibrary
+import checkerboard
+import checkers
+import clock
+import evalcache
+import mcts
+from timer import percentile
+
+
+def sample_positions(n, seed=0, min_moves=0, max_moves=None):
+    """sample_positions - (board, player to move) pairs from random games
+    n - number of positions
+    seed - random seed, the same seed gives the same positions
+    min_moves, max_moves - only keep positions after this many moves
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = checkerboard.CheckerBoard()
+        player = checkerboard.CheckerBoard.pawns[0]
+        while len(positions) < n:
+            actions = board.get_actions(player)
+            if not actions or board.is_terminal()[0]:
+                break
+            if board.movecount >= min_moves and \
+                    (max_moves is None or board.movecount <= max_moves):
+                positions.append((board, player))
+            board = board.move(rng.choice(actions))
+            player = board.other_player(player)
+    return positions
+
+
+def library_positions():
+    "library_positions - boardlibrary positions for both players"
+    boardlibrary.init_boards()
+    return [(board, player) for board in boardlibrary.boards.values()
+            for player in checkerboard.CheckerBoard.pawns
+            if board.get_actions(player)]
+
+
+def compare_drivers(positions, depth, drivers=ai.Minimax.drivers,
+                    iterative=False):
+    """compare_drivers - Run each driver on the same positions
+    depth - cutoff in plies
+    iterative - use iterative deepening to depth instead of one search
+    Returns a list of rows, one per driver, with total nodes, wall time
+    and the number of positions whose score differs from the first
+    driver's.
+    """
+    rows = []
+    reference = None
+    for driver in drivers:
+        nodes = 0
+        scores = []
+        start = time.perf_counter()
+        for (board, player) in positions:
+            search = ai.AI(player, checkerboard.CheckerBoard, depth,
+                           driver=driver).searching_strategy
+            if iterative:
+                search.Iterative_Deepening_Search(board)
+            else:
+                search.Search(board)
+            nodes += search.stats["nodes"]
+            scores.append(search.score)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = scores
+        rows.append({"driver": driver, "depth": depth, "nodes": nodes,
+                     "time": elapsed,
+                     "disagree": sum(a != b for (a, b) in zip(scores, reference))})
+    return rows
+
+
+# Minimax option sets compared by the selective subcommand
+SELECTIVE = (
+    ("full", {}),
+    ("ordering", {"move_ordering": True}),
+    ("lmr", {"move_ordering": True, "late_move_reductions": True}),
+    ("futility", {"move_ordering": True, "futility_pruning": True}),
+    ("all", {"move_ordering": True, "late_move_reductions": True,
+             "futility_pruning": True}),
+)
+
+
+def compare_selective(positions, depth, configurations=SELECTIVE):
+    """compare_selective - Run each set of search options on the same
+    positions
+    configurations - (name, Minimax keyword arguments) pairs, the first
+        one is the reference
+    Returns a list of rows, one per configuration, with total nodes, wall
+    time, reductions and prunes, and the number of positions whose best
+    move differs from the reference.
+    """
+    rows = []
+    reference = None
+    for (name, options) in configurations:
+        totals = {"nodes": 0, "lmr_reductions": 0, "lmr_researches": 0,
+                  "futility_prunes": 0}
+        moves = []
+        start = time.perf_counter()
+        for (board, player) in positions:
+            search = ai.AI(player, checkerboard.CheckerBoard, depth,
+                           **options).searching_strategy
+            moves.append(search.Search(board))
+            for counter in totals:
+                totals[counter] += search.stats[counter]
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = moves
+        row = {"options": name, "depth": depth, "time": elapsed,
+               "disagree": sum(a != b for (a, b) in zip(moves, reference))}
+        row.update(totals)
+        rows.append(row)
+    return rows
+
+
+def instance_bytes(board):
+    "instance_bytes - Memory of a board instance and its attribute dictionary"
+    size = sys.getsizeof(board)
+    if hasattr(board, "__dict__"):
+        size += sys.getsizeof(board.__dict__)
+    return size
+
+
+def board_bytes(board):
+    """board_bytes - Memory of one board: the instance (instance_bytes),
+    the piece lists, the piece masks and the piece count lists.  Objects
+    shared by all boards (class attributes, piece names, small integers)
+    are not counted.
+    """
+    return instance_bytes(board) + sys.getsizeof(board.board) + \
+        sum(sys.getsizeof(row) for row in board.board) + \
+        sys.getsizeof(board.pieces) + sum(sys.getsizeof(mask) for mask in board.pieces) + \
+        sys.getsizeof(board.pawnsN) + sys.getsizeof(board.kingsN)
+
+
+def measure_memory(board, player, depth, repeat=2000):
+    """measure_memory - Memory and copy cost of boards in a search
+    Returns a dict with the bytes of one board (board_bytes), the time
+    of one CheckerBoard.move in microseconds, and the nodes, time and
+    peak memory traced while searching board to depth plies.
+    """
+    action = board.get_actions(player)[0]
+    move_us = min(timeit.repeat(lambda: board.move(action), number=repeat,
+                                repeat=3)) / repeat * 1e6
+    search = ai.AI(player, checkerboard.CheckerBoard, depth).searching_strategy
+    tracemalloc.start()
+    start = time.perf_counter()
+    search.Search(board)
+    elapsed = time.perf_counter() - start
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # one board allocated by move, as seen by tracemalloc
+    tracemalloc.start()
+    child = board.move(action)
+    (allocated, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"depth": depth, "instance_bytes": instance_bytes(child),
+            "board_bytes": board_bytes(child),
+            "traced_bytes": allocated, "move_us": move_us,
+            "nodes": search.stats["nodes"], "time": elapsed,
+            "peak_kb": peak // 1024}
+
+
+def phase_positions(per_phase, seed=0):
+    """phase_positions - Up to per_phase sampled positions of each game
+    phase (see clock.TimeManager.phase)
+    """
+    manager = clock.TimeManager()
+    chosen = {phase: [] for phase in manager.phase_factors}
+    for (board, player) in sample_positions(max(per_phase * 40, 500), seed):
+        positions = chosen[manager.phase(board)]
+        if len(positions) < per_phase:
+            positions.append((board, player))
+    return [position for phase in manager.phase_factors
+            for position in chosen[phase]]
+
+
+def read_corpus(path):
+    "read_corpus - (board, player) pairs of a JSON lines file"
+    positions = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                position = json.loads(line)
+                positions.append((checkerboard.CheckerBoard.unpack(position["board"]),
+                                  position["player"]))
+    return positions
+
+
+def measure_latency(positions, depths, **options):
+    """measure_latency - Time a move of a new AI player (options are
+    passed to ai.AI) for each position and depth, the search is the one
+    AI.play makes.  Returns a list of samples
+    {"phase", "depth", "time", "nodes"}
+    """
+    manager = clock.TimeManager()
+    samples = []
+    for depth in depths:
+        for (board, player) in positions:
+            strategy = ai.AI(player, checkerboard.CheckerBoard, depth, **options)
+            start = time.perf_counter()
+            strategy.search(board).result()
+            elapsed = time.perf_counter() - start
+            samples.append({"phase": manager.phase(board), "depth": depth,
+                            "time": elapsed,
+                            "nodes": strategy.searching_strategy.stats["nodes"]})
+    return samples
+
+
+def latency_report(samples):
+    """latency_report - Rows of percentiles per phase and depth, times
+    in milliseconds.  Phase "all" combines the phases of a depth.
+    """
+    groups = {}
+    for sample in samples:
+        for phase in (sample["phase"], "all"):
+            groups.setdefault((sample["depth"], phase), []).append(sample)
+    order = list(clock.TimeManager.phase_factors) + ["all"]
+    rows = []
+    for (depth, phase) in sorted(groups, key=lambda g: (g[0], order.index(g[1]))):
+        group = groups[(depth, phase)]
+        times = [round(sample["time"] * 1e3, 3) for sample in group]
+        nodes = [sample["nodes"] for sample in group]
+        rows.append({"depth": depth, "phase": phase, "moves": len(group),
+                     "p50_ms": percentile(times, 50), "p90_ms": percentile(times, 90),
+                     "p99_ms": percentile(times, 99), "max_ms": max(times),
+                     "p50_nodes": percentile(nodes, 50), "p90_nodes": percentile(nodes, 90),
+                     "p99_nodes": percentile(nodes, 99), "max_nodes": max(nodes)})
+    return rows
+
+
+latency_columns = ["depth", "phase", "moves", "p50_ms", "p90_ms", "p99_ms",
+                   "max_ms", "p50_nodes", "p90_nodes", "p99_nodes", "max_nodes"]
+
+
+def write_csv(rows, columns, path):
+    "write_csv - Save rows (dicts) to a CSV file"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class TimedAI(ai.AI):
+    """TimedAI - ai.AI deepening iteratively until a hard deadline of
+    time_limit seconds per move
+    """
+
+    def __init__(self, player, game, max_plies, time_limit=1.0, **options):
+        super(TimedAI, self).__init__(player, game, max_plies, **options)
+        self.time_limit = time_limit
+
+    def play(self, board):
+        budget = clock.MoveBudget(self.time_limit, self.time_limit)
+        return self.search(board, budget=budget).result()
+
+
+def compare_mcts(games, seconds, **options):
+    """compare_mcts - Play games between mcts.Strategy (options are
+    passed to it) and TimedAI with seconds per move each.  Returns the
+    results from the MCTS player's point of view.
+    """
+    players = (functools.partial(mcts.Strategy, playouts=None, time_limit=seconds, **options),
+               functools.partial(TimedAI, time_limit=seconds))
+    results = {"wins": 0, "losses": 0, "draws": 0}
+    for game in range(games):
+        (red, black) = players if game % 2 == 0 else players[::-1]
+        color = 'r' if game % 2 == 0 else 'b'
+        start = time.perf_counter()
+        winner = checkers.Game(red, black, verbose=False)
+        outcome = "draws" if winner is None else "wins" if winner == color else "losses"
+        results[outcome] += 1
+        print("game %d: mcts plays %s, %s, %.1f s" % (
+            game + 1, color, outcome[:-1], time.perf_counter() - start))
+    return results
+
+
+def symmetry_selfplay(games, depth, canonical, seed=0, random_plies=4,
+                      eval_slots=2 ** 16, max_moves=120):
+    """symmetry_selfplay - Play games between two ai.AI players deepening
+    to depth, each with a transposition table and an evaluation cache.
+    With canonical the tables are shared by both players and keyed by
+    the canonical form of the boards (see CheckerBoard.canonical),
+    otherwise every player has its own, keyed by the packed boards.  The first random_plies moves
+    are random so that the games differ, the same seed gives the same
+    openings.  Returns a row of hit counts and rates.
+    """
+    rng = random.Random(seed)
+    pawns = checkerboard.CheckerBoard.pawns
+    totals = {"nodes": 0, "tt_probes": 0, "tt_hits": 0}
+    caches = []
+    start = time.perf_counter()
+    for _ in range(games):
+        shared = ({}, evalcache.EvalCache(eval_slots))
+        players = {}
+        for player in pawns:
+            (table, cache) = shared if canonical else ({}, evalcache.EvalCache(eval_slots))
+            if not caches or caches[-1] is not cache:
+                caches.append(cache)
+            players[player] = ai.AI(player, checkerboard.CheckerBoard, depth, transpositions=table,
+                                    eval_cache=cache, canonical_keys=canonical)
+        board = checkerboard.CheckerBoard()
+        player = pawns[0]
+        for ply in range(max_moves):
+            actions = board.get_actions(player)
+            if not actions or board.is_terminal()[0]:
+                break
+            if ply < random_plies:
+                action = rng.choice(actions)
+            else:
+                search = players[player].searching_strategy
+                action = search.Iterative_Deepening_Search(board)
+                for name in totals:
+                    totals[name] += search.stats[name]
+            board = board.move(action)
+            player = board.other_player(player)
+    hits = sum(cache.hits for cache in caches)
+    lookups = hits + sum(cache.misses for cache in caches)
+    return {"keys": "canonical" if canonical else "per player",
+            "nodes": totals["nodes"], "tt_probes": totals["tt_probes"],
+            "tt_hits": totals["tt_hits"],
+            "tt_hit_rate": totals["tt_hits"] / totals["tt_probes"] if totals["tt_probes"] else 0.0,
+            "eval_lookups": lookups,
+            "eval_hit_rate": hits / lookups if lookups else 0.0,
+            "time": time.perf_counter() - start}
+
+
+def print_table(rows, columns):
+    "print_table - Print rows (dicts) as an aligned text table"
+    cells = [[("%.3f" % row[c]) if isinstance(row[c], float) else str(row[c])
+              for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells])
+              for (i, c) in enumerate(columns)]
+    print("  ".join(c.rjust(w) for (c, w) in zip(columns, widths)))
+    for r in cells:
+        print("  ".join(v.rjust(w) for (v, w) in zip(r, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    drivers = commands.add_parser("drivers", help="compare search drivers")
+    drivers.add_argument("--depth", type=int, nargs="+", default=[4, 6])
+    drivers.add_argument("--positions", type=int, default=20,
+                         help="random middlegame positions")
+    drivers.add_argument("--seed", type=int, default=0)
+    drivers.add_argument("--iterative", action="store_true",
+                         help="iterative deepening to each depth")
+
+    selective = commands.add_parser("selective",
+                                    help="compare selective search options")
+    selective.add_argument("--depth", type=int, nargs="+", default=[6])
+    selective.add_argument("--positions", type=int, default=20,
+                           help="random middlegame positions")
+    selective.add_argument("--seed", type=int, default=0)
+
+    memory = commands.add_parser("memory", help="board memory and copy cost")
+    memory.add_argument("--depth", type=int, nargs="+", default=[10])
+
+    latency = commands.add_parser("latency",
+                                  help="move time percentiles per depth and phase")
+    latency.add_argument("--depth", type=int, nargs="+", default=[4, 6])
+    latency.add_argument("--positions", type=int, default=20,
+                         help="sampled positions per game phase")
+    latency.add_argument("--seed", type=int, default=0)
+    latency.add_argument("--corpus", help="JSON lines file of positions")
+    latency.add_argument("--csv", help="also write the report to this file")
+
+    versus = commands.add_parser("mcts", help="MCTS against alpha-beta at equal time")
+    versus.add_argument("--time", type=float, default=0.5, help="seconds per move")
+    versus.add_argument("--games", type=int, default=2)
+    versus.add_argument("--workers", type=int, default=0)
+    versus.add_argument("--parallelism", choices=("root", "leaf"), default="root")
+    versus.add_argument("--heuristic", action="store_true")
+
+    symmetry = commands.add_parser("symmetry",
+                                   help="cache hit rates with canonical keys in self-play")
+    symmetry.add_argument("--depth", type=int, default=6)
+    symmetry.add_argument("--games", type=int, default=4)
+    symmetry.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == "drivers":
+        positions = sample_positions(args.positions, args.seed, 8, 30) + \
+            library_positions()
+        rows = []
+        for depth in args.depth:
+            rows.extend(compare_drivers(positions, depth,
+                                        iterative=args.iterative))
+        print_table(rows, ["driver", "depth", "nodes", "time", "disagree"])
+    elif args.command == "selective":
+        positions = sample_positions(args.positions, args.seed, 8, 30)
+        rows = []
+        for depth in args.depth:
+            rows.extend(compare_selective(positions, depth))
+        print_table(rows, ["options", "depth", "nodes", "time", "lmr_reductions",
+                           "lmr_researches", "futility_prunes", "disagree"])
+    elif args.command == "memory":
+        boardlibrary.init_boards()
+        board = boardlibrary.boards["Pristine"]
+        rows = [measure_memory(board, "r", depth) for depth in args.depth]
+        print_table(rows, ["depth", "instance_bytes", "board_bytes",
+                           "traced_bytes", "move_us",
+                           "nodes", "time", "peak_kb"])
+    elif args.command == "latency":
+        if args.corpus:
+            positions = read_corpus(args.corpus)
+        else:
+            positions = phase_positions(args.positions, args.seed)
+        rows = latency_report(measure_latency(positions, args.depth))
+        print_table(rows, latency_columns)
+        if args.csv:
+            write_csv(rows, latency_columns, args.csv)
+    elif args.command == "mcts":
+        results = compare_mcts(args.games, args.time, workers=args.workers,
+                               parallelism=args.parallelism, heuristic=args.heuristic)
+        print("mcts: %(wins)d wins, %(losses)d losses, %(draws)d draws" % results)
+    elif args.command == "symmetry":
+        rows = [symmetry_selfplay(args.games, args.depth, canonical, args.seed)
+                for canonical in (False, True)]
+        print_table(rows, ["keys", "nodes", "tt_probes", "tt_hits", "tt_hit_rate",
+                           "eval_lookups", "eval_hit_rate", "time"])
+
+
+if __name__ == "__main__":
+    main()
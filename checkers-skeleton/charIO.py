@@ -1,58 +1,85 @@
-# io - Functions for input/output
-
-import os
-import platform
-import stat
-import sys
-
-# Tested on Windows and Ubuntu 16.04
-
-def getchWindows():
-    "getchWindows() - Return an unbuffered character"
-    ch = msvcrt.getch()
-    return ch.decode('utf-8')
-    
-def getchUnix():
-    "getchUnix - Return an unbuffered character"
-    try:
-        tty.setraw(fd)  # Set tty to unbuffered
-        ch = sys.stdin.read(1)    # Read one character
-    finally:
-        # Reset to buffered I/O
-        termios.tcsetattr(fd, termios.TCSADRAIN, sanetty)
-    return ch
-
-
-def getchBuffered():
-    """"getchBuffered() -  Read a line, user must terminate with carriage return
-    Not as fancy as the raw reads, but more likely to not have problems
-    """
-
-    line = input()
-    # Only care about the first character
-    return line[0] if len(line) else ""
-
-
-fd = sys.stdin.fileno()  # get stdin file descriptor handle
-# If anything other than a TTY, use buffered input
-mode = os.fstat(fd).st_mode
-if stat.S_ISCHR(mode):
-    # chracter device
-    
-    systype = platform.system()
-    if systype == "Windows":
-        import msvcrt
-        getch = getchWindows
-    elif systype == "Linux":
-        # Get the current tty settings and save them
-        import tty, termios
-        fd = sys.stdin.fileno()
-        sanetty = termios.tcgetattr(fd)
-        getch = getchUnix
-    else:
-        getch = getchBuffered
-else:
-    getch = getchBuffered
-    
-    
-is_buffered = getch == getchBuffered
\ No newline at end of file
+# io - Functions for input/output
+
+import os
+import stat
+import sys
+
+# Tested on Windows and Ubuntu 16.04
+
+def getchWindows():
+    "getchWindows() - Return an unbuffered character"
+    ch = msvcrt.getch()
+    return ch.decode('utf-8')
+    
+def getchUnix():
+    "getchUnix - Return an unbuffered character"
+    try:
+        tty.setraw(fd)  # Set tty to unbuffered
+        ch = sys.stdin.read(1)    # Read one character
+    finally:
+        # Reset to buffered I/O
+        termios.tcsetattr(fd, termios.TCSADRAIN, sanetty)
+    return ch
+
+
+def getchBuffered():
+    """"getchBuffered() -  Read a line, user must terminate with carriage return
+    Not as fancy as the raw reads, but more likely to not have problems
+    """
+
+    line = input()
+    # Only care about the first character
+    return line[0] if len(line) else ""
+
+
+def select_reader():
+    """select_reader() - Choose how characters are read from stdin
+    Unbuffered reads need a terminal, anything else (pipes, files,
+    containers without a tty) uses buffered input.  Called on the first
+    getch() rather than on import, so modules importing charIO do not
+    touch the terminal.
+    """
+    global fd, sanetty, msvcrt, tty, termios
+    try:
+        fd = sys.stdin.fileno()  # get stdin file descriptor handle
+        # If anything other than a TTY, use buffered input
+        mode = os.fstat(fd).st_mode
+    except (AttributeError, ValueError, OSError):
+        return getchBuffered  # no usable stdin
+    if stat.S_ISCHR(mode):
+        # chracter device
+        import platform
+        systype = platform.system()
+        if systype == "Windows":
+            import msvcrt
+            return getchWindows
+        elif systype == "Linux":
+            # Get the current tty settings and save them
+            import tty, termios
+            try:
+                sanetty = termios.tcgetattr(fd)
+            except termios.error:
+                return getchBuffered  # character device but not a terminal
+            return getchUnix
+    return getchBuffered
+
+
+reader = None  # function used by getch, chosen on first use
+
+
+def getch():
+    "getch() - Return a character, unbuffered when stdin is a terminal"
+    global reader
+    if reader is None:
+        reader = select_reader()
+    return reader()
+
+
+def __getattr__(name):
+    "is_buffered - True if getch reads buffered lines (chosen on first use)"
+    if name == "is_buffered":
+        global reader
+        if reader is None:
+            reader = select_reader()
+        return reader == getchBuffered
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,84 +1,169 @@
-'''
-@author: mroch
-'''
-
-# Game representation and mechanics
-import checkerboard
-
-# tonto - Professor Roch's not too smart strategy
-# You are not given source code to this, but compiled .pyc files
-# are available for Python 3.7 and 3.8 (fails otherwise).
-# This will let you test some of your game logic without having to worry
-# about whether or not your AI is working and let you pit your player
-# against another computer player.
-#
-# Decompilation is cheating, don't do it.  Big sister is watching you :-)
-
-# Python cand load compiled modules using the imp module (deprecated)
-# We'll format the path to the tonto module based on the
-# release of Python.  Note that we provided tonto compilations for Python 3.7
-# and 3.8.  If you're not using one of these, it won't work.
-import imp
-import sys
-import ai
-major = sys.version_info[0]
-minor = sys.version_info[1]
-modpath = "__pycache__/tonto.cpython-{}{}.pyc".format(major, minor)
-tonto = imp.load_compiled("tonto", modpath)
-
-
-# human - human player, prompts for input    
-import human
-
-import boardlibrary # might be useful for debugging
-
-from timer import Timer
-        
-
-def Game(red=human.Strategy, black=tonto.Strategy, 
-         maxplies=10, init=None, verbose=True, firstmove=0):
-    """Game(red, black, maxplies, init, verbose, turn)
-    Start a game of checkers
-    red,black - Strategy classes (not instances)
-    maxplies - # of turns to explore (default 10)
-    init - Start with given board (default None uses a brand new game)
-    verbose - Show messages (default True)
-    firstmove - Player N starts 0 (red) or 1 (black).  Default 0. 
-    """
-    my_board = checkerboard.CheckerBoard() if (init is None) else init
-
-    print("Initial state of the board:")
-    print(my_board)
-
-    red_player = red('r', checkerboard.CheckerBoard, maxplies)
-    print(black)
-    black_player = black.Strategy('b', checkerboard.CheckerBoard, maxplies)
-
-    players = (red_player, black_player)
-    i = 1
-    game_over = False
-    winner = None
-    print("Game begins now!")
-    current_board = my_board
-    while not game_over:
-        i += 1
-        new_board, best_move = players[i % 2].play(current_board)
-        print(new_board)
-        print(best_move)
-        (game_over, winner) = new_board.is_terminal()
-        current_board = new_board
-
-    # Output statement for the winner declarations
-    if winner in ['r', 'R']:
-        print("The winner is RED player")
-    elif winner in ['b', 'B']:
-        print("The winner is BLACK player")
-    else:
-        print("The game ended in a draw")
-    
-            
-if __name__ == "__main__":
-    #Game(init=boardlibrary.boards["multihop"])
-    #Game(init=boardlibrary.boards["StrategyTest1"])
-    #Game(init=boardlibrary.boards["EndGame1"], firstmove = 1)
-    Game(ai.AI, tonto, 10)
\ No newline at end of file
+'''
+@author: mroch
+'''
+
+# Game representation and mechanics
+import checkerboard
+
+# Strategies are looked up by name in the strategies registry and only
+# imported when a game needs them:
+#   ai    - minimax with alpha-beta pruning (ai.AI)
+#   human - human player, prompts for input
+#   tonto - Professor Roch's not too smart strategy
+# You are not given source code to tonto, but compiled .pyc files
+# are available for Python 3.6, 3.7 and 3.8 (fails otherwise).
+# This will let you test some of your game logic without having to worry
+# about whether or not your AI is working and let you pit your player
+# against another computer player.
+#
+# Decompilation is cheating, don't do it.  Big sister is watching you :-)
+import strategies
+
+# boardlibrary (might be useful for debugging) is imported by the
+# command line interface when a starting board is named
+
+from timer import Timer
+
+usage = '''
+Play checkers, e.g.
+    python checkers.py --red ai --black tonto --maxplies 10
+    python checkers.py --red ai --black ai --games 10 --quiet
+Strategies are names from the strategies registry (%s) or
+module:attribute.
+'''
+
+
+def Game(red="human", black="tonto",
+         maxplies=10, init=None, verbose=True, firstmove=0):
+    """Game(red, black, maxplies, init, verbose, turn)
+    Start a game of checkers
+    red,black - Strategy classes (not instances) or strategy names
+        (see strategies.resolve)
+    maxplies - # of turns to explore (default 10)
+    init - Start with given board (default None uses a brand new game)
+    verbose - Show messages (default True)
+    firstmove - Player N starts 0 (red) or 1 (black).  Default 0.
+    Returns the winner ('r', 'b' or None for a draw)
+    """
+    if isinstance(red, str):
+        red = strategies.resolve(red)
+    if isinstance(black, str):
+        black = strategies.resolve(black)
+    my_board = checkerboard.CheckerBoard() if (init is None) else init
+
+    if verbose:
+        print("Initial state of the board:")
+        print(my_board)
+
+    red_player = red('r', checkerboard.CheckerBoard, maxplies)
+    black_player = black('b', checkerboard.CheckerBoard, maxplies)
+
+    players = (red_player, black_player)
+    i = 1 + firstmove
+    game_over = False
+    winner = None
+    if verbose:
+        print("Game begins now!")
+    current_board = my_board
+    while not game_over:
+        i += 1
+        player = players[i % 2]
+        new_board, best_move = player.play(current_board)
+        if not best_move:
+            # no move (or a forfeit), the player loses
+            game_over = True
+            winner = checkerboard.CheckerBoard.other_player(player.maxplayer)
+            break
+        if verbose:
+            print(new_board)
+            print(best_move)
+        (game_over, winner) = new_board.is_terminal()
+        current_board = new_board
+
+    # Output statement for the winner declarations
+    if verbose:
+        if winner in ['r', 'R']:
+            print("The winner is RED player")
+        elif winner in ['b', 'B']:
+            print("The winner is BLACK player")
+        else:
+            print("The game ended in a draw")
+    return winner
+
+
+def strategy_name(strategy):
+    "strategy_name - Name of a strategy class or the strategy name itself"
+    if isinstance(strategy, str):
+        return strategy
+    return "%s.%s" % (strategy.__module__, strategy.__name__)
+
+
+def Match(first, second, games=2, maxplies=10, init=None, verbose=False):
+    """Match(first, second, games, maxplies, init, verbose)
+    Play a series of games, first plays red in the even numbered games
+    and black in the odd ones.
+    first, second - Strategy classes or names
+    Returns a dict of results from first's point of view:
+        wins, losses, draws
+    """
+    results = {"wins": 0, "losses": 0, "draws": 0}
+    for game in range(games):
+        red, black = (first, second) if game % 2 == 0 else (second, first)
+        first_color = 'r' if game % 2 == 0 else 'b'
+        timer = Timer()
+        winner = Game(red, black, maxplies, init, verbose)
+        if winner is None:
+            results["draws"] += 1
+        elif winner == first_color:
+            results["wins"] += 1
+        else:
+            results["losses"] += 1
+        print("game %d: %s (red) vs %s (black), %s, %.1f s" % (
+            game + 1, strategy_name(red), strategy_name(black),
+            {"r": "red wins", "b": "black wins", None: "draw"}[winner],
+            timer.elapsed_s()))
+    return results
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Checkers", epilog=usage % ", ".join(strategies.names()),
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--red", default="ai", help="red strategy")
+    parser.add_argument("--black", default="tonto", help="black strategy")
+    parser.add_argument("--maxplies", type=int, default=10)
+    parser.add_argument("--games", type=int, default=1,
+                        help="play a match of this many games, the players "
+                             "swap colors after each game")
+    parser.add_argument("--init", help="starting board from boardlibrary")
+    parser.add_argument("--firstmove", type=int, choices=(0, 1), default=0,
+                        help="1 if black moves first")
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not show the boards")
+    args = parser.parse_args(argv)
+
+    init = None
+    if args.init:
+        import boardlibrary
+        init = boardlibrary.boards[args.init]
+    try:
+        red = strategies.resolve(args.red)
+        black = strategies.resolve(args.black)
+    except (KeyError, ImportError) as e:
+        parser.error("cannot load strategy: %s" % e)
+
+    if args.games == 1:
+        Game(red, black, args.maxplies, init, not args.quiet, args.firstmove)
+    else:
+        results = Match(args.red, args.black, args.games, args.maxplies,
+                        init, not args.quiet)
+        print("%s: %d wins, %d losses, %d draws" % (
+            args.red, results["wins"], results["losses"], results["draws"]))
+
+
+if __name__ == "__main__":
+    #Game(init=boardlibrary.boards["multihop"])
+    #Game(init=boardlibrary.boards["StrategyTest1"])
+    #Game(init=boardlibrary.boards["EndGame1"], firstmove = 1)
+    main()
@@ -0,0 +1,145 @@
+'''
+clock - Time management for games played with a clock
+
+A player with a clock has to divide the remaining time between the
+moves still to come.  TimeManager decides how much of it one move may
+use and returns a MoveBudget with two limits:
+
+    soft - iterative deepening does not start another iteration once
+        the soft limit is used up, or when the next iteration is
+        predicted to end after the hard limit
+    hard - the deadline, a search still running then is aborted
+        (see ai.Minimax.deadline) and the move of the last completed
+        iteration is played
+
+    manager = TimeManager()
+    budget = manager.allocate(board, remaining=120.0, increment=2.0)
+    move = player.searching_strategy.Iterative_Deepening_Search(
+        board, budget=budget)
+
+The soft limit depends on the game phase, counted from the pieces on
+the board: openings are mostly book-like and get less time, endgames
+need deep searches and get more.  It grows while the search is
+unstable, i.e. when a deeper iteration changes the best move or its
+score drops below that of the iteration two plies shallower (scores
+alternate with the parity of the cutoff depth, so successive iterations
+are not compared).  The hard limit keeps a safety margin for the time the
+move takes to reach the clock (process pools, sockets) so that a
+loaded machine does not lose on time.
+
+All times are in seconds and measured with time.monotonic().
+'''
+
+import time
+
+
+class MoveBudget:
+    """MoveBudget - Time limits of one move
+    soft, hard - seconds the move should and may use
+    start - time.monotonic() when the move's clock started
+    instability - factor by which soft grows each time the best move
+        changes or the score drops (never beyond hard)
+    """
+
+    def __init__(self, soft, hard, start=None, instability=1.5):
+        self.soft = min(soft, hard)
+        self.hard = hard
+        self.start = time.monotonic() if start is None else start
+        self.deadline = self.start + hard
+        self.instability = instability
+        self.best_move = None
+        self.scores = []  # scores of the last two iterations
+        self.iteration_time = 0.0
+        self.growth = 1.0  # ratio of the last two iteration times
+
+    def elapsed(self):
+        "elapsed - Seconds used so far"
+        return time.monotonic() - self.start
+
+    def update(self, best_move, score, iteration_time):
+        """update - Report a completed iteration
+        Extends the soft limit if the iteration changed the best move or
+        lowered the score of the iteration before the previous one, the
+        last one searched to a cutoff of the same parity.
+        """
+        if self.iteration_time > 0:
+            self.growth = max(iteration_time / self.iteration_time, 1.0)
+        if self.best_move is not None and \
+                (best_move != self.best_move or
+                 len(self.scores) == 2 and score < self.scores[0]):
+            self.soft = min(self.soft * self.instability, self.hard)
+        self.best_move = best_move
+        self.scores = self.scores[-1:] + [score]
+        self.iteration_time = iteration_time
+
+    def stop(self):
+        """stop - True if no further iteration should be started: the
+        soft limit is used up or the next iteration, assumed to grow
+        like the last one, would not complete before the deadline
+        """
+        elapsed = self.elapsed()
+        return elapsed >= self.soft or \
+            elapsed + self.iteration_time * self.growth > self.hard
+
+    def __repr__(self):
+        return "MoveBudget(soft=%.3f, hard=%.3f)" % (self.soft, self.hard)
+
+
+class TimeManager:
+    """TimeManager - Allocates the remaining clock time to moves
+    safety - seconds kept back from the hard limit for the latency
+        between the search ending and the move reaching the clock
+    hard_ratio - the hard limit is at most this multiple of the soft one
+    max_fraction - the hard limit never exceeds this fraction of the
+        remaining time (plus the increment)
+    minimum - the smallest budget given to a move
+    instability - see MoveBudget
+    """
+
+    # phase -> multiplier of the base time
+    phase_factors = {"opening": 0.7, "middlegame": 1.0, "endgame": 1.3}
+    # piece counts separating the phases
+    opening_pieces = 20
+    endgame_pieces = 8
+
+    def __init__(self, safety=0.05, hard_ratio=3.0, max_fraction=0.25,
+                 minimum=0.01, instability=1.5):
+        self.safety = safety
+        self.hard_ratio = hard_ratio
+        self.max_fraction = max_fraction
+        self.minimum = minimum
+        self.instability = instability
+
+    def pieces(self, board):
+        "pieces - Number of pieces of both players on board"
+        return sum(board.pawnsN) + sum(board.kingsN)
+
+    def phase(self, board):
+        "phase - Game phase of board: opening, middlegame or endgame"
+        pieces = self.pieces(board)
+        if pieces >= self.opening_pieces:
+            return "opening"
+        if pieces <= self.endgame_pieces:
+            return "endgame"
+        return "middlegame"
+
+    def moves_to_go(self, board):
+        """moves_to_go - Expected number of moves still to be played by
+        one player, games with few pieces end sooner
+        """
+        return 10 + self.pieces(board)
+
+    def allocate(self, board, remaining, increment=0, start=None):
+        """allocate - MoveBudget for the player to move on board
+        remaining - seconds left on the player's clock
+        increment - seconds added to the clock after the move
+        start - time.monotonic() when the clock started running,
+            default now
+        """
+        base = remaining / self.moves_to_go(board) + increment
+        soft = base * self.phase_factors[self.phase(board)]
+        hard = min(soft * self.hard_ratio,
+                   remaining * self.max_fraction + increment) - self.safety
+        hard = max(hard, self.minimum)
+        soft = max(min(soft, hard), self.minimum)
+        return MoveBudget(soft, hard, start, self.instability)
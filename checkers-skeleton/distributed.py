@@ -0,0 +1,382 @@
+'''
+distributed - Minimax search spread over worker processes on other hosts
+
+A coordinator expands the game tree to split_depth plies below the root
+and sends the positions there, the frontier, as jobs to workers which
+connect to it over TCP.  Each worker searches its subtree with
+ai.Minimax to the full depth and returns the utility, the coordinator
+combines the results by minimax.
+
+    coordinator = distributed.Coordinator(port=9000)
+    # on each host:  python distributed.py worker --connect coordinator:9000
+    coordinator.wait_for_workers(4)
+    (move, score) = coordinator.search(board, 'r', max_plies=10, split_depth=2)
+
+Protocol: line delimited JSON as in server.py, one object per line.
+    coordinator -> worker
+        {"op": "search", "job": 7, "board": packed, "counters": [movecount,
+         lastcapture, lastpawnadvance], "player": "b", "max_player": "r",
+         "max_plies": 10, "ply": 3, "alpha": 12, "beta": null,
+         "weights": [2, 3, 5, 5, 2]}
+            search the board with player to move, ply plies below the
+            root, with the window (alpha, beta) of utilities for
+            max_player (null is infinite)
+        {"op": "stop"}
+    worker -> coordinator
+        {"op": "hello"} once after connecting
+        {"job": 7, "utility": 15, "nodes": 5321}
+
+Alpha bounds: the root moves are decided in order and every job is
+sent with the best utility of the root moves decided when a worker
+takes it, so jobs sent later search narrower windows.  A job result at or below its alpha
+is an upper bound only, which is enough: a root move whose utility is
+not above the best one is never chosen, and minimax over bounds of this
+kind gives the exact utility whenever it is above the best one.
+
+Workers take jobs from one queue as they become free, a worker whose
+connection breaks (or which does not answer within job_timeout
+seconds) is dropped and its job is put back in the queue for another
+worker.
+
+Usage:
+    python distributed.py coordinator --port 9000 --workers 2 --depth 8 --split 2
+    python distributed.py worker --connect 127.0.0.1:9000
+'''
+
+import argparse
+import json
+import queue
+import socket
+import threading
+import time
+
+import ai
+import checkerboard
+
+
+def window_bound(value):
+    "window_bound - JSON form of an alpha or beta bound, None if infinite"
+    return None if value in (ai.Minimax.neg_infinity, ai.Minimax.pos_infinity) else value
+
+
+def search_job(message):
+    """search_job - Search the subtree of a job message (see the module
+    documentation), returns (utility, nodes)
+    """
+    board = checkerboard.CheckerBoard.unpack(message["board"])
+    (board.movecount, board.lastcapture, board.lastpawnadvance) = message["counters"]
+    strategy = ai.AI(message["max_player"], checkerboard.CheckerBoard, message["max_plies"],
+                     message.get("weights"))
+    minimax = strategy.searching_strategy
+    minimax.stats = minimax.New_Stats()
+    minimax.pv_table = {}
+    minimax.pv_hint = []
+    alpha = minimax.neg_infinity if message["alpha"] is None else message["alpha"]
+    beta = minimax.pos_infinity if message["beta"] is None else message["beta"]
+    if message["player"] == message["max_player"]:
+        (utility, _) = minimax.Max_Value(board, alpha, beta, message["ply"])
+    else:
+        (utility, _) = minimax.Min_Value(board, alpha, beta, message["ply"])
+    return utility, minimax.stats["nodes"]
+
+
+class Worker:
+    """Worker - Connects to a coordinator and searches the jobs it sends
+    until it is told to stop or the connection closes
+    host, port - address of the coordinator
+    connect_timeout - seconds to keep trying to connect
+    """
+
+    def __init__(self, host, port, connect_timeout=10.0):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.jobs = 0
+
+    def connect(self):
+        "connect - Socket connected to the coordinator, retried until connect_timeout"
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                return socket.create_connection((self.host, self.port))
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+
+    def run(self):
+        "run - Serve jobs, returns the number of jobs searched"
+        with self.connect() as connection:
+            reader = connection.makefile("r")
+            connection.sendall(b'{"op": "hello"}\n')
+            for line in reader:
+                message = json.loads(line)
+                if message["op"] == "stop":
+                    break
+                (utility, nodes) = search_job(message)
+                reply = {"job": message["job"], "utility": utility, "nodes": nodes}
+                connection.sendall((json.dumps(reply) + "\n").encode())
+                self.jobs += 1
+        return self.jobs
+
+
+def run_worker(host, port, connect_timeout=10.0):
+    "run_worker - Process entry point of a worker"
+    return Worker(host, port, connect_timeout).run()
+
+
+class SplitNode:
+    """SplitNode - Position of the coordinator's tree above the frontier
+    player - player to move
+    children - child nodes, None at the frontier and at the end of a game
+    value - utility of a finished game or the result of a frontier job
+    """
+
+    __slots__ = ("player", "children", "value")
+
+    def __init__(self, player, children=None, value=None):
+        self.player = player
+        self.children = children
+        self.value = value
+
+
+class Job:
+    """Job - Frontier position to be searched by a worker
+    search - the RootSearch it belongs to
+    root - index of the root move above it
+    node - its SplitNode, receives the result
+    """
+
+    def __init__(self, search, root, node, board, ply):
+        self.search = search
+        self.root = root
+        self.node = node
+        self.board = board
+        self.ply = ply
+        self.id = None
+
+    def message(self):
+        "message - The job request, with the current best root utility as alpha"
+        search = self.search
+        return {"op": "search", "job": self.id, "board": self.board.pack(),
+                "counters": [self.board.movecount, self.board.lastcapture, self.board.lastpawnadvance],
+                "player": self.node.player, "max_player": search.max_player,
+                "max_plies": search.max_plies, "ply": self.ply,
+                "alpha": window_bound(search.alpha), "beta": None,
+                "weights": list(search.weights)}
+
+
+class RootSearch:
+    """RootSearch - State of one distributed search
+    alpha - best utility of a completed root move, read by the worker
+        threads when they send a job
+    """
+
+    def __init__(self, board, player, max_plies, split_depth, weights):
+        self.max_player = player
+        self.min_player = checkerboard.CheckerBoard.other_player(player)
+        self.max_plies = max_plies
+        self.split_depth = min(split_depth, max_plies)
+        self.weights = tuple(weights) if weights is not None else ai.AI.default_weights
+        self.alpha = ai.Minimax.neg_infinity
+        self.minimax = ai.Minimax(self.max_player, self.min_player, max_plies, None)
+        self.results = queue.Queue()
+        self.actions = board.get_actions(player)
+        self.jobs = []
+        # per root move: SplitNode and number of jobs without a result
+        self.roots = []
+        self.pending = []
+        for (index, action) in enumerate(self.actions):
+            start = len(self.jobs)
+            self.roots.append(self.expand(board.move(action), self.min_player, 2, index))
+            self.pending.append(len(self.jobs) - start)
+
+    def expand(self, board, player, ply, root):
+        "expand - SplitNode of board with player to move, ply plies below the root"
+        (game_over, winner) = board.is_terminal()
+        if game_over:
+            return SplitNode(player, value=self.minimax.Game_Over_Utility(winner))
+        if ply > self.split_depth:
+            node = SplitNode(player)
+            self.jobs.append(Job(self, root, node, board, ply))
+            return node
+        opponent = checkerboard.CheckerBoard.other_player(player)
+        return SplitNode(player, [self.expand(board.move(action), opponent, ply + 1, root)
+                                  for action in board.get_actions(player)])
+
+    def value(self, node):
+        "value - Minimax utility of a node whose jobs are finished"
+        if node.children is None:
+            return node.value
+        values = [self.value(child) for child in node.children]
+        return max(values) if node.player == self.max_player else min(values)
+
+
+class Coordinator:
+    """Coordinator - Accepts workers and runs distributed searches
+    host, port - address to listen on, port 0 picks a free port (see
+        address)
+    job_timeout - seconds a worker may take for a job before it is
+        considered lost, None waits as long as the connection is open
+    stats - counters of the most recent search
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, job_timeout=None):
+        self.listener = socket.create_server((host, port))
+        self.address = self.listener.getsockname()[:2]
+        self.job_timeout = job_timeout
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.workers = 0
+        self.lost = 0
+        self.next_job = 0
+        self.stats = {}
+        threading.Thread(target=self.accept, daemon=True).start()
+
+    def accept(self):
+        "accept - Thread starting a handler for each connecting worker"
+        while True:
+            try:
+                (connection, _) = self.listener.accept()
+            except OSError:
+                return  # the listener was closed
+            threading.Thread(target=self.serve_worker, args=(connection,), daemon=True).start()
+
+    def serve_worker(self, connection):
+        "serve_worker - Thread sending jobs to one worker until it is lost or stopped"
+        reader = connection.makefile("r")
+        try:
+            if not reader.readline():
+                return
+            with self.lock:
+                self.workers += 1
+                self.changed.notify_all()
+            while True:
+                job = self.queue.get()
+                if job is None:
+                    connection.sendall(b'{"op": "stop"}\n')
+                    return
+                try:
+                    connection.settimeout(self.job_timeout)
+                    connection.sendall((json.dumps(job.message()) + "\n").encode())
+                    line = reader.readline()
+                    if not line:
+                        raise ConnectionError("worker closed the connection")
+                    reply = json.loads(line)
+                except (OSError, ValueError):
+                    # the worker is gone, another one searches the job
+                    with self.lock:
+                        self.lost += 1
+                    self.queue.put(job)
+                    return
+                job.search.results.put((job, reply))
+        finally:
+            with self.lock:
+                self.workers -= 1
+                self.changed.notify_all()
+            connection.close()
+
+    def wait_for_workers(self, count, timeout=None):
+        "wait_for_workers - Wait until count workers are connected, returns True if they are"
+        with self.lock:
+            return self.changed.wait_for(lambda: self.workers >= count, timeout)
+
+    def search(self, board, player, max_plies, split_depth=1, weights=None, timeout=None):
+        """search - Best move of player on board, searched to max_plies
+        with the tree split split_depth plies below the root.
+        weights - utility weights (see ai.AI), the defaults if None
+        timeout - seconds to wait for each job result (TimeoutError)
+        Returns (move, utility), move is None if player has no move.
+        """
+        start = time.monotonic()
+        search = RootSearch(board, player, max_plies, split_depth, weights)
+        with self.lock:
+            lost = self.lost
+            for job in search.jobs:
+                job.id = self.next_job
+                self.next_job += 1
+        for job in search.jobs:
+            self.queue.put(job)
+
+        best = None
+        nodes = 0
+        # root moves are decided in order (the first one with the best utility is kept, as in Minimax), decided
+        # is the number of root moves decided so far
+        decided = 0
+        remaining = len(search.jobs)
+        while True:
+            while decided < len(search.roots) and search.pending[decided] == 0:
+                utility = search.value(search.roots[decided])
+                if best is None or utility > search.alpha:
+                    best = decided
+                    search.alpha = utility
+                decided += 1
+            if not remaining:
+                break
+            try:
+                (job, reply) = search.results.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError("no result from the workers within %s seconds" % timeout)
+            job.node.value = reply["utility"]
+            nodes += reply["nodes"]
+            remaining -= 1
+            search.pending[job.root] -= 1
+
+        self.stats = {"jobs": len(search.jobs), "nodes": nodes, "workers": self.workers,
+                      "resubmitted": self.lost - lost, "time": time.monotonic() - start}
+        if best is None:
+            return None, None
+        return search.actions[best], search.alpha
+
+    def close(self):
+        "close - Stop accepting workers and tell the connected ones to stop"
+        self.listener.close()
+        with self.lock:
+            workers = self.workers
+        for _ in range(workers):
+            self.queue.put(None)
+
+
+def main():
+    import boardlibrary
+
+    parser = argparse.ArgumentParser(description="Distributed minimax search")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    work = commands.add_parser("worker", help="search jobs of a coordinator")
+    work.add_argument("--connect", required=True, help="host:port of the coordinator")
+
+    coordinate = commands.add_parser("coordinator", help="search a position with workers")
+    coordinate.add_argument("board", nargs="?", default="Pristine",
+                            help="boardlibrary name or packed board")
+    coordinate.add_argument("--player", default="r")
+    coordinate.add_argument("--host", default="127.0.0.1")
+    coordinate.add_argument("--port", type=int, default=9000)
+    coordinate.add_argument("--workers", type=int, default=1, help="workers to wait for")
+    coordinate.add_argument("--depth", type=int, default=8)
+    coordinate.add_argument("--split", type=int, default=1, help="plies expanded by the coordinator")
+
+    args = parser.parse_args()
+    if args.command == "worker":
+        (host, port) = args.connect.rsplit(":", 1)
+        print("%d jobs" % run_worker(host, int(port)))
+    else:
+        boardlibrary.init_boards()
+        if args.board in boardlibrary.boards:
+            board = boardlibrary.boards[args.board]
+        else:
+            board = checkerboard.CheckerBoard.unpack(args.board)
+        coordinator = Coordinator(args.host, args.port)
+        print("waiting for %d workers on %s:%d" % ((args.workers,) + coordinator.address))
+        coordinator.wait_for_workers(args.workers)
+        (move, utility) = coordinator.search(board, args.player, args.depth, args.split)
+        print("%s, utility %s" % (checkerboard.CheckerBoard.get_action_str(move) if move else "no move",
+                                  utility))
+        print("%(jobs)d jobs, %(nodes)d nodes, %(workers)d workers, %(resubmitted)d resubmitted, "
+              "%(time).2f s" % coordinator.stats)
+        coordinator.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+'''
+evalcache - Fixed-size cache of evaluation results
+
+The same leaf position is often reached through different move orders
+and evaluated again each time.  EvalCache remembers utilities in a
+table with a fixed number of slots, each position has exactly one slot
+chosen from the hash of its key:
+
+    cache = EvalCache(2 ** 16)
+    utility = cache.lookup(key)
+    if utility is None:
+        utility = evaluate(board)
+        cache.store(key, utility)
+
+A new entry always replaces whatever is in its slot, there is no
+eviction policy and the memory use never grows.  The cache holds the
+utilities of one evaluator (e.g. one ai.AI player with fixed weights),
+it has to be cleared when the evaluation changes.  Keys are usually
+CheckerBoard.pack() strings.
+'''
+
+
+class EvalCache:
+    """EvalCache - Always-replace hash table of utilities
+    size - number of slots, rounded up to a power of two
+    hits, misses - lookup counters
+    overwrites - stores which replaced a different position
+    """
+
+    def __init__(self, size=2 ** 16):
+        if size < 1:
+            raise ValueError("EvalCache size must be positive")
+        self.size = 1 << (size - 1).bit_length()
+        self.mask = self.size - 1
+        self.keys = [None] * self.size
+        self.values = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def lookup(self, key):
+        "lookup - Cached utility of key or None"
+        slot = hash(key) & self.mask
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.values[slot]
+        self.misses += 1
+        return None
+
+    def store(self, key, value):
+        "store - Save the utility of key, replacing the slot's entry"
+        slot = hash(key) & self.mask
+        if self.keys[slot] is not None and self.keys[slot] != key:
+            self.overwrites += 1
+        self.keys[slot] = key
+        self.values[slot] = value
+
+    def clear(self):
+        "clear - Empty all slots and reset the counters"
+        self.keys = [None] * self.size
+        self.values = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def hit_rate(self):
+        "hit_rate - Fraction of lookups answered from the cache"
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        "Number of occupied slots"
+        return self.size - self.keys.count(None)
+
+    def __repr__(self):
+        return "EvalCache(%d slots, %d hits, %d misses, %d overwrites)" % (
+            self.size, self.hits, self.misses, self.overwrites)
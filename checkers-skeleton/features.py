@@ -0,0 +1,233 @@
+'''
+features - Bulk conversion of checkerboards to NumPy arrays
+
+Positions are converted in chunks into preallocated arrays:
+
+    planes   N x 5 x 32 uint8, one value per playable square in
+             CheckerBoard.pack() order (row-major), planes are
+             red pawns, red kings, black pawns, black kings and
+             side to move (all ones when red is to move)
+    scalars  N x 5 float64, the ai.AI features (see AI.Features) from
+             the point of view of the player to move
+
+Everything is computed with NumPy from the packed board strings, so no
+Python loop over the squares of each board is needed.  The scalar
+features are identical to those of AI.Features.
+
+Arrays can be written to memory-mapped .npy files, so datasets larger
+than memory can be produced chunk by chunk and later opened with
+load() without reading them into memory.
+
+Usage:
+    python features.py positions.jsonl --planes planes.npy --scalars scalars.npy
+where positions.jsonl holds {"board": packed, "player": "r"} lines.
+'''
+
+import argparse
+import itertools
+import json
+
+import numpy as np
+
+import checkerboard
+
+PLANES = ("red_pawns", "red_kings", "black_pawns", "black_kings",
+          "side_to_move")
+FEATURES = ("pawn_perc_diff", "king_perc_diff", "home_row_pieces",
+            "distance_from_kinged", "edge_piece_count")
+SQUARES = 32  # playable squares
+
+# piece codes used internally, index into PIECES
+EMPTY, RED_PAWN, RED_KING, BLACK_PAWN, BLACK_KING = range(5)
+PIECES = ".rRbB"
+# byte value of a packed symbol -> piece code, 255 for bad symbols
+_codes = np.full(256, 255, dtype=np.uint8)
+for (_code, _symbol) in enumerate(PIECES):
+    _codes[ord(_symbol)] = _code
+
+# row of each square
+ROWS = np.arange(SQUARES) // 4
+# home rows, red starts at the bottom (row 7), black at the top (row 0)
+RED_HOME = ROWS == 7
+BLACK_HOME = ROWS == 0
+# edge squares counted by AI.Edge_Piece_Count:  (1,0) (3,0) (5,0) on the
+# left, (2,7) (4,7) (6,7) on the right
+EDGE = np.zeros(SQUARES, dtype=bool)
+EDGE[[4, 12, 20, 11, 19, 27]] = True
+
+
+def encode(boards):
+    """encode - Convert boards to an N x 32 array of piece codes
+    boards - sequence of CheckerBoard instances or pack() strings
+    """
+    packed = [b if isinstance(b, str) else b.pack() for b in boards]
+    data = np.frombuffer("".join(packed).encode("ascii"), dtype=np.uint8)
+    if data.size != SQUARES * len(packed):
+        raise ValueError("Packed boards must have %d squares" % SQUARES)
+    codes = _codes[data].reshape(len(packed), SQUARES)
+    if np.any(codes == 255):
+        raise ValueError("Unknown piece type")
+    return codes
+
+
+def player_indices(players, n):
+    """player_indices - Convert players to an array of player indices
+    players - a single player name for all positions, or a sequence
+    """
+    if isinstance(players, str):
+        return np.full(n, checkerboard.CheckerBoard.playeridx(players),
+                       dtype=np.int8)
+    return np.array([checkerboard.CheckerBoard.playeridx(p) for p in players],
+                    dtype=np.int8)
+
+
+def planes(codes, players, out=None):
+    """planes - Piece planes of an N x 32 code array
+    players - array of player indices to move (0 red, 1 black)
+    out - optional N x 5 x 32 uint8 array to fill
+    """
+    if out is None:
+        out = np.empty((len(codes), len(PLANES), SQUARES), dtype=np.uint8)
+    for (plane, code) in enumerate((RED_PAWN, RED_KING, BLACK_PAWN, BLACK_KING)):
+        np.equal(codes, code, out=out[:, plane, :])
+    out[:, 4, :] = (np.asarray(players) == 0)[:, None]
+    return out
+
+
+def _perc_diff(mine, theirs):
+    "_perc_diff - Vectorized percentage difference as in AI.Pawn_Perc_Diff"
+    total = mine + theirs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diff = np.trunc((mine - theirs) / (total / 2.0) * 100)
+    return np.where(total > 0, diff, 0.0)
+
+
+def scalar_features(codes, players, out=None):
+    """scalar_features - The AI.Features of an N x 32 code array
+    players - array of player indices (0 red, 1 black), the features are
+        computed from this player's point of view
+    out - optional N x 5 float64 array to fill
+    """
+    if out is None:
+        out = np.empty((len(codes), len(FEATURES)))
+    red = (codes == RED_PAWN) | (codes == RED_KING)
+    black = (codes == BLACK_PAWN) | (codes == BLACK_KING)
+    red_pawns = codes == RED_PAWN
+    black_pawns = codes == BLACK_PAWN
+
+    # All features are antisymmetric, compute them for red and negate
+    # them for black
+    sign = np.where(np.asarray(players) == 0, 1.0, -1.0)
+    out[:, 0] = _perc_diff(red_pawns.sum(1).astype(float),
+                           black_pawns.sum(1).astype(float))
+    out[:, 1] = _perc_diff((codes == RED_KING).sum(1).astype(float),
+                           (codes == BLACK_KING).sum(1).astype(float))
+    out[:, 2] = (red & RED_HOME).sum(1) - (black & BLACK_HOME).sum(1)
+    # red pawns are row rows from being kinged, black pawns 7 - row
+    out[:, 3] = (black_pawns * (7 - ROWS)).sum(1) - (red_pawns * ROWS).sum(1)
+    out[:, 4] = (black & EDGE).sum(1) - (red & EDGE).sum(1)
+    out *= sign[:, None]
+    out += 0.0  # no negative zeros
+    return out
+
+
+def convert(boards, players, planes_out=None, scalars_out=None):
+    """convert - Planes and scalar features for a sequence of boards
+    boards - CheckerBoard instances or pack() strings
+    players - player to move, a single name or one per board
+    Returns (planes, scalars)
+    """
+    codes = encode(boards)
+    indices = player_indices(players, len(codes))
+    return (planes(codes, indices, planes_out),
+            scalar_features(codes, indices, scalars_out))
+
+
+def chunks(positions, chunk=4096):
+    """chunks - Convert a stream of positions in chunks
+    positions - iterable of (board, player) pairs
+    Yields (planes, scalars) for up to chunk positions at a time.  The
+    stream is consumed lazily, one chunk at a time.
+    """
+    positions = iter(positions)
+    while True:
+        block = list(itertools.islice(positions, chunk))
+        if not block:
+            return
+        (boards, players) = zip(*block)
+        yield convert(boards, players)
+
+
+def extract(positions, n, planes_out=None, scalars_out=None, chunk=4096):
+    """extract - Fill preallocated arrays from a stream of n positions
+    positions - iterable of (board, player) pairs
+    planes_out, scalars_out - arrays of shape (n, 5, 32) and (n, 5),
+        e.g. memmaps from open_memmap, allocated when not given
+    Chunks are converted directly into slices of the output arrays.
+    Returns (planes, scalars)
+    """
+    if planes_out is None:
+        planes_out = np.empty((n, len(PLANES), SQUARES), dtype=np.uint8)
+    if scalars_out is None:
+        scalars_out = np.empty((n, len(FEATURES)))
+    positions = iter(positions)
+    start = 0
+    while start < n:
+        block = list(itertools.islice(positions, min(chunk, n - start)))
+        if not block:
+            raise ValueError("Expected %d positions, got %d" % (n, start))
+        end = start + len(block)
+        (boards, players) = zip(*block)
+        convert(boards, players, planes_out[start:end], scalars_out[start:end])
+        start = end
+    return (planes_out, scalars_out)
+
+
+def write_memmap(positions, n, planes_path, scalars_path, chunk=4096):
+    """write_memmap - Convert n positions into memory-mapped .npy files
+    Only one chunk of positions is held in memory at a time.
+    Returns the (planes, scalars) memmaps.
+    """
+    planes_out = np.lib.format.open_memmap(
+        planes_path, mode="w+", dtype=np.uint8,
+        shape=(n, len(PLANES), SQUARES))
+    scalars_out = np.lib.format.open_memmap(
+        scalars_path, mode="w+", dtype=np.float64,
+        shape=(n, len(FEATURES)))
+    extract(positions, n, planes_out, scalars_out, chunk)
+    planes_out.flush()
+    scalars_out.flush()
+    return (planes_out, scalars_out)
+
+
+def load(path, mode="r"):
+    "load - Open a .npy file written by write_memmap without copying it"
+    return np.load(path, mmap_mode=mode)
+
+
+def read_positions(path):
+    "read_positions - Lazily read (packed board, player) pairs from JSON lines"
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                position = json.loads(line)
+                yield (position["board"], position["player"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert positions to NumPy arrays")
+    parser.add_argument("positions", help="JSON lines positions")
+    parser.add_argument("--planes", required=True, help="output .npy file")
+    parser.add_argument("--scalars", required=True, help="output .npy file")
+    parser.add_argument("--chunk", type=int, default=4096)
+    args = parser.parse_args()
+
+    # First pass counts the positions so the files can be preallocated
+    n = sum(1 for _ in read_positions(args.positions))
+    write_memmap(read_positions(args.positions), n, args.planes,
+                 args.scalars, args.chunk)
+    print("Wrote %d positions" % n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+'''
+gamelog - Streaming reader of console game transcripts
+
+Games played on the console (see game.txt) are logged as board dumps,
+move lines and piece counts:
+
+    invoked Game(red=tonto.Strategy, black=tonto.Strategy, maxplies=10)
+    Player r turn
+       0  1  2  3  4  5  6  7
+    0     b     b     b     b
+    ...
+    Move 0 by r: from (5, 2) to (4, 1)  Result:
+    <board dump>
+    Pawn/King count: r 12 R 0 b 12 B 0  Time - move: 3 s, game 0.1 min
+    ...
+    Final board
+    <board dump>
+    Game is a draw
+
+read_games() reads such a log line by line and yields one GameRecord
+per game, replaying the moves from the first board dump.  Only the game
+being read is held in memory, so logs of any size can be processed.
+With validation every move has to be one of CheckerBoard.get_actions
+and the boards and piece counts printed after it have to match the
+replayed board.  A game which fails validation is yielded with its
+error and the moves before it (or GameLogError is raised if strict).
+
+    with open("game.txt") as f:
+        for game in gamelog.read_games(f):
+            print(gamelog.to_pdn(game))
+
+The records can be written as PDN (portable draughts notation) or as
+JSON lines positions in the format read by analysis.py and tuner.py:
+    {"id": "game.txt:1:0", "board": "...", "player": "r",
+     "move": [[5, 2], [4, 1]], "winner": null}
+
+Usage:
+    python gamelog.py game.txt -o game.pdn
+    python gamelog.py logs/*.txt --format positions --workers 8
+With several input files each one is converted in its own process to
+a file next to it (game.txt -> game.pdn or game.jsonl).
+'''
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import checkerboard
+
+# "Move 12 by r: from (5, 2) to (3, 4) capturing (4, 3)a  Result:"
+move_line = re.compile(r"Move (\d+) by ([rb]): (from .*?)\s+Result:")
+# one hop of a move: "to (3, 4)" or "to (3, 4) capturing (4, 3)a"
+hop = re.compile(r"to \((\d+), (\d+)\)(?: capturing \((\d+), (\d+)\)a)?")
+start = re.compile(r"from \((\d+), (\d+)\)")
+counts_line = re.compile(r"Pawn/King count: r (\d+) R (\d+) b (\d+) B (\d+)")
+invoked_line = re.compile(r"invoked Game\((.*)\)")
+player_line = re.compile(r"Player ([rb]) turn")
+winner_line = re.compile(r"winner is (RED|BLACK)|\b([rb]) wins|(draw)", re.IGNORECASE)
+
+# PDN results from red's (PDN White's) point of view
+pdn_results = {"r": "1-0", "b": "0-1", None: "1/2-1/2"}
+
+
+class GameLogError(ValueError):
+    "GameLogError - A log which cannot be parsed or replayed, with its line number"
+
+    def __init__(self, message, line):
+        super(GameLogError, self).__init__("line %d: %s" % (line, message))
+        self.line = line
+
+
+def parse_action(text):
+    """parse_action - CheckerBoard action of a move description as
+    written by CheckerBoard.get_action_str, e.g.
+    "from (4, 7) to (2, 5) capturing (3, 6)a" -> [(4, 7), (2, 5, (3, 6))]
+    """
+    match = start.match(text)
+    if match is None:
+        raise ValueError("Not a move: %r" % text)
+    action = [(int(match.group(1)), int(match.group(2)))]
+    for (row, col, crow, ccol) in hop.findall(text[match.end():]):
+        if crow:
+            action.append((int(row), int(col), (int(crow), int(ccol))))
+        else:
+            action.append((int(row), int(col)))
+    if len(action) < 2:
+        raise ValueError("Move without a destination: %r" % text)
+    return action
+
+
+def parse_dump(rows):
+    """parse_dump - pack() string of the 8 row lines of a board dump
+    (the lines after the column header)
+    """
+    board = checkerboard.CheckerBoard
+    squares = []
+    for (r, row) in enumerate(rows):
+        for c in range(board.coloffset[r], board.cols, board.step):
+            # row label and a space, then displaycol characters per column
+            index = 2 + board.displaycol * c + board.displaycol // 2
+            symbol = row[index] if index < len(row) else " "
+            if symbol not in board.pawns + board.kings + [board.empty_symbol]:
+                raise ValueError("Bad square %r in row %d" % (symbol, r))
+            squares.append(symbol)
+    return "".join(squares)
+
+
+class GameRecord:
+    """GameRecord - One game of a log
+    number - position of the game in the log (1 for the first)
+    line - line number where the game starts
+    tags - strings from the "invoked Game(...)" line, e.g. red, black
+    start - packed initial board, first - player making the first move
+    moves - [(player, action, packed board after the move)]
+    winner - 'r', 'b', None for a draw, "*" if the log has no result
+    error - validation error which ended the game early, or None
+    """
+
+    def __init__(self, number, line, tags=None):
+        self.number = number
+        self.line = line
+        self.tags = tags or {}
+        self.start = None
+        self.first = None
+        self.moves = []
+        self.winner = "*"
+        self.error = None
+
+    def boards(self):
+        "boards - Generator of (board, player to move, action) before each move"
+        board = checkerboard.CheckerBoard.unpack(self.start)
+        for (player, action, _) in self.moves:
+            yield board, player, action
+            board = board.move(action)
+
+
+class Reader:
+    """Reader - State of read_games while reading one log
+    lines - iterator of (line number, line)
+    """
+
+    def __init__(self, lines, validate=True, strict=False):
+        self.lines = lines
+        # a line read ahead and put back by push
+        self.pushed = None
+        self.validate = validate
+        self.strict = strict
+        self.game = None
+        self.board = None
+        self.player = None
+        self.games = 0
+
+    def next_line(self):
+        "next_line - (number, line without the newline) or None at the end"
+        if self.pushed is not None:
+            (item, self.pushed) = (self.pushed, None)
+            return item
+        item = next(self.lines, None)
+        if item is None:
+            return None
+        return item[0], item[1].rstrip("\r\n")
+
+    def push(self, item):
+        "push - Return item to be read again by next_line"
+        self.pushed = item
+
+    def read_dump(self, number):
+        "read_dump - pack() string of the board dump starting after line number"
+        header = self.next_line()
+        if header is None or not header[1].split() or header[1].split()[0] != "0":
+            raise GameLogError("expected a board dump", number + 1)
+        rows = []
+        for _ in range(checkerboard.CheckerBoard.rows):
+            item = self.next_line()
+            if item is None:
+                raise GameLogError("incomplete board dump", header[0])
+            rows.append(item[1])
+        try:
+            return parse_dump(rows)
+        except ValueError as e:
+            raise GameLogError(str(e), header[0])
+
+    def new_game(self, number, tags=None):
+        "new_game - Start a GameRecord, returns the one it ends (or None)"
+        finished = self.end_game()
+        self.games += 1
+        self.game = GameRecord(self.games, number, tags)
+        self.board = None
+        return finished
+
+    def end_game(self):
+        "end_game - The game being read, if it has any moves or a board"
+        (game, self.game) = (self.game, None)
+        if game is not None and game.start is not None:
+            return game
+        return None
+
+    def fail(self, error):
+        "fail - Stop replaying the current game because of error"
+        if self.strict:
+            raise error
+        self.game.error = str(error)
+        self.board = None
+
+    def play(self, number, player, text):
+        "play - Apply a move line of player to the replayed board"
+        game = self.game
+        try:
+            action = parse_action(text)
+        except ValueError as e:
+            raise GameLogError(str(e), number)
+        if self.validate and action not in self.board.get_actions(player):
+            raise GameLogError("illegal move for %s: %s" % (player, text), number)
+        try:
+            self.board = self.board.move(action)
+        except (ValueError, IndexError) as e:
+            raise GameLogError("cannot replay %s: %s" % (text, e), number)
+        if game.first is None:
+            game.first = player
+        packed = self.board.pack()
+        game.moves.append((player, action, packed))
+        self.player = checkerboard.CheckerBoard.other_player(player)
+        # the board printed after the move
+        item = self.next_line()
+        while item is not None and not item[1].strip():
+            item = self.next_line()
+        if item is not None:
+            self.push(item)
+            if item[1].split()[:1] == ["0"]:
+                printed = self.read_dump(number)
+                if self.validate and printed != packed:
+                    raise GameLogError("printed board differs from the replayed board", number + 1)
+
+    def check_counts(self, number, match):
+        "check_counts - Compare a Pawn/King count line with the replayed board"
+        counts = [int(n) for n in match.groups()]
+        board = self.board
+        replayed = [board.pawnsN[0], board.kingsN[0], board.pawnsN[1], board.kingsN[1]]
+        if counts != replayed:
+            raise GameLogError("piece counts %s differ from the replayed board %s" % (counts, replayed), number)
+
+    def __iter__(self):
+        "Generator of the GameRecords of the log"
+        while True:
+            item = self.next_line()
+            if item is None:
+                break
+            (number, line) = item
+            try:
+                invoked = invoked_line.search(line)
+                if invoked or "How about a nice game" in line:
+                    if invoked or self.game is None or self.game.moves:
+                        tags = None
+                        if invoked:
+                            tags = dict(re.findall(r"(\w+)=([^,]*)", invoked.group(1)))
+                        finished = self.new_game(number, tags)
+                        if finished is not None:
+                            yield finished
+                    continue
+                if self.game is None:
+                    continue
+                turn = player_line.match(line)
+                if turn:
+                    self.player = turn.group(1)
+                    packed = self.read_dump(number)
+                    if self.game.start is None:
+                        self.game.start = packed
+                        self.board = checkerboard.CheckerBoard.unpack(packed)
+                    elif self.validate and self.board is not None and packed != self.board.pack():
+                        raise GameLogError("board differs from the replayed board", number + 1)
+                    continue
+                if self.board is None:
+                    # no board yet, or the game failed validation: skip to its end
+                    if line.startswith("Final board") or winner_line.search(line):
+                        self.finish_line(line)
+                    continue
+                move = move_line.search(line)
+                if move:
+                    if move.group(2) != self.player and self.validate:
+                        raise GameLogError("%s moved out of turn" % move.group(2), number)
+                    self.play(number, move.group(2), move.group(3))
+                    continue
+                counts = counts_line.search(line)
+                if counts:
+                    if self.validate:
+                        self.check_counts(number, counts)
+                    continue
+                if line.startswith("Final board"):
+                    packed = self.read_dump(number)
+                    if self.validate and packed != self.board.pack():
+                        raise GameLogError("final board differs from the replayed board", number + 1)
+                    continue
+                self.finish_line(line)
+            except GameLogError as error:
+                self.fail(error)
+        finished = self.end_game()
+        if finished is not None:
+            yield finished
+
+    def finish_line(self, line):
+        "finish_line - Record the result of a game announced by line"
+        result = winner_line.search(line)
+        lower = line.lower()
+        if result is None or not ("game" in lower or "winner" in lower or "wins" in lower):
+            return
+        (color, player, draw) = result.groups()
+        if draw:
+            self.game.winner = None
+        elif color:
+            self.game.winner = color[0].lower()
+        else:
+            self.game.winner = player
+
+
+def read_games(lines, validate=True, strict=False):
+    """read_games - Generator of the GameRecords of a log
+    lines - iterable of lines (e.g. an open file), read lazily
+    validate - check moves against get_actions and the printed boards
+        and piece counts against the replayed board
+    strict - raise GameLogError instead of ending the game with an error
+    """
+    return iter(Reader(enumerate(lines, 1), validate, strict))
+
+
+def square(row, col):
+    "square - PDN square number (1-32) of a playable square"
+    return row * checkerboard.CheckerBoard.locations_per_row + col // checkerboard.CheckerBoard.step + 1
+
+
+def pdn_move(action):
+    """pdn_move - PDN notation of an action: "22-18" for a move,
+    "26x17x10" for captures
+    """
+    squares = [str(square(*action[0][:2]))] + [str(square(*posn[:2])) for posn in action[1:]]
+    return ("x" if len(action[1]) > 2 else "-").join(squares)
+
+
+def pdn_setup(packed, player):
+    """pdn_setup - PDN FEN tag value of a packed board with player to
+    move.  Black is at the top (squares 1-12) as in PDN, red is PDN
+    White.
+    """
+    pieces = {"W": [], "B": []}
+    for (index, symbol) in enumerate(packed):
+        if symbol == checkerboard.CheckerBoard.empty_symbol:
+            continue
+        color = "W" if symbol.lower() == checkerboard.CheckerBoard.pawns[0] else "B"
+        king = "K" if symbol in checkerboard.CheckerBoard.kings else ""
+        pieces[color].append("%s%d" % (king, index + 1))
+    to_move = "W" if player == checkerboard.CheckerBoard.pawns[0] else "B"
+    return "%s:W%s:B%s" % (to_move, ",".join(pieces["W"]), ",".join(pieces["B"]))
+
+
+def to_pdn(game, event=None):
+    "to_pdn - PDN text of a GameRecord"
+    result = pdn_results.get(game.winner, "*")
+    first = game.first or checkerboard.CheckerBoard.pawns[0]
+    tags = [("Event", event or "console game"), ("Round", str(game.number)),
+            ("White", game.tags.get("red", "?")), ("Black", game.tags.get("black", "?")),
+            ("Result", result), ("GameType", "21"), ("FEN", pdn_setup(game.start, first))]
+    lines = ['[%s "%s"]' % tag for tag in tags]
+    if game.error:
+        lines.append("{%s}" % game.error)
+    words = []
+    for (index, (_, action, _)) in enumerate(game.moves):
+        # a move number stays on the line of its move
+        if index % 2 == 0:
+            words.append("%d. %s" % (index // 2 + 1, pdn_move(action)))
+        else:
+            words.append(pdn_move(action))
+    words.append(result)
+    # lines of at most 80 characters
+    text = ""
+    for word in words:
+        if text and len(text) + 1 + len(word) > 80:
+            lines.append(text)
+            text = word
+        else:
+            text = word if not text else text + " " + word
+    lines.append(text)
+    return "\n".join(lines) + "\n"
+
+
+def positions(game, name="log"):
+    """positions - Generator of the position records of a GameRecord
+    (before each move), see the module documentation
+    """
+    for (index, (board, player, action)) in enumerate(game.boards()):
+        yield {"id": "%s:%d:%d" % (name, game.number, index), "board": board.pack(),
+               "player": player, "move": action, "winner": None if game.winner == "*" else game.winner}
+
+
+def convert(lines, out, fmt="pdn", name="log", validate=True):
+    """convert - Write the games of a log to out as PDN or positions
+    Returns a summary {"games", "moves", "errors"}.
+    """
+    summary = {"games": 0, "moves": 0, "errors": 0}
+    for game in read_games(lines, validate):
+        summary["games"] += 1
+        summary["moves"] += len(game.moves)
+        summary["errors"] += game.error is not None
+        if fmt == "pdn":
+            out.write(to_pdn(game, name) + "\n")
+        else:
+            for record in positions(game, name):
+                out.write(json.dumps(record) + "\n")
+    return summary
+
+
+def output_path(path, fmt):
+    "output_path - File a log is converted to: same name, .pdn or .jsonl"
+    return os.path.splitext(path)[0] + (".pdn" if fmt == "pdn" else ".jsonl")
+
+
+def convert_file(path, output, fmt="pdn", validate=True):
+    "convert_file - Convert one log file, returns its summary with the paths"
+    with open(path) as f, open(output, "w") as out:
+        summary = convert(f, out, fmt, os.path.basename(path), validate)
+    summary.update({"input": path, "output": output})
+    return summary
+
+
+def convert_files(paths, fmt="pdn", workers=None, validate=True):
+    """convert_files - Convert log files in parallel, each to its
+    output_path.  Yields the summaries in the order of paths.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(convert_file, path, output_path(path, fmt), fmt, validate)
+                   for path in paths]
+        for future in futures:
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert console game logs")
+    parser.add_argument("logs", nargs="+", help="log files, - for stdin")
+    parser.add_argument("--format", choices=("pdn", "positions"), default="pdn")
+    parser.add_argument("-o", "--output", help="output file for a single log (default stdout)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-validate", dest="validate", action="store_false",
+                        help="replay the moves without checking them")
+    args = parser.parse_args()
+
+    if len(args.logs) == 1:
+        source = sys.stdin if args.logs[0] == "-" else open(args.logs[0])
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            summary = convert(source, out, args.format, os.path.basename(args.logs[0]), args.validate)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if out is not sys.stdout:
+                out.close()
+        summaries = [summary]
+    else:
+        if args.output:
+            parser.error("--output needs a single log, several are converted next to each input")
+        summaries = []
+        for summary in convert_files(args.logs, args.format, args.workers, args.validate):
+            print("%(input)s -> %(output)s: %(games)d games, %(moves)d moves, %(errors)d errors" % summary,
+                  file=sys.stderr)
+            summaries.append(summary)
+    print("%d games, %d moves, %d errors" % tuple(sum(s[k] for s in summaries)
+                                                  for k in ("games", "moves", "errors")), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
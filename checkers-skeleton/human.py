@@ -1,72 +1,94 @@
-'''
-Created on Mar 1, 2015
-
-@author: mroch
-'''
-
-import platform   # operating system platform
-
-import checkerboard
-import charIO  # character IO
-
-import abstractstrategy
-
-class Strategy(abstractstrategy.Strategy):
-    "Human player"
-
-    def play(self, board, hints=True):
-        """"play - make a move
-        Given a board, find a move and return a tuple of the new board
-        and the action that created it.  If no moves are possible or the
-        player forfeits, return the original board and the empty move []\
-        
-        Hints provides the user with a list of possible moves to choose
-        from and is currently the only way to use this function.
-        If you have problems with the unbuffered read charIO.getch(),
-        use charIO.getchBuffered() which reads input in a buffered
-        manner (you must press carriage return).  The charIO module has
-        only been tested on CentOS 6.6 linux and Windows.  It will work
-        with PyCharm but you will may need to set the debug/run configuration
-        to emulate a terminal in console output.
-        """
-        actions = board.get_actions(self.maxplayer)
-        
-        forfeit = "F"  # Human choice for forfeiting
-        
-        if actions:
-            if hints:
-                # Show actions labeled a, b, c, etc.
-                letter_a = ord('a')  # get encoding for "a"
-                letters = [chr(letter_a + x) for x in range(len(actions))]            
-                for (action, letter) in zip(actions, letters):
-                    print("%s: %s" % (letter, board.get_action_str(action)))
-
-                # Read the players choice and convert to action        
-                print("%s move, choose by letter or F to forfeit: "%(self.maxplayer), end=' ')
-                letters.append(forfeit)    
-                choice = charIO.getch()
-                print(choice)
-                while choice not in letters:
-                    choice = charIO.getch()
-                
-                # Pick action (None if weak-minded human forfeited)
-                action = actions[ord(choice)-letter_a] if choice != forfeit else None
-                
-            else:
-                raise NotImplementedError(" ".join([                    
-                    "Write an input routine/GUI if you have too much",
-                    "time on your hands.  Be sure to verify that the",
-                    "resulting action is in the list of actions"]))
-        else:
-            action = []  # No possible actions
-       
-        # Execute human move
-        if not action:
-            newboard = board
-        else:
-            newboard = board.move(action)
-        return (newboard, action)
-    
-    def utility(self, state):
-        pass  # Human uses gray matter here...
-    
+'''
+Created on Mar 1, 2015
+
+@author: mroch
+'''
+
+import platform   # operating system platform
+
+import checkerboard
+import charIO  # character IO
+
+import abstractstrategy
+
+class Strategy(abstractstrategy.Strategy):
+    "Human player"
+
+    # Hints mark the engine's hint_moves best moves, found by a
+    # hint_plies search (see ai.Minimax.MultiPV_Search), 0 for none
+    hint_moves = 3
+    hint_plies = 4
+
+    def suggestions(self, board):
+        """suggestions - The engine's best moves for the human player
+        Returns a list of (action, score), best first.
+        """
+        if not self.hint_moves or not self.hint_plies:
+            return []
+        import ai  # the search is only loaded when hints are shown
+        engine = ai.AI(self.maxplayer, checkerboard.CheckerBoard,
+                       self.hint_plies)
+        return [(action, score) for (action, score, _) in
+                engine.searching_strategy.MultiPV_Search(board, self.hint_moves)]
+
+    def play(self, board, hints=True):
+        """"play - make a move
+        Given a board, find a move and return a tuple of the new board
+        and the action that created it.  If no moves are possible or the
+        player forfeits, return the original board and the empty move []\
+        
+        Hints provides the user with a list of possible moves to choose
+        from and is currently the only way to use this function.
+        If you have problems with the unbuffered read charIO.getch(),
+        use charIO.getchBuffered() which reads input in a buffered
+        manner (you must press carriage return).  The charIO module has
+        only been tested on CentOS 6.6 linux and Windows.  It will work
+        with PyCharm but you will may need to set the debug/run configuration
+        to emulate a terminal in console output.
+        """
+        actions = board.get_actions(self.maxplayer)
+        
+        forfeit = "F"  # Human choice for forfeiting
+        
+        if actions:
+            if hints:
+                # Show actions labeled a, b, c, etc.
+                letter_a = ord('a')  # get encoding for "a"
+                letters = [chr(letter_a + x) for x in range(len(actions))]            
+                suggested = self.suggestions(board)
+                for (action, letter) in zip(actions, letters):
+                    hint = ""
+                    for (rank, (move, score)) in enumerate(suggested):
+                        if move == action:
+                            hint = "   (hint %d, score %d)" % (rank + 1, score)
+                    print("%s: %s%s" % (letter, board.get_action_str(action), hint))
+
+                # Read the players choice and convert to action        
+                print("%s move, choose by letter or F to forfeit: "%(self.maxplayer), end=' ')
+                letters.append(forfeit)    
+                choice = charIO.getch()
+                print(choice)
+                while choice not in letters:
+                    choice = charIO.getch()
+                
+                # Pick action (None if weak-minded human forfeited)
+                action = actions[ord(choice)-letter_a] if choice != forfeit else None
+                
+            else:
+                raise NotImplementedError(" ".join([                    
+                    "Write an input routine/GUI if you have too much",
+                    "time on your hands.  Be sure to verify that the",
+                    "resulting action is in the list of actions"]))
+        else:
+            action = []  # No possible actions
+       
+        # Execute human move
+        if not action:
+            newboard = board
+        else:
+            newboard = board.move(action)
+        return (newboard, action)
+    
+    def utility(self, state):
+        pass  # Human uses gray matter here...
+    
@@ -0,0 +1,378 @@
+'''
+mcts - Monte Carlo tree search strategy
+
+An alternative to the alpha-beta ai.AI player.  Instead of searching
+every move to a fixed depth, the tree grows towards the moves which
+look best: each playout selects a path with UCT (upper confidence
+bounds applied to trees), adds one new position and plays the game on
+from there, the result is counted in every position on the path.
+
+    player = mcts.Strategy('r', checkerboard.CheckerBoard, 10,
+                           playouts=2000)
+    player = mcts.Strategy('r', checkerboard.CheckerBoard, 10,
+                           time_limit=1.0, workers=4, parallelism="root")
+
+Playouts are random games, or with heuristic=True games in which the
+side to move mostly picks the move with the best AI.utility, cut off
+after playout_limit plies and scored with the utility.
+
+The tree is kept between moves: the next search starts from the
+subtree of the position the opponent's reply led to.
+
+With workers > 0 the playouts run in a process pool:
+    root - every worker grows its own tree from the current position,
+        the visit counts of the root moves are added up (no tree reuse)
+    leaf - the tree is grown in this process, a batch of one leaf per
+        worker is selected (with a virtual loss, so the leaves differ)
+        and their playouts run in the workers
+Call close() to shut the pool down.
+
+The maxplies argument of the Strategy interface is not used, the
+search is limited by playouts (a number of playouts) and/or time_limit
+(seconds, the search stops at whichever comes first).
+'''
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import abstractstrategy
+import checkerboard
+
+# evaluators used by heuristic playouts, per process: player -> ai.AI
+evaluators = {}
+
+
+def evaluator(player):
+    "evaluator - ai.AI evaluating boards for player (cached)"
+    if player not in evaluators:
+        import ai
+        evaluators[player] = ai.AI(player, checkerboard.CheckerBoard, 1)
+    return evaluators[player]
+
+
+def outcome(winner, player):
+    "outcome - Value of a finished game for player: 1 win, 0 loss, 0.5 draw"
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == player else 0.0
+
+
+def playout(board, to_move, player, rng, heuristic=False, limit=200,
+            epsilon=0.1, scale=20.0):
+    """playout - Play a game from board with to_move moving first
+    Returns its value for player (see outcome).  Random moves are
+    played unless heuristic is true, then the move with the best
+    utility for the side to move is played (a random one with
+    probability epsilon).  After limit plies a heuristic playout is
+    scored 0.5 + 0.5 * tanh(utility / scale), a random one as a draw.
+    """
+    for _ in range(limit):
+        (terminal, winner) = board.is_terminal()
+        if terminal:
+            return outcome(winner, player)
+        actions = board.get_actions(to_move)
+        if not actions:
+            # the side to move is blocked and loses
+            return 0.0 if to_move == player else 1.0
+        if heuristic and len(actions) > 1 and rng.random() >= epsilon:
+            utility = evaluator(to_move).utility
+            board = max((board.move(action) for action in actions), key=utility)
+        else:
+            board = board.move(rng.choice(actions))
+        to_move = board.other_player(to_move)
+    if heuristic:
+        return 0.5 + 0.5 * math.tanh(evaluator(player).utility(board) / scale)
+    return 0.5
+
+
+class Node:
+    """Node - Position in the search tree
+    board, player - position and player to move
+    action - move leading here from parent
+    visits - playouts through this position
+    value - sum of the playout values for the player who made action
+    """
+
+    __slots__ = ("board", "player", "action", "parent", "children",
+                 "untried", "visits", "value")
+
+    def __init__(self, board, player, action=None, parent=None):
+        self.board = board
+        self.player = player
+        self.action = action
+        self.parent = parent
+        self.children = []
+        self.untried = None  # moves without a child, generated on first visit
+        self.visits = 0
+        self.value = 0.0
+
+    def expanded(self):
+        "expanded - True if every move has a child"
+        return self.untried is not None and not self.untried
+
+    def select(self, exploration):
+        "select - Child with the best upper confidence bound"
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child:
+                   child.value / child.visits +
+                   exploration * math.sqrt(log_visits / child.visits))
+
+    def expand(self, rng):
+        "expand - Add the child of the next untried move"
+        action = self.untried.pop()
+        board = self.board.move(action)
+        child = Node(board, board.other_player(self.player), action, self)
+        self.children.append(child)
+        return child
+
+    def update(self, value):
+        "update - Count a playout whose value is for the player to move here"
+        self.visits += 1
+        # value is stored from the point of view of the player who moved here
+        self.value += 1.0 - value
+
+
+class Tree:
+    """Tree - UCT search from a root position
+    options - playout keyword arguments (see playout)
+    """
+
+    def __init__(self, root, exploration=1.4, rng=None, **options):
+        self.root = root
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.options = options
+        self.nodes = 0
+
+    def descend(self):
+        """descend - Select a path with UCT and expand its end
+        Returns the new (or terminal) node.
+        """
+        node = self.root
+        while node.expanded() and node.children:
+            node = node.select(self.exploration)
+        if node.board.is_terminal()[0]:
+            return node
+        if node.untried is None:
+            # moves are expanded in random order
+            node.untried = list(node.board.get_actions(node.player))
+            self.rng.shuffle(node.untried)
+        if node.untried:
+            node = node.expand(self.rng)
+            self.nodes += 1
+        return node
+
+    def backup(self, node, value):
+        "backup - Count value (for node.player) on the path to the root"
+        while node is not None:
+            node.update(value)
+            value = 1.0 - value
+            node = node.parent
+
+    @staticmethod
+    def virtual_loss(node):
+        """virtual_loss - Count a pending playout as lost for the player
+        who moved to each node on the path to the root (a visit without
+        value), so the next selection prefers other paths
+        """
+        while node is not None:
+            node.visits += 1
+            node = node.parent
+
+    @staticmethod
+    def revert(node):
+        "revert - Undo Tree.virtual_loss(node)"
+        while node is not None:
+            node.visits -= 1
+            node = node.parent
+
+    def simulate(self, node):
+        "simulate - Value of a playout from node for node.player"
+        return playout(node.board, node.player, node.player, self.rng,
+                       **self.options)
+
+    def run(self, playouts=None, time_limit=None):
+        "run - Grow the tree, returns the number of playouts"
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        count = 0
+        while (playouts is None or count < playouts) and \
+                (deadline is None or time.monotonic() < deadline):
+            node = self.descend()
+            self.backup(node, self.simulate(node))
+            count += 1
+        return count
+
+    def statistics(self):
+        "statistics - (action, visits, value) of the root moves"
+        return [(child.action, child.visits, child.value)
+                for child in self.root.children]
+
+
+def search_root(board, player, playouts, time_limit, seed, exploration, options):
+    """search_root - Worker process entry point for root parallelism
+    Returns (root move statistics, playouts, nodes).
+    """
+    tree = Tree(Node(board, player), exploration, random.Random(seed), **options)
+    count = tree.run(playouts, time_limit)
+    return tree.statistics(), count, tree.nodes
+
+
+def simulate_leaf(board, to_move, seed, options):
+    "simulate_leaf - Worker process entry point for leaf parallelism"
+    return playout(board, to_move, to_move, random.Random(seed), **options)
+
+
+class Strategy(abstractstrategy.Strategy):
+    """Strategy - Monte Carlo tree search player
+    playouts, time_limit - search budget per move, at least one is needed
+    exploration - UCT exploration constant
+    heuristic - utility guided playouts (see playout)
+    playout_limit - plies per playout, default 200 (random) or 20
+        (heuristic)
+    workers - processes for parallel playouts, 0 searches in this process
+    parallelism - "root" or "leaf" (see the module documentation)
+    reuse - keep the tree between moves
+    seed - random seed for reproducible searches
+    """
+
+    def __init__(self, player, game, maxplies, playouts=1000, time_limit=None,
+                 exploration=1.4, heuristic=False, playout_limit=None, workers=0,
+                 parallelism="root", reuse=True, seed=None):
+        super(Strategy, self).__init__(player, game, maxplies)
+        if playouts is None and time_limit is None:
+            raise ValueError("MCTS needs a playout or time budget")
+        if parallelism not in ("root", "leaf"):
+            raise ValueError("Unknown parallelism %r" % parallelism)
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        if playout_limit is None:
+            playout_limit = 20 if heuristic else 200
+        self.options = {"heuristic": heuristic, "limit": playout_limit}
+        self.workers = workers
+        self.parallelism = parallelism
+        self.reuse = reuse
+        self.rng = random.Random(seed)
+        self.executor = None
+        self.root = None
+        self.stats = {}
+
+    def pool(self):
+        "pool - The process pool, started on first use"
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self):
+        "close - Shut the process pool down"
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def reused_root(self, board):
+        """reused_root - Node of board from the previous search, found
+        among the replies to the move played last, or None
+        """
+        if self.root is None:
+            return None
+        packed = board.pack()
+        for child in self.root.children:
+            if child.player == self.maxplayer and child.board.pack() == packed:
+                child.parent = None
+                child.action = None
+                return child
+        return None
+
+    def play(self, board):
+        """play - Make a move, returns (newboard, action).  The board is
+        unchanged and action is None if there is no move.
+        """
+        start = time.monotonic()
+        actions = board.get_actions(self.maxplayer)
+        if not actions:
+            self.root = None
+            return board, None
+        if len(actions) == 1:
+            # forced move, e.g. a single capture
+            self.root = None
+            self.stats = {"playouts": 0, "nodes": 0, "reused": 0, "time": 0.0}
+            return board.move(actions[0]), actions[0]
+
+        if self.workers and self.parallelism == "root":
+            (statistics, playouts, nodes, reused) = self.search_root_parallel(board)
+        else:
+            root = self.reused_root(board) if self.reuse else None
+            reused = root.visits if root is not None else 0
+            if root is None:
+                root = Node(board, self.maxplayer)
+            tree = Tree(root, self.exploration, self.rng, **self.options)
+            if self.workers:
+                playouts = self.run_leaf_parallel(tree)
+            else:
+                playouts = tree.run(self.playouts, self.time_limit)
+            statistics = tree.statistics()
+            nodes = tree.nodes
+
+        # the most visited move is the most robust choice
+        (action, visits, value) = max(statistics, key=lambda s: s[1])
+        if (self.workers and self.parallelism == "root") or not self.reuse:
+            self.root = None
+        else:
+            self.root = next(child for child in root.children if child.action == action)
+        self.stats = {"playouts": playouts, "nodes": nodes, "reused": reused,
+                      "time": time.monotonic() - start,
+                      "win_rate": value / visits if visits else 0.5}
+        return board.move(action), action
+
+    def search_root_parallel(self, board):
+        "search_root_parallel - Root parallel search, merged root statistics"
+        playouts = None if self.playouts is None else -(-self.playouts // self.workers)
+        futures = [self.pool().submit(search_root, board, self.maxplayer, playouts,
+                                      self.time_limit, self.rng.getrandbits(32),
+                                      self.exploration, self.options)
+                   for _ in range(self.workers)]
+        merged = {}
+        total = nodes = 0
+        for future in futures:
+            (statistics, count, tree_nodes) = future.result()
+            total += count
+            nodes += tree_nodes
+            for (action, visits, value) in statistics:
+                key = tuple(map(tuple, action))
+                (_, seen, sum_value) = merged.get(key, (action, 0, 0.0))
+                merged[key] = (action, seen + visits, sum_value + value)
+        return list(merged.values()), total, nodes, 0
+
+    def run_leaf_parallel(self, tree):
+        """run_leaf_parallel - Grow tree with playouts in the pool, one
+        batch of a leaf per worker at a time.  Returns the playouts.
+        """
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        count = 0
+        executor = self.pool()
+        while (self.playouts is None or count < self.playouts) and \
+                (deadline is None or time.monotonic() < deadline):
+            leaves = []
+            for _ in range(self.workers):
+                node = tree.descend()
+                tree.virtual_loss(node)
+                leaves.append(node)
+            futures = [executor.submit(simulate_leaf, node.board, node.player,
+                                       self.rng.getrandbits(32), self.options)
+                       for node in leaves]
+            for (node, future) in zip(leaves, futures):
+                value = future.result()
+                # replace the virtual loss by the real result
+                tree.revert(node)
+                tree.backup(node, value)
+            count += len(leaves)
+        return count
+
+    def utility(self, board):
+        "utility - Win rate of the player estimated by playouts from board"
+        tree = Tree(Node(board, self.maxplayer), self.exploration, self.rng, **self.options)
+        tree.run(self.playouts, self.time_limit)
+        root = tree.root
+        return 1.0 - root.value / root.visits if root.visits else 0.5
@@ -0,0 +1,258 @@
+'''
+mlp - Small neural network evaluator
+
+An optional replacement for the linear five-feature utility of ai.AI:
+a fully connected network with one hidden ReLU layer over the four
+piece planes of features.planes (red pawns, red kings, black pawns,
+black kings, 32 squares each).  Its output is the logit of red winning,
+the utility for the MAX player is
+
+    round(utility_scale * logit)        (negated for black)
+
+so utilities stay integers as the search requires.
+
+    network = mlp.MLP.load("network.npz")
+    player = ai.AI('r', checkerboard.CheckerBoard, 6, network=network)
+
+Inference is plain NumPy.  Evaluating one board at a time is dominated
+by call overhead, so the search evaluates all children of a node one
+ply above the cutoff in one batch (see AI.Prefetch).
+
+The network is trained offline on the labelled positions of tuner.py
+(JSON lines {"board": packed, "winner": "r", "b" or null}), e.g. from
+self-play games:
+
+    python mlp.py selfplay --games 200 -o selfplay.jsonl
+    python mlp.py train selfplay.jsonl -o network.npz --hidden 32
+    python mlp.py bench network.npz
+
+Weights are saved as float16 in a compressed .npz file (about 9 KB
+with 32 hidden units) and computed with float32.
+'''
+
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+import checkerboard
+import features
+import tuner
+
+# number of inputs: red pawns, red kings, black pawns, black kings
+INPUTS = 4 * features.SQUARES
+
+
+def inputs(boards):
+    """inputs - N x 128 float32 input matrix of boards
+    boards - CheckerBoard instances or pack() strings
+    """
+    codes = features.encode(boards)
+    planes = features.planes(codes, np.zeros(len(codes), dtype=np.int8))
+    return planes[:, :4, :].reshape(len(codes), INPUTS).astype(np.float32)
+
+
+class MLP:
+    """MLP - INPUTS -> hidden (ReLU) -> 1 network
+    w1, b1, w2, b2 - weights and biases, float32
+    utility_scale - utility units per unit of the output logit
+    """
+
+    def __init__(self, w1, b1, w2, b2, utility_scale=100.0):
+        self.w1 = np.asarray(w1, dtype=np.float32)
+        self.b1 = np.asarray(b1, dtype=np.float32)
+        self.w2 = np.asarray(w2, dtype=np.float32)
+        self.b2 = np.asarray(b2, dtype=np.float32)
+        self.utility_scale = utility_scale
+
+    @classmethod
+    def random(cls, hidden=32, seed=0):
+        "random - Untrained network with He initialized weights"
+        rng = np.random.default_rng(seed)
+        return cls(rng.normal(0, np.sqrt(2.0 / INPUTS), (INPUTS, hidden)),
+                   np.zeros(hidden),
+                   rng.normal(0, np.sqrt(1.0 / hidden), (hidden, 1)),
+                   np.zeros(1))
+
+    @classmethod
+    def load(cls, path):
+        "load - Network saved by save"
+        with np.load(path) as data:
+            return cls(data["w1"], data["b1"], data["w2"], data["b2"],
+                       float(data["utility_scale"]))
+
+    def save(self, path):
+        "save - Write the weights as float16 to a compressed .npz file"
+        np.savez_compressed(path, w1=self.w1.astype(np.float16),
+                            b1=self.b1.astype(np.float16),
+                            w2=self.w2.astype(np.float16),
+                            b2=self.b2.astype(np.float16),
+                            utility_scale=np.float32(self.utility_scale))
+
+    def logits(self, x):
+        "logits - Output logits (red wins) of an N x INPUTS matrix"
+        hidden = np.maximum(x @ self.w1 + self.b1, 0.0)
+        return (hidden @ self.w2 + self.b2)[:, 0]
+
+    def evaluate(self, boards, player):
+        """evaluate - Integer utilities of boards for player (a list),
+        all boards are evaluated in one batch
+        """
+        logits = self.logits(inputs(boards))
+        if player != checkerboard.CheckerBoard.pawns[0]:
+            logits = -logits
+        return np.rint(logits * self.utility_scale).astype(int).tolist()
+
+    def train(self, x, y, epochs=20, batch_size=256, learning_rate=0.01, seed=0):
+        """train - Fit the network with Adam on the logistic loss
+        x - N x INPUTS inputs, y - labels (1 red wins, 0.5 draw, 0 loss)
+        Returns the loss after each epoch.
+        """
+        rng = np.random.default_rng(seed)
+        x = np.asarray(x, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32)
+        parameters = [self.w1, self.b1, self.w2, self.b2]
+        moments = [np.zeros_like(p) for p in parameters]
+        squares = [np.zeros_like(p) for p in parameters]
+        (beta1, beta2, epsilon) = (0.9, 0.999, 1e-8)
+        step = 0
+        losses = []
+        for _ in range(epochs):
+            order = rng.permutation(len(x))
+            for start in range(0, len(x), batch_size):
+                batch = order[start:start + batch_size]
+                (xb, yb) = (x[batch], y[batch])
+                pre = xb @ self.w1 + self.b1
+                hidden = np.maximum(pre, 0.0)
+                z = (hidden @ self.w2 + self.b2)[:, 0]
+                # gradient of the mean logistic loss with respect to z
+                dz = (1.0 / (1.0 + np.exp(-z)) - yb)[:, None] / len(batch)
+                dhidden = (dz @ self.w2.T) * (pre > 0)
+                gradients = [xb.T @ dhidden, dhidden.sum(0), hidden.T @ dz, dz.sum(0)]
+                step += 1
+                for (p, g, m, v) in zip(parameters, gradients, moments, squares):
+                    m *= beta1
+                    m += (1 - beta1) * g
+                    v *= beta2
+                    v += (1 - beta2) * g * g
+                    p -= learning_rate * (m / (1 - beta1 ** step)) / \
+                        (np.sqrt(v / (1 - beta2 ** step)) + epsilon)
+            losses.append(self.loss(x, y))
+        return losses
+
+    def loss(self, x, y):
+        "loss - Mean logistic loss of the predictions for labels y"
+        z = self.logits(np.asarray(x, dtype=np.float32)).astype(np.float64)
+        # log(1 + exp(-z)) and log(1 + exp(z)) computed without overflow
+        return float(np.mean(y * np.logaddexp(0, -z) + (1 - y) * np.logaddexp(0, z)))
+
+
+def selfplay(games, depth=2, random_plies=6, seed=0, max_moves=200):
+    """selfplay - Labelled positions of games between ai.AI players
+    searching depth (at least 2) plies.  The first random_plies moves
+    of each game are random so that the games differ.  Yields (packed
+    board, winner) of every position.
+    """
+    import ai
+    rng = random.Random(seed)
+    players = {player: ai.AI(player, checkerboard.CheckerBoard, depth)
+               for player in checkerboard.CheckerBoard.pawns}
+    for _ in range(games):
+        board = checkerboard.CheckerBoard()
+        player = checkerboard.CheckerBoard.pawns[0]
+        positions = []
+        winner = None
+        for ply in range(max_moves):
+            (terminal, winner) = board.is_terminal()
+            if terminal:
+                break
+            actions = board.get_actions(player)
+            if not actions:
+                winner = board.other_player(player)
+                break
+            positions.append(board.pack())
+            if ply < random_plies:
+                action = rng.choice(actions)
+            else:
+                action = players[player].searching_strategy.Search(board)
+            board = board.move(action)
+            player = board.other_player(player)
+        for packed in positions:
+            yield packed, winner
+
+
+def benchmark(network, boards, player, utility, batch_sizes=(1, 8, 64, 1024), repeat=3):
+    """benchmark - Evaluations per second of utility (one board per
+    call) and of the network, one board per call and in batches
+    Returns a list of {"evaluator", "batch", "evals_per_s"}.
+    """
+    rows = []
+
+    def measure(name, batch, run):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        rows.append({"evaluator": name, "batch": batch,
+                     "evals_per_s": round(len(boards) / best)})
+
+    measure("utility", 1, lambda: [utility(board) for board in boards])
+    for batch in batch_sizes:
+        measure("mlp", batch, lambda: [network.evaluate(boards[i:i + batch], player)
+                                       for i in range(0, len(boards), batch)])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neural network evaluator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("selfplay", help="write labelled self-play positions")
+    play.add_argument("--games", type=int, default=100)
+    play.add_argument("--depth", type=int, default=2)
+    play.add_argument("--seed", type=int, default=0)
+    play.add_argument("-o", "--output", required=True, help="JSON lines file")
+
+    train = commands.add_parser("train", help="train a network")
+    train.add_argument("dataset", help="JSON lines labelled positions (see tuner.py)")
+    train.add_argument("-o", "--output", required=True, help=".npz weight file")
+    train.add_argument("--hidden", type=int, default=32)
+    train.add_argument("--epochs", type=int, default=20)
+    train.add_argument("--learning-rate", type=float, default=0.01)
+    train.add_argument("--seed", type=int, default=0)
+
+    bench = commands.add_parser("bench", help="evaluations per second")
+    bench.add_argument("network", nargs="?", help=".npz weight file, untrained if omitted")
+    bench.add_argument("--positions", type=int, default=4096)
+
+    args = parser.parse_args()
+    if args.command == "selfplay":
+        with open(args.output, "w") as f:
+            for (packed, winner) in selfplay(args.games, args.depth, seed=args.seed):
+                f.write(json.dumps({"board": packed, "winner": winner}) + "\n")
+    elif args.command == "train":
+        with open(args.dataset) as f:
+            positions = list(tuner.read_dataset(f))
+        x = inputs([board for (board, _) in positions])
+        y = np.array([tuner.label(winner) for (_, winner) in positions])
+        network = MLP.random(args.hidden, args.seed)
+        for (epoch, loss) in enumerate(network.train(x, y, args.epochs,
+                                                     learning_rate=args.learning_rate,
+                                                     seed=args.seed)):
+            print("epoch %d: loss %.4f" % (epoch + 1, loss))
+        network.save(args.output)
+    elif args.command == "bench":
+        import ai
+        import benchmark as benchmarks
+        network = MLP.load(args.network) if args.network else MLP.random()
+        boards = [board for (board, _) in benchmarks.sample_positions(args.positions)]
+        strategy = ai.AI('r', checkerboard.CheckerBoard, 1)
+        benchmarks.print_table(benchmark(network, boards, 'r', strategy.utility),
+                               ["evaluator", "batch", "evals_per_s"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+'''
+movecache - Bounded cache of generated moves
+
+CheckerBoard.get_actions scans the whole board and follows every
+multiple jump recursively, yet a search asks for the moves of the same
+position again and again: in every iteration of iterative deepening,
+after transpositions and when the move ordering looks ahead at a
+child before it is searched.  MoveCache remembers the actions of the
+most recently used (board, player) pairs.
+
+    cache = MoveCache(limit=100000)
+    actions = cache.get_actions(board, 'r')
+
+The actions only depend on the pieces, so boards are identified by
+CheckerBoard.pack().  Cached action lists are returned as tuples which
+are shared by every caller asking for the same position, they must not
+be modified.
+'''
+
+from collections import OrderedDict
+
+
+class MoveCache:
+    """MoveCache - LRU cache of CheckerBoard.get_actions results
+    limit - maximum number of (board, player) entries, the least
+        recently used entry is evicted when the cache is full
+    hits, misses - lookup counters since the cache was created or
+        last cleared
+    """
+
+    def __init__(self, limit=100000):
+        if limit < 1:
+            raise ValueError("MoveCache limit must be positive")
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_actions(self, board, player, key=None):
+        """get_actions - Actions of player on board, see
+        CheckerBoard.get_actions
+        key - optional (board.pack(), player) if the caller already has it
+        """
+        if key is None:
+            key = (board.pack(), player)
+        actions = self.entries.get(key)
+        if actions is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return actions
+        self.misses += 1
+        actions = tuple(board.get_actions(player))
+        self.entries[key] = actions
+        if len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+        return actions
+
+    def clear(self):
+        "clear - Remove all entries and reset the counters"
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        "hit_rate - Fraction of lookups answered from the cache"
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "MoveCache(%d/%d entries, %d hits, %d misses)" % (
+            len(self.entries), self.limit, self.hits, self.misses)
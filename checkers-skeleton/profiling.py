@@ -0,0 +1,305 @@
+'''
+profiling - Switchable profiling spans for the search hot path
+
+cProfile records every frame of a game.  This module only times the
+functions a search spends its time in, the spans listed in targets:
+move generation, making moves, the terminal test, the utility and each
+evaluation feature, nested inside Minimax.Search.
+
+    with profiling.profiled() as profile:
+        player.play(board)
+    print(profile.report())
+    profile.write_collapsed("search.folded")    # flamegraph.pl input
+    profile.write_json("search.json")
+
+Profiling is switched on by replacing the target methods on their
+classes with timing wrappers and off by putting the originals back, so
+a disabled profiler costs nothing at all: no wrapper and no check is
+left in the hot loops.  Only one Profile can be enabled at a time and
+the spans of one thread are expected (e.g. one AI.play at a time).
+
+Each span records its call count, cumulative (inclusive) time, self
+time and a histogram of call durations in power of two microsecond
+buckets from which percentiles are estimated.  searches holds the
+calls and time of each span per Minimax.Search.
+
+Usage:
+    python profiling.py --depth 6 --positions 10 --collapsed search.folded --json search.json
+'''
+
+import argparse
+import json
+import time
+
+import ai
+import checkerboard
+
+# (class, method) pairs timed when profiling is enabled, spans are
+# named "Class.method"
+targets = [
+    (ai.Minimax, "Search"),
+    (checkerboard.CheckerBoard, "get_actions"),
+    (checkerboard.CheckerBoard, "genmoves"),
+    (checkerboard.CheckerBoard, "move"),
+    (checkerboard.CheckerBoard, "is_terminal"),
+    (ai.AI, "utility"),
+    (ai.AI, "Features"),
+    (ai.AI, "Pawn_Perc_Diff"),
+    (ai.AI, "Home_Row_Pieces"),
+    (ai.AI, "Distance_From_Kinged"),
+    (ai.AI, "Edge_Piece_Count"),
+]
+
+# span marking one search in Profile.searches
+search_span = "Minimax.Search"
+
+# the Profile currently installed by enable
+active = None
+
+
+class Span:
+    """Span - Statistics of one profiled function
+    calls - number of calls
+    total - inclusive seconds (recursive calls are counted once)
+    buckets - histogram, buckets[i] counts calls of less than 2**i
+        microseconds (bucket 0 is less than one microsecond)
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = []
+
+    def record(self, elapsed):
+        "record - Add a call which took elapsed seconds"
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        bucket = int(elapsed * 1e6).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+
+    def percentile(self, p):
+        """percentile - Estimated p-th percentile of the call time in
+        seconds, interpolated within the histogram bucket holding it
+        """
+        if not self.calls:
+            return 0.0
+        rank = p / 100.0 * self.calls
+        seen = 0
+        for (bucket, count) in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = (1 << (bucket - 1)) if bucket else 0
+                upper = 1 << bucket
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(estimate / 1e6, self.max)
+            seen += count
+        return self.max
+
+    def summary(self):
+        "summary - Dict of the statistics, times in microseconds"
+        return {
+            "calls": self.calls,
+            "total_us": round(self.total * 1e6, 1),
+            "mean_us": round(self.total * 1e6 / self.calls, 3) if self.calls else 0.0,
+            "p50_us": round(self.percentile(50) * 1e6, 1),
+            "p90_us": round(self.percentile(90) * 1e6, 1),
+            "p99_us": round(self.percentile(99) * 1e6, 1),
+            "max_us": round(self.max * 1e6, 1),
+            "histogram": self.buckets,
+        }
+
+
+class Profile:
+    """Profile - Spans recorded while enabled
+    spans - name -> Span
+    stacks - tuple of span names (outermost first) -> self seconds,
+        the time spent in the innermost span of the stack itself
+    searches - per Minimax.Search: name -> (calls, seconds)
+    """
+
+    def __init__(self):
+        self.spans = {}
+        self.stacks = {}
+        self.searches = []
+        # frames of the running spans: [name, start, seconds in children]
+        self.frames = []
+        self.originals = []
+
+    def wrap(self, name, function):
+        "wrap - Timing wrapper of function recording span name"
+        span = self.spans.setdefault(name, Span(name))
+        frames = self.frames
+        stacks = self.stacks
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            frame = [name, clock(), 0.0]
+            frames.append(frame)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - frame[1]
+                path = tuple(f[0] for f in frames)
+                frames.pop()
+                stacks[path] = stacks.get(path, 0.0) + elapsed - frame[2]
+                if frames:
+                    frames[-1][2] += elapsed
+                # recursive calls are already included in the outer call
+                if name not in path[:-1]:
+                    span.record(elapsed)
+
+        timed.__name__ = function.__name__
+        timed.__doc__ = function.__doc__
+        timed.__wrapped__ = function
+        return timed
+
+    def wrap_search(self, function):
+        "wrap_search - Wrapper of Minimax.Search adding to searches"
+        timed = self.wrap(search_span, function)
+
+        def search(*args, **kwargs):
+            before = {name: (span.calls, span.total) for (name, span) in self.spans.items()}
+            try:
+                return timed(*args, **kwargs)
+            finally:
+                self.searches.append({
+                    name: (span.calls - before[name][0], span.total - before[name][1])
+                    for (name, span) in self.spans.items()})
+
+        search.__name__ = function.__name__
+        search.__doc__ = function.__doc__
+        search.__wrapped__ = function
+        return search
+
+    def self_times(self):
+        "self_times - name -> seconds spent in the span itself"
+        times = dict.fromkeys(self.spans, 0.0)
+        for (path, seconds) in self.stacks.items():
+            times[path[-1]] += seconds
+        return times
+
+    def to_dict(self):
+        "to_dict - Summary of all spans and searches, JSON serializable"
+        self_times = self.self_times()
+        spans = {}
+        for (name, span) in self.spans.items():
+            if span.calls:
+                spans[name] = span.summary()
+                spans[name]["self_us"] = round(self_times[name] * 1e6, 1)
+        searches = [{name: {"calls": calls, "total_us": round(seconds * 1e6, 1)}
+                     for (name, (calls, seconds)) in search.items() if calls}
+                    for search in self.searches]
+        return {"spans": spans, "searches": searches}
+
+    def write_json(self, path):
+        "write_json - Save to_dict() to a JSON file"
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def collapsed(self):
+        """collapsed - Lines of the collapsed stack format read by
+        flamegraph.pl and speedscope: "outer;inner microseconds"
+        """
+        return ["%s %d" % (";".join(path), round(seconds * 1e6))
+                for (path, seconds) in sorted(self.stacks.items()) if seconds >= 0.5e-6]
+
+    def write_collapsed(self, path):
+        "write_collapsed - Save collapsed() to a file"
+        with open(path, "w") as f:
+            for line in self.collapsed():
+                f.write(line + "\n")
+
+    def report(self):
+        "report - Table of the spans, slowest total first"
+        self_times = self.self_times()
+        columns = ("span", "calls", "total ms", "self ms", "mean us", "p50 us", "p90 us", "p99 us", "max us")
+        lines = ["%-26s %9s %9s %9s %8s %8s %8s %8s %9s" % columns]
+        for span in sorted(self.spans.values(), key=lambda span: -span.total):
+            if not span.calls:
+                continue
+            lines.append("%-26s %9d %9.1f %9.1f %8.2f %8.0f %8.0f %8.0f %9.0f" % (
+                span.name, span.calls, span.total * 1e3, self_times[span.name] * 1e3,
+                span.total * 1e6 / span.calls, span.percentile(50) * 1e6, span.percentile(90) * 1e6,
+                span.percentile(99) * 1e6, span.max * 1e6))
+        return "\n".join(lines)
+
+
+def enable(profile=None):
+    """enable - Install the timing wrappers of targets and return the
+    Profile recording them (a new one unless profile is given)
+    """
+    global active
+    if active is not None:
+        raise RuntimeError("profiling is already enabled")
+    profile = Profile() if profile is None else profile
+    for (cls, method) in targets:
+        original = cls.__dict__[method]
+        name = "%s.%s" % (cls.__name__, method)
+        if name == search_span:
+            wrapper = profile.wrap_search(original)
+        else:
+            wrapper = profile.wrap(name, original)
+        profile.originals.append((cls, method, original))
+        setattr(cls, method, wrapper)
+    active = profile
+    return profile
+
+
+def disable():
+    "disable - Restore the original methods, returns the Profile"
+    global active
+    profile = active
+    if profile is not None:
+        for (cls, method, original) in reversed(profile.originals):
+            setattr(cls, method, original)
+        profile.originals = []
+    active = None
+    return profile
+
+
+class profiled:
+    """profiled - Context manager profiling its block
+        with profiled() as profile: ...
+    """
+
+    def __init__(self, profile=None):
+        self.profile = profile
+
+    def __enter__(self):
+        return enable(self.profile)
+
+    def __exit__(self, *exc):
+        disable()
+        return False
+
+
+def main():
+    import benchmark
+    import boardlibrary
+
+    parser = argparse.ArgumentParser(description="Profile searches of sample positions")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--collapsed", help="write collapsed stacks to this file")
+    parser.add_argument("--json", help="write the span statistics to this file")
+    args = parser.parse_args()
+
+    boardlibrary.init_boards()
+    positions = benchmark.sample_positions(args.positions)
+    with profiled() as profile:
+        for (board, player) in positions:
+            ai.AI(player, checkerboard.CheckerBoard, args.depth).searching_strategy.Search(board)
+    print(profile.report())
+    if args.collapsed:
+        profile.write_collapsed(args.collapsed)
+    if args.json:
+        profile.write_json(args.json)
+
+
+if __name__ == "__main__":
+    main()
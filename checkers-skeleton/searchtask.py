@@ -0,0 +1,148 @@
+'''
+searchtask - Non-blocking, cancellable searches
+
+AI.play blocks until the search is over.  A service embedding the
+engine starts a SearchTask instead, which searches in a background
+thread (or in a thread pool executor) and can be waited for, awaited
+from asyncio code or cancelled:
+
+    task = player.search(board)
+    for (depth, move, score) in task.iterations():
+        print(depth, move, score)       # best move of each iteration
+    (new_board, move) = task.result()
+
+    # asyncio
+    (new_board, move) = await player.search(board)
+
+    task.cancel()   # e.g. the client disconnected
+
+Cancellation is cooperative: the search polls its CancelToken (see
+ai.Minimax.cancel_token) and stops within a few dozen nodes.  The
+result of a cancelled task is the move of the last completed iteration,
+so a cancelled search can still be played.
+
+The search uses the AI's Minimax object, an AI must not run more than
+one task at a time.  Executors have to be thread pools, the token and
+the AI are shared with the search.
+'''
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class CancelToken:
+    "CancelToken - Flag telling a search to stop, safe to set from any thread"
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        "cancel - Ask the search to stop"
+        self.event.set()
+
+    def cancelled(self):
+        "cancelled - True once cancel has been called"
+        return self.event.is_set()
+
+
+class SearchTask:
+    """SearchTask - A search running in the background
+    strategy - ai.AI player searching for its move on board
+    max_depth, budget - see Minimax.Iterative_Deepening_Search
+    on_iteration - optional function called with (depth, move, score)
+        from the search thread after each iteration
+    executor - optional thread pool, a new thread is started otherwise
+    The task starts when it is created, future is a
+    concurrent.futures.Future of the (new_board, move) result.
+    """
+
+    # marks the end of the iteration updates
+    finished = None
+
+    def __init__(self, strategy, board, max_depth=None, budget=None,
+                 on_iteration=None, executor=None):
+        self.strategy = strategy
+        self.board = board
+        self.max_depth = max_depth
+        self.budget = budget
+        self.on_iteration = on_iteration
+        self.token = CancelToken()
+        self.updates = queue.Queue()
+        if executor is None:
+            self.future = Future()
+            thread = threading.Thread(target=self.run_into_future, daemon=True)
+            thread.start()
+        else:
+            self.future = executor.submit(self.run)
+            self.future.add_done_callback(self.future_done)
+
+    def run(self):
+        "run - Search in the calling thread, returns (new_board, move)"
+        search = self.strategy.searching_strategy
+        search.cancel_token = self.token
+        try:
+            move = search.Iterative_Deepening_Search(
+                self.board, self.max_depth, budget=self.budget,
+                on_iteration=self.iteration)
+        finally:
+            search.cancel_token = None
+            self.updates.put(SearchTask.finished)
+        new_board = self.board.move(move) if move is not None else self.board
+        return new_board, move
+
+    def run_into_future(self):
+        "run_into_future - Thread entry point, run and complete future"
+        if not self.future.set_running_or_notify_cancel():
+            self.updates.put(SearchTask.finished)
+            return
+        try:
+            self.future.set_result(self.run())
+        except BaseException as e:
+            self.future.set_exception(e)
+
+    def future_done(self, future):
+        """future_done - Executor future callback, ends the iteration
+        updates of a task cancelled before run started
+        """
+        if future.cancelled():
+            self.updates.put(SearchTask.finished)
+
+    def iteration(self, depth, move, score):
+        "iteration - Publish the result of a completed iteration"
+        self.updates.put((depth, move, score))
+        if self.on_iteration is not None:
+            self.on_iteration(depth, move, score)
+
+    def iterations(self):
+        """iterations - Generator of (depth, move, score) of each
+        completed iteration, blocks until the next one is available and
+        ends with the search.  Only one consumer may iterate.
+        """
+        while True:
+            update = self.updates.get()
+            if update is SearchTask.finished:
+                return
+            yield update
+
+    def cancel(self):
+        "cancel - Stop the search, the task completes with the best move so far"
+        self.token.cancel()
+
+    def cancelled(self):
+        "cancelled - True if cancel has been called"
+        return self.token.cancelled()
+
+    def done(self):
+        "done - True once the search has finished"
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """result - (new_board, move) of the search, waits at most timeout
+        seconds (concurrent.futures.TimeoutError if it is still running)
+        """
+        return self.future.result(timeout)
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
@@ -0,0 +1,445 @@
+'''
+server - asyncio server hosting many concurrent checkers games
+
+Games are played over a TCP or Unix socket using a line-delimited JSON
+protocol.  Each request is a single JSON object terminated by a newline,
+each response is a single JSON object on one line.  Requests may carry
+an "id" which is echoed in the response so that clients can pipeline
+requests for several sessions on one connection.
+
+Requests:
+    {"op": "new", "player": "r", "maxplies": 6, "clock": 300, "increment": 2}
+        Start a game, player is the color of the client.  clock and
+        increment are in seconds, omit clock for an untimed game.
+        maxplies may not exceed the server's --max-maxplies, which
+        bounds the time a search occupies a worker.
+        If the engine has the first move it is made before replying.
+    {"op": "move", "session": 1, "action": [[5, 2], [4, 1]]}
+        Make a move (same format as CheckerBoard.get_actions) and
+        receive the engine's reply move.
+    {"op": "actions", "session": 1}    legal moves for the client
+    {"op": "state", "session": 1}      board, clocks and result
+    {"op": "close", "session": 1}      abandon a game
+    {"op": "stats"}                    throughput and latency metrics
+
+Boards are sent in CheckerBoard.pack() format.
+
+Engine searches run in a bounded process pool so that the event loop
+never blocks on a search.  Searches waiting for a worker are queued in
+the event loop, the time between a request arriving and its search
+starting in a worker is reported as queueing latency.
+
+Usage:
+    python server.py --port 8765 --workers 4
+    python server.py --unix /tmp/checkers.sock
+'''
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ai
+import checkerboard
+import clock
+from timer import percentile
+
+
+def search_move(board, player, maxplies, remaining=None, increment=0,
+                turn_start=None):
+    """search_move - Worker process entry point
+    Find the engine move for player on board.
+    remaining, increment - clock of a timed game in seconds, the search
+        deepens iteratively up to maxplies within the budget given by
+        clock.TimeManager and is aborted at its deadline
+    turn_start - time.monotonic() when the engine's clock started, the
+        time spent waiting for a worker is taken from the budget
+    Returns (action, started, finished) where started and finished are
+    time.monotonic() values.  On Linux the monotonic clock is system
+    wide, so these can be compared with times from the server process.
+    """
+    started = time.monotonic()
+    strategy = ai.AI(player, checkerboard.CheckerBoard, maxplies)
+    if remaining is None:
+        action = strategy.searching_strategy.Alpha_Beta_Search(board)
+    else:
+        budget = clock.TimeManager().allocate(
+            board, remaining, increment,
+            started if turn_start is None else turn_start)
+        action = strategy.searching_strategy.Iterative_Deepening_Search(
+            board, max_depth=maxplies, budget=budget)
+    return action, started, time.monotonic()
+
+
+def to_action(move):
+    """to_action - Convert a JSON move (lists) to the tuple form used
+    by CheckerBoard, e.g. [[5, 6], [3, 4, [4, 5]]] becomes
+    [(5, 6), (3, 4, (4, 5))]
+    """
+    return [tuple(tuple(x) if isinstance(x, list) else x for x in step)
+            for step in move]
+
+
+class ProtocolError(Exception):
+    "ProtocolError - A bad request, reported to the client"
+    pass
+
+
+def seconds(request, name, default):
+    """seconds - A time in seconds from a request: a non-negative finite
+    number, or default if absent.  Raises ProtocolError otherwise.
+    """
+    value = request.get(name, default)
+    if value is default:
+        return value
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or \
+            not math.isfinite(value) or value < 0:
+        raise ProtocolError("%s must be a non-negative number of seconds" % (name,))
+    return value
+
+
+class Session:
+    "Session - One game between a remote client and the engine"
+
+    def __init__(self, sid, player, maxplies, clock=None, increment=0):
+        self.id = sid
+        self.board = checkerboard.CheckerBoard()
+        self.player = player  # client color
+        self.engine = checkerboard.CheckerBoard.other_player(player)
+        self.maxplies = maxplies
+        # Remaining time per player in seconds, None for untimed games
+        self.clock = None if clock is None else {player: float(clock),
+                                                 self.engine: float(clock)}
+        self.increment = increment
+        self.turn = checkerboard.CheckerBoard.pawns[0]  # red moves first
+        self.turn_start = time.monotonic()
+        self.over = False
+        self.winner = None
+        self.reason = None
+        # Requests for one session are handled one at a time
+        self.lock = asyncio.Lock()
+
+    def charge(self, player, now):
+        """charge - Deduct the time player spent on this turn.
+        Returns False if the player has run out of time, in which case
+        the game is over.
+        """
+        if self.clock is not None:
+            self.clock[player] -= now - self.turn_start
+            if self.clock[player] < 0:
+                self.finish(checkerboard.CheckerBoard.other_player(player),
+                            "time")
+                return False
+            self.clock[player] += self.increment
+        return True
+
+    def apply(self, action, now):
+        "apply - Play action for the player to move and pass the turn"
+        self.board = self.board.move(action)
+        self.turn = checkerboard.CheckerBoard.other_player(self.turn)
+        self.turn_start = now
+        (terminal, winner) = self.board.is_terminal()
+        if terminal:
+            self.finish(winner, "draw" if winner is None else "capture")
+        elif not self.board.get_actions(self.turn):
+            # Player to move is blocked and loses
+            self.finish(checkerboard.CheckerBoard.other_player(self.turn),
+                        "blocked")
+
+    def finish(self, winner, reason):
+        "finish - Note the end of the game"
+        self.over = True
+        self.winner = winner
+        self.reason = reason
+
+    def state(self):
+        "state - JSON friendly summary of the game"
+        return {"session": self.id,
+                "board": self.board.pack(),
+                "turn": self.turn,
+                "clock": self.clock,
+                "over": self.over,
+                "winner": self.winner,
+                "reason": self.reason}
+
+
+class Metrics:
+    """Metrics - Throughput and latency counters for the server
+    Only the most recent window samples are kept for percentiles.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.monotonic()
+        self.searches = 0  # completed engine searches
+        self.moves = 0  # client moves accepted
+        self.queued = 0  # searches waiting for or running in a worker
+        self.queue_wait = collections.deque(maxlen=window)
+        self.search_time = collections.deque(maxlen=window)
+
+    def record(self, submitted, started, finished):
+        "record - Note a completed search"
+        self.searches += 1
+        self.queue_wait.append(started - submitted)
+        self.search_time.append(finished - started)
+
+    def report(self, sessions):
+        "report - Summary of metrics, times in seconds"
+        uptime = time.monotonic() - self.started
+
+        def summary(samples):
+            return {"p50": percentile(samples, 50),
+                    "p90": percentile(samples, 90),
+                    "p99": percentile(samples, 99),
+                    "max": max(samples) if samples else None}
+
+        return {"uptime": uptime,
+                "sessions": sessions,
+                "searches": self.searches,
+                "moves": self.moves,
+                "queued": self.queued,
+                "searches_per_s": self.searches / uptime if uptime else 0.0,
+                "queue_latency": summary(self.queue_wait),
+                "search_time": summary(self.search_time)}
+
+
+class GameServer:
+    """GameServer - Host checkers sessions for remote clients
+    workers - number of search processes (default os.cpu_count())
+    max_pending - maximum searches handed to the pool at once, further
+        searches wait in the event loop (default 2 * workers)
+    maxplies - default search depth for new sessions
+    max_maxplies - deepest search a session may ask for, an untimed
+        search is only bounded by its depth and keeps a worker busy
+    """
+
+    def __init__(self, workers=None, max_pending=None, maxplies=6, max_maxplies=10):
+        if not 2 <= maxplies <= max_maxplies:
+            raise ValueError("maxplies must be between 2 and max_maxplies")
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.pending = asyncio.Semaphore(max_pending or 2 * self.workers)
+        self.maxplies = maxplies
+        self.max_maxplies = max_maxplies
+        self.sessions = dict()
+        self.session_ids = itertools.count(1)
+        self.metrics = Metrics()
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """start - Listen on a Unix socket if path is given, otherwise on
+        host/port.  Returns the asyncio server.
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client,
+                                                          path=path)
+        else:
+            self.server = await asyncio.start_server(self.handle_client,
+                                                     host, port)
+        return self.server
+
+    async def close(self):
+        "close - Stop listening and shut down the worker pool"
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(cancel_futures=True)
+
+    async def handle_client(self, reader, writer):
+        """handle_client - Serve one connection
+        Each request is handled in its own task so that a slow search
+        in one session does not hold up the other sessions of the
+        connection.  Sessions are discarded when the connection closes.
+        """
+        owned = set()  # session ids created by this connection
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(request):
+            response = await self.dispatch(request, owned)
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # client went away
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                task = asyncio.ensure_future(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for sid in owned:
+                self.sessions.pop(sid, None)
+            writer.close()
+
+    async def dispatch(self, request, owned):
+        "dispatch - Handle a request, returning the response"
+        try:
+            if not isinstance(request, dict):
+                raise ProtocolError("Request must be a JSON object")
+            op = request.get("op")
+            if op == "new":
+                return await self.op_new(request, owned)
+            elif op == "stats":
+                return {"ok": True, "stats": self.metrics.report(len(self.sessions))}
+
+            session = self.sessions.get(request.get("session"))
+            if session is None or session.id not in owned:
+                raise ProtocolError("Unknown session")
+            async with session.lock:
+                if op == "move":
+                    return await self.op_move(session, request)
+                elif op == "actions":
+                    actions = [] if session.over else \
+                        session.board.get_actions(session.player)
+                    return {"ok": True, "actions": actions}
+                elif op == "state":
+                    return dict(ok=True, **session.state())
+                elif op == "close":
+                    owned.discard(session.id)
+                    del self.sessions[session.id]
+                    return {"ok": True}
+            raise ProtocolError("Unknown op %r" % (op,))
+        except ProtocolError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            # a bug must not leave the client without a reply
+            return {"ok": False, "error": "Internal error: %s" % (e,)}
+
+    async def op_new(self, request, owned):
+        "op_new - Create a session, the engine moves first if it plays red"
+        player = request.get("player", checkerboard.CheckerBoard.pawns[0])
+        if player not in checkerboard.CheckerBoard.pawns:
+            raise ProtocolError("Unknown player")
+        maxplies = request.get("maxplies", self.maxplies)
+        # bool is an int, and a search of one ply returns no move
+        if not isinstance(maxplies, int) or isinstance(maxplies, bool) or \
+                not 2 <= maxplies <= self.max_maxplies:
+            raise ProtocolError("maxplies must be an integer from 2 to %d" % (self.max_maxplies,))
+        session = Session(next(self.session_ids), player, maxplies,
+                          seconds(request, "clock", None),
+                          seconds(request, "increment", 0))
+        self.sessions[session.id] = session
+        owned.add(session.id)
+        response = {"ok": True}
+        if session.turn == session.engine:
+            async with session.lock:
+                response["engine_move"] = await self.engine_move(session)
+        response.update(session.state())
+        return response
+
+    async def op_move(self, session, request):
+        "op_move - Play the client's move and reply with the engine's"
+        if session.over:
+            raise ProtocolError("Game is over")
+        if session.turn != session.player:
+            raise ProtocolError("Not your turn")
+        try:
+            action = to_action(request["action"])
+        except (KeyError, TypeError):
+            raise ProtocolError("Malformed action")
+        if action not in session.board.get_actions(session.player):
+            raise ProtocolError("Illegal move")
+
+        now = time.monotonic()
+        response = {"ok": True}
+        if session.charge(session.player, now):
+            session.apply(action, now)
+            self.metrics.moves += 1
+            if not session.over:
+                response["engine_move"] = await self.engine_move(session)
+        response.update(session.state())
+        return response
+
+    async def engine_move(self, session):
+        """engine_move - Search for and play the engine's move
+        The search runs in the process pool, at most max_pending
+        searches are given to the pool at any time.
+        """
+        submitted = time.monotonic()
+        self.metrics.queued += 1
+        try:
+            async with self.pending:
+                loop = asyncio.get_running_loop()
+                remaining = None if session.clock is None \
+                    else session.clock[session.engine]
+                (action, started, finished) = await loop.run_in_executor(
+                    self.executor, search_move, session.board,
+                    session.engine, session.maxplies, remaining,
+                    session.increment, session.turn_start)
+        finally:
+            self.metrics.queued -= 1
+        self.metrics.record(submitted, started, finished)
+
+        now = time.monotonic()
+        if not session.charge(session.engine, now):
+            return None  # engine lost on time
+        if action is None:
+            # The search found no move (e.g. it ran out of time before
+            # completing an iteration), play any legal move instead.  The
+            # engine cannot be blocked here, apply ends such games.
+            actions = session.board.get_actions(session.engine)
+            if not actions:
+                session.finish(session.player, "forfeit")
+                return None
+            action = actions[0]
+        session.apply(action, now)
+        return action
+
+
+async def serve(args):
+    "serve - Run a server until interrupted"
+    gameserver = GameServer(args.workers, args.max_pending, args.maxplies,
+                            args.max_maxplies)
+    server = await gameserver.start(args.host, args.port, args.unix)
+    where = args.unix if args.unix else "%s:%d" % (args.host, args.port)
+    print("Serving checkers on %s with %d workers" % (where, gameserver.workers))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await gameserver.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkers game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on a Unix socket path instead")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="search processes (default: number of CPUs)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="searches handed to the pool at once")
+    parser.add_argument("--maxplies", type=int, default=6,
+                        help="default search depth")
+    parser.add_argument("--max-maxplies", type=int, default=10,
+                        help="deepest search a session may ask for")
+    args = parser.parse_args()
+    if not 2 <= args.maxplies <= args.max_maxplies:
+        parser.error("--maxplies must be between 2 and --max-maxplies")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+'''
+solver - Proof-number search for forced wins
+
+Minimax searches to a fixed depth and returns a heuristic score.  To
+know whether the player to move can force a win, no matter how long it
+takes, solver runs a depth-first proof-number search (df-pn, Nagai
+2002) over CheckerBoard.get_actions/move/is_terminal:
+
+    result = solver.solve(boardlibrary.boards["EndGame1"], 'r')
+    result["status"]    # "proven", "disproven" or "unknown"
+    result["line"]      # winning line when proven
+
+Every position has a proof number (how many more positions have to be
+shown won to prove it) and a disproof number.  The search always
+expands the most proving position below the root and only returns from
+a subtree when its numbers exceed thresholds given by its parent, so it
+needs memory for the table of numbers only, not for a tree.
+
+A position is proven if the attacker (the player to move at the root)
+wins: all defender pieces are captured or the defender has no move.
+Draws (CheckerBoard.drawthreshN moves without a capture or a pawn
+advance) and attacker losses disprove it.  Because of the draw rule a
+position is identified by its pieces, the player to move and the moves
+since the last capture and pawn advance.
+
+The table holds at most table_limit positions.  When it is full the
+garbage collector removes the positions with the smallest subtrees
+below them (they are the cheapest to search again) until
+gc_fraction of the table is free.
+
+Usage:
+    python solver.py EndGame1 --player r
+    python solver.py bbbbbbbbbbbb........rrrrrrrrrrrr --player r --nodes 100000
+Boards are boardlibrary names or CheckerBoard.pack() strings.
+'''
+
+import argparse
+import sys
+import time
+
+import checkerboard
+
+# proof and disproof numbers of solved positions
+INFINITY = 10 ** 9
+
+
+class Solver:
+    """Solver - df-pn search with a bounded transposition table
+    attacker - player trying to force a win
+    table_limit - maximum number of positions in the table
+    gc_fraction - fraction of the table freed by a garbage collection
+    node_limit - give up after expanding this many positions (None for
+        no limit)
+    """
+
+    def __init__(self, attacker, table_limit=1000000, gc_fraction=0.5,
+                 node_limit=None):
+        self.attacker = attacker
+        self.table_limit = table_limit
+        self.gc_fraction = gc_fraction
+        self.node_limit = node_limit
+        # key -> [proof number, disproof number, positions expanded below]
+        self.table = {}
+        self.nodes = 0
+        self.gc_runs = 0
+        self.peak_entries = 0
+
+    def key(self, board, player):
+        "key - Table key of board with player to move"
+        return (board.pack(), player, board.movecount - board.lastpawnadvance,
+                board.movecount - board.lastcapture)
+
+    def evaluate(self, board, player):
+        """evaluate - (proof number, disproof number) of a position
+        without searching it: solved numbers for finished games, 1, 1
+        for an open position
+        """
+        (terminal, winner) = board.is_terminal()
+        if terminal:
+            return (0, INFINITY) if winner == self.attacker else (INFINITY, 0)
+        return (1, 1)
+
+    def lookup(self, board, player):
+        "lookup - (key, entry) of a position, entry is None if unknown"
+        key = self.key(board, player)
+        return key, self.table.get(key)
+
+    def numbers(self, board, player):
+        "numbers - (proof number, disproof number) of a position"
+        (key, entry) = self.lookup(board, player)
+        if entry is None:
+            return self.evaluate(board, player)
+        return entry[0], entry[1]
+
+    def store(self, key, pn, dn, work):
+        "store - Save the numbers of a position, collecting garbage when full"
+        if key not in self.table and len(self.table) >= self.table_limit:
+            self.collect()
+        self.table[key] = [pn, dn, work]
+        self.peak_entries = max(self.peak_entries, len(self.table))
+
+    def collect(self):
+        """collect - Remove the positions with the least work below them
+        until gc_fraction of the table is free, solved positions are
+        kept before unsolved ones
+        """
+        self.gc_runs += 1
+        keep = int(self.table_limit * (1 - self.gc_fraction))
+        ranked = sorted(self.table.items(),
+                        key=lambda item: (item[1][0] != 0 and item[1][1] != 0, -item[1][2]))
+        self.table = dict(ranked[:keep])
+
+    def children(self, board, player):
+        "children - (action, board) after each move of player"
+        return [(action, board.move(action)) for action in board.get_actions(player)]
+
+    def mid(self, board, player, pn_threshold, dn_threshold):
+        """mid - Expand the most proving positions below board until its
+        proof number reaches pn_threshold or its disproof number
+        reaches dn_threshold.  Returns (proof number, disproof number).
+        """
+        (key, entry) = self.lookup(board, player)
+        if entry is not None:
+            (pn, dn) = entry[0], entry[1]
+        else:
+            (pn, dn) = self.evaluate(board, player)
+        if pn >= pn_threshold or dn >= dn_threshold or pn == 0 or dn == 0:
+            return pn, dn
+
+        self.nodes += 1
+        start_nodes = self.nodes
+        opponent = checkerboard.CheckerBoard.other_player(player)
+        children = [child for (_, child) in self.children(board, player)]
+        attacking = player == self.attacker
+        if not children:
+            # a player without a move loses
+            (pn, dn) = (INFINITY, 0) if attacking else (0, INFINITY)
+            self.store(key, pn, dn, 1)
+            return pn, dn
+        keys = [self.key(child, opponent) for child in children]
+        # numbers of children which are not in the table
+        leaves = [self.evaluate(child, opponent) for child in children]
+        table = self.table
+
+        while True:
+            numbers = []
+            for (child_key, leaf) in zip(keys, leaves):
+                child_entry = table.get(child_key)
+                numbers.append(leaf if child_entry is None else (child_entry[0], child_entry[1]))
+            if attacking:
+                # OR position: one winning move proves it
+                pn = min(p for (p, _) in numbers)
+                dn = min(INFINITY, sum(d for (_, d) in numbers))
+            else:
+                # AND position: every defence has to be refuted
+                pn = min(INFINITY, sum(p for (p, _) in numbers))
+                dn = min(d for (_, d) in numbers)
+            if pn >= pn_threshold or dn >= dn_threshold or \
+                    (self.node_limit is not None and self.nodes >= self.node_limit):
+                break
+            # most proving child, and the second best number which limits its threshold
+            index = min(range(len(children)),
+                        key=lambda i: numbers[i][0] if attacking else numbers[i][1])
+            (child_pn, child_dn) = numbers[index]
+            if attacking:
+                second = min([p for (i, (p, _)) in enumerate(numbers) if i != index] or [INFINITY])
+                child_pn_threshold = min(pn_threshold, second + 1)
+                child_dn_threshold = min(INFINITY, dn_threshold - dn + child_dn)
+            else:
+                second = min([d for (i, (_, d)) in enumerate(numbers) if i != index] or [INFINITY])
+                child_dn_threshold = min(dn_threshold, second + 1)
+                child_pn_threshold = min(INFINITY, pn_threshold - pn + child_pn)
+            self.mid(children[index], opponent, child_pn_threshold, child_dn_threshold)
+            table = self.table  # a garbage collection replaces the table
+
+        work = self.nodes - start_nodes + 1
+        if entry is not None:
+            work += entry[2]
+        self.store(key, pn, dn, work)
+        return pn, dn
+
+    def solve(self, board, player=None):
+        """solve - Search until board (attacker to move, unless player is
+        given) is proven, disproven or the node limit is reached.
+        Returns (proof number, disproof number) of board.
+        """
+        player = self.attacker if player is None else player
+        return self.mid(board, player, INFINITY, INFINITY)
+
+    def winning_line(self, board):
+        """winning_line - Moves of a proven position to the end of the
+        game: a winning attacker move and the longest resisting
+        defence (the one with the most work below it) at each turn.
+        Positions removed by the garbage collector are proven again,
+        without the node limit: the proof is known to exist and a line
+        cut short by the limit would look complete.
+        """
+        (node_limit, self.node_limit) = (self.node_limit, None)
+        try:
+            return self.follow_line(board)
+        finally:
+            self.node_limit = node_limit
+
+    def follow_line(self, board):
+        "follow_line - winning_line without the node limit"
+        line = []
+        player = self.attacker
+        while not board.is_terminal()[0]:
+            if self.numbers(board, player)[0] != 0:
+                self.mid(board, player, INFINITY, INFINITY)
+            opponent = checkerboard.CheckerBoard.other_player(player)
+            children = self.children(board, player)
+            if not children:
+                break
+            if player == self.attacker:
+                proven = [(action, child) for (action, child) in children
+                          if self.numbers(child, opponent)[0] == 0]
+                if not proven:
+                    break
+                (action, board) = proven[0]
+            else:
+                (action, board) = max(children, key=lambda c: self.work(c[1], opponent))
+            line.append(action)
+            player = opponent
+        return line
+
+    def work(self, board, player):
+        "work - Positions expanded below board, 0 if not in the table"
+        entry = self.lookup(board, player)[1]
+        return entry[2] if entry is not None else 0
+
+    def memory_bytes(self):
+        """memory_bytes - Estimated memory of the table: the dict and
+        the key and entry objects (sampled from one entry)
+        """
+        size = sys.getsizeof(self.table)
+        if self.table:
+            (key, entry) = next(iter(self.table.items()))
+            per_entry = sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key) + \
+                sys.getsizeof(entry) + sum(sys.getsizeof(v) for v in entry)
+            size += per_entry * len(self.table)
+        return size
+
+
+def solve(board, player, table_limit=1000000, node_limit=None, gc_fraction=0.5):
+    """solve - Find out whether player to move on board can force a win
+    Returns a record:
+        status - "proven" (forced win), "disproven" (no forced win) or
+            "unknown" (node_limit reached)
+        line - winning line when proven
+        nodes - positions expanded
+        entries, peak_entries - table size at the end and at most
+        memory_bytes - estimated table memory
+        gc_runs - garbage collections
+        time - seconds
+    """
+    solver = Solver(player, table_limit, gc_fraction, node_limit)
+    start = time.monotonic()
+    (pn, dn) = solver.solve(board)
+    status = "proven" if pn == 0 else "disproven" if dn == 0 else "unknown"
+    line = solver.winning_line(board) if status == "proven" else []
+    return {"status": status,
+            "line": line,
+            "nodes": solver.nodes,
+            "entries": len(solver.table),
+            "peak_entries": solver.peak_entries,
+            "memory_bytes": solver.memory_bytes(),
+            "gc_runs": solver.gc_runs,
+            "time": time.monotonic() - start}
+
+
+def main():
+    import boardlibrary
+
+    parser = argparse.ArgumentParser(description="Prove or disprove forced wins")
+    parser.add_argument("board", help="boardlibrary name or packed board")
+    parser.add_argument("--player", default="r", help="player to move (attacker)")
+    parser.add_argument("--nodes", type=int, help="node limit")
+    parser.add_argument("--table", type=int, default=1000000, help="table size limit")
+    args = parser.parse_args()
+
+    boardlibrary.init_boards()
+    if args.board in boardlibrary.boards:
+        board = boardlibrary.boards[args.board]
+    else:
+        board = checkerboard.CheckerBoard.unpack(args.board)
+    result = solve(board, args.player, args.table, args.nodes)
+    print(board)
+    print("%s for %s: %d nodes, %d table entries (peak %d, ~%d KB), %d collections, %.2f s" % (
+        result["status"], args.player, result["nodes"], result["entries"], result["peak_entries"],
+        result["memory_bytes"] // 1024, result["gc_runs"], result["time"]))
+    if result["line"]:
+        print("winning line: " + ", ".join(checkerboard.CheckerBoard.get_action_str(action)
+                                           for action in result["line"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+'''
+strategies - Registry of checkers playing strategies
+
+Strategies are registered by name and only imported when they are
+first resolved, so importing this module (or the checkers entry point)
+does not load the search, the terminal input code or compiled modules.
+
+    Red = strategies.resolve("ai")
+    player = Red('r', checkerboard.CheckerBoard, 8)
+
+Registered names:
+    ai      ai.AI, minimax with alpha-beta pruning
+    human   human.Strategy, prompts for moves
+    mcts    mcts.Strategy, Monte Carlo tree search (1000 playouts a move)
+    tonto   Professor Roch's not too smart strategy, only available as a
+            compiled module __pycache__/tonto.cpython-XY.pyc for some
+            Python releases (no source code is given)
+
+Other strategies can be registered with register() or named directly
+as "module:attribute", e.g. resolve("mymodule:Strategy").
+'''
+
+import importlib
+import os
+import sys
+
+# directory holding the strategy modules and __pycache__
+here = os.path.dirname(os.path.abspath(__file__))
+
+# name -> "module:attribute" or a function returning the strategy class
+registry = {
+    "ai": "ai:AI",
+    "human": "human:Strategy",
+    "mcts": "mcts:Strategy",
+}
+# strategies resolved so far
+resolved = {}
+
+
+def register(name, target):
+    """register - Make a strategy available by name
+    target - "module:attribute" or a function without arguments
+        returning the strategy class, called on first use
+    """
+    registry[name] = target
+    resolved.pop(name, None)
+
+
+def names():
+    "names - Registered strategy names"
+    return sorted(registry)
+
+
+def load_compiled(name, path):
+    """load_compiled - Import a module from a compiled .pyc file
+    Raises ImportError if the file is missing or was compiled by a
+    different Python release.
+    """
+    # importlib.machinery is part of the import system, importing it
+    # costs nothing, importlib.util is only needed here
+    import importlib.machinery
+    import importlib.util
+    if not os.path.exists(path):
+        raise ImportError("No compiled module %s" % path, name=name, path=path)
+    loader = importlib.machinery.SourcelessFileLoader(name, path)
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+def tonto():
+    "tonto - The Strategy class of the compiled tonto module"
+    path = os.path.join(here, "__pycache__", "tonto.cpython-%d%d.pyc" %
+                        sys.version_info[:2])
+    return load_compiled("tonto", path).Strategy
+
+
+registry["tonto"] = tonto
+
+
+def resolve(name):
+    """resolve - The strategy class for a registered name or a
+    "module:attribute" specification.  Raises KeyError for unknown
+    names and ImportError if the strategy cannot be loaded.
+    """
+    if name in resolved:
+        return resolved[name]
+    target = registry.get(name, name)
+    if callable(target):
+        strategy = target()
+    elif ":" in target:
+        (module, attribute) = target.split(":", 1)
+        strategy = getattr(importlib.import_module(module), attribute)
+    else:
+        raise KeyError("Unknown strategy %r, choose from %s" %
+                       (name, ", ".join(names())))
+    resolved[name] = strategy
+    return strategy
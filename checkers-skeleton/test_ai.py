@@ -244,6 +244,140 @@ class TestAI(unittest.TestCase):
             print(board)
             print(self.minimax_black.Alpha_Beta_Search(board))
 
+    def test_aspiration_windows(self):
+        for player in ['r', 'b']:
+            full = ai.AI(player, checkerboard.CheckerBoard, 5).searching_strategy
+            narrow = ai.AI(player, checkerboard.CheckerBoard, 5, aspiration_width=1).searching_strategy
+            researches = 0
+            for board in self.boards + [self.StrategyTest1]:
+                full.Iterative_Deepening_Search(board)
+                narrow.Iterative_Deepening_Search(board)
+                # the window only changes how much is pruned, not the result
+                self.assertEqual(narrow.score, full.score)
+                self.assertEqual(full.stats["researches_low"] + full.stats["researches_high"], 0)
+                researches += narrow.stats["researches_low"] + narrow.stats["researches_high"]
+            self.assertGreater(researches, 0)
+        for width in (0, -1):
+            with self.assertRaises(ValueError):
+                ai.AI('r', checkerboard.CheckerBoard, 5, aspiration_width=width)
+
+    def test_mtdf(self):
+        for player in ['r', 'b']:
+            alphabeta = ai.AI(player, checkerboard.CheckerBoard, 5).searching_strategy
+            mtdf = ai.AI(player, checkerboard.CheckerBoard, 5, driver="mtdf").searching_strategy
+            for board in self.boards + [self.StrategyTest1]:
+                move = mtdf.Search(board)
+                alphabeta.Search(board)
+                self.assertEqual(mtdf.score, alphabeta.score)
+                if board.get_actions(player):
+                    self.assertIn(move, board.get_actions(player))
+                    self.assertEqual(mtdf.principal_variation[0], move)
+                    self.assertGreater(mtdf.stats["passes"], 0)
+        with self.assertRaises(ValueError):
+            ai.AI('r', checkerboard.CheckerBoard, 5, driver="bogus")
+
+    def test_iterative_deepening(self):
+        search = ai.AI('r', checkerboard.CheckerBoard, 4).searching_strategy
+        move = search.Iterative_Deepening_Search(self.SingleHopsRed)
+        self.assertEqual(search.stats["depth"], 4)
+        self.assertEqual(search.max_plies, 4)
+        self.assertEqual(search.principal_variation[0], move)
+        score = search.score
+        search.Alpha_Beta_Search(self.SingleHopsRed)
+        self.assertEqual(search.score, score)
+
+    def test_selective_search(self):
+        options = [dict(move_ordering=True),
+                   dict(late_move_reductions=True),
+                   dict(futility_pruning=True),
+                   dict(move_ordering=True, late_move_reductions=True, futility_pruning=True)]
+        counters = {}
+        for (name, (board, player, best)) in sorted(boardlibrary.tactics.items()):
+            full = ai.AI(player, checkerboard.CheckerBoard, 6).searching_strategy
+            self.assertEqual(full.Search(board), best, name)
+            for option in options:
+                selective = ai.AI(player, checkerboard.CheckerBoard, 6, **option).searching_strategy
+                self.assertEqual(selective.Search(board), best, (name, option))
+                self.assertEqual(selective.score, full.score, (name, option))
+                self.assertLessEqual(selective.stats["lmr_researches"], selective.stats["lmr_reductions"])
+                for counter in ("lmr_reductions", "futility_prunes"):
+                    counters[counter] = counters.get(counter, 0) + selective.stats[counter]
+        self.assertGreater(counters["lmr_reductions"], 0)
+        self.assertGreater(counters["futility_prunes"], 0)
+
+        # switched off by default
+        search = ai.AI('r', checkerboard.CheckerBoard, 6).searching_strategy
+        search.Search(self.Pristine)
+        self.assertEqual(search.stats["lmr_reductions"] + search.stats["futility_prunes"], 0)
+        self.assertEqual(search.history, {})
+
+    def test_move_codes(self):
+        "killers, history and transposition table moves are move codes"
+        search = ai.AI('r', checkerboard.CheckerBoard, 6, transpositions=True, move_ordering=True).searching_strategy
+        move = search.Search(self.StrategyTest1)
+        self.assertIn(move, self.StrategyTest1.get_actions('r'))
+        self.assertTrue(search.history)
+        self.assertTrue(all(isinstance(code, int) for code in search.history))
+        self.assertTrue(all(isinstance(code, int) for killers in search.killer_moves.values() for code in killers))
+        entry = search.transposition_table[search.Transposition_Key(self.StrategyTest1, 'r')]
+        self.assertEqual(entry[3], checkerboard.CheckerBoard.encode_action(move))
+        # the moves are ordered by their codes as well
+        actions = self.StrategyTest1.get_actions('r')
+        killer = checkerboard.CheckerBoard.encode_action(actions[-1])
+        search.killer_moves[1] = [killer]
+        self.assertEqual(search.Order_Moves(actions, 1)[0], actions[-1])
+        self.assertEqual(search.Order_Moves(actions, 1, tt_move=killer)[0], actions[-1])
+        self.assertEqual(sorted(search.Order_Moves(actions, 1)), sorted(actions))
+
+    def test_canonical_keys(self):
+        for (board, player) in [(self.SingleHopsRed, 'r'), (self.Pristine, 'b')]:
+            results = []
+            for canonical in (False, True):
+                search = ai.AI(player, checkerboard.CheckerBoard, 5, transpositions=True,
+                               canonical_keys=canonical).searching_strategy
+                results.append((search.Iterative_Deepening_Search(board), search.score))
+            self.assertEqual(results[0], results[1])
+
+        # players of both colours share one table, the mirror image is answered from it
+        table = {}
+        red = ai.AI('r', checkerboard.CheckerBoard, 5, transpositions=table).searching_strategy
+        black = ai.AI('b', checkerboard.CheckerBoard, 5, transpositions=table).searching_strategy
+        move = red.Search(self.Pristine)
+        flipped = checkerboard.CheckerBoard.unpack(self.Pristine.flip_packed(self.Pristine.pack()))
+        self.assertEqual(black.Search(flipped), checkerboard.CheckerBoard.flip_action(move))
+        self.assertEqual(black.score, red.score)
+        self.assertEqual(black.stats["nodes"], 1)
+        self.assertEqual(black.stats["tt_hits"], 1)
+
+    def test_multipv(self):
+        for (board, player) in [(self.SingleHopsRed, 'r'), (self.Pristine, 'b')]:
+            search = ai.AI(player, checkerboard.CheckerBoard, 4).searching_strategy
+            results = search.MultiPV_Search(board, 3)
+            self.assertEqual(len(results), 3)
+            self.assertIsNone(search.transposition_table)
+
+            # exact score of each move from a full window search
+            exact = ai.AI(player, checkerboard.CheckerBoard, 4).searching_strategy
+            exact.pv_hint, exact.pv_table, exact.stats = [], {}, exact.New_Stats()
+            scores = sorted((exact.Min_Value(board.move(action), exact.neg_infinity, exact.pos_infinity, 2)[0]
+                             for action in board.get_actions(player)), reverse=True)
+            self.assertEqual([score for (_, score, _) in results], scores[:3])
+            self.assertEqual(len({tuple(map(tuple, move)) for (move, _, _) in results}), 3)
+            for (move, score, pv) in results:
+                self.assertEqual(pv[0], move)
+                child = board
+                for action in pv:
+                    child = child.move(action)
+
+            single = ai.AI(player, checkerboard.CheckerBoard, 4).searching_strategy
+            self.assertEqual(single.Alpha_Beta_Search(board), results[0][0])
+            self.assertEqual(search.score, single.score)
+
+        # fewer moves than asked for
+        search = ai.AI('r', checkerboard.CheckerBoard, 2).searching_strategy
+        self.assertEqual(len(search.MultiPV_Search(self.SingleHopsRed, 20)),
+                         len(self.SingleHopsRed.get_actions('r')))
+
     def test_distance_from_kinged(self):
         for board in self.boards:
             print(board)
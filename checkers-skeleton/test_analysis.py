@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+
+import analysis
+import boardlibrary
+
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        boardlibrary.init_boards()
+        self.names = ["Pristine", "SingleHopsRed", "multihop", "KingBlack", "EndGame1"]
+
+    def test_analyze_positions(self):
+        positions = [(boardlibrary.boards[name], "r") for name in self.names]
+        records = list(analysis.analyze_positions(positions, depth=3, workers=2, max_pending=2))
+        self.assertEqual(sorted(r["id"] for r in records), list(range(len(self.names))))
+        for record in records:
+            board = boardlibrary.boards[self.names[record["id"]]]
+            self.assertEqual(record["board"], board.pack())
+            self.assertIn(record["move"], board.get_actions("r"))
+            self.assertEqual(record["pv"][0], record["move"])
+            self.assertGreater(record["nodes"], 0)
+            json.dumps(record)
+
+    def test_failed_search(self):
+        positions = [(boardlibrary.boards["Pristine"], "r"), ("bad", "r"),
+                     (boardlibrary.boards["multihop"], "r")]
+        records = {r["id"]: r for r in analysis.analyze_positions(positions, depth=2, workers=1)}
+        self.assertEqual(sorted(records), [0, 1, 2])
+        self.assertIn("32 squares", records[1]["error"])
+        self.assertNotIn("error", records[2])
+
+    def test_read_positions(self):
+        lines = ['{"board": "a", "player": "r"}', "", '{"id": "x", "board": "b", "player": "b"}',
+                 '{"board": "c", "player": "r"}']
+        ids = [p["id"] for p in analysis.read_positions(line + "\n" for line in lines)]
+        self.assertEqual(ids, [1, "x", 4])
+
+    def test_invalid_input(self):
+        pristine = boardlibrary.boards["Pristine"].pack()
+        lines = [json.dumps({"board": pristine, "player": "r"}), "not json", "[1, 2]",
+                 json.dumps({"id": "nb", "player": "r"}), json.dumps({"board": pristine, "player": "b"})]
+        positions = analysis.read_positions(line + "\n" for line in lines)
+        records = {r["id"]: r for r in analysis.analyze_positions(positions, depth=2, workers=1)}
+        self.assertEqual(sorted(records, key=str), [1, 2, 3, 5, "nb"])
+        self.assertIn("JSON", records[2]["error"])
+        self.assertIn("object", records[3]["error"])
+        self.assertIn("board", records["nb"]["error"])
+        self.assertIsNotNone(records[5]["move"])
+
+    def test_depth(self):
+        for depth in (0, 1, True):
+            with self.assertRaises(ValueError):
+                list(analysis.analyze_positions([], depth=depth))
+
+    def test_forced_capture(self):
+        record = analysis.analyze_position(boardlibrary.boards["multihop"].pack(), "r", depth=2)
+        self.assertEqual(record["move"], [(5, 6), (3, 4, (4, 5)), (1, 6, (2, 5))])
+
+    def test_time_limit(self):
+        record = analysis.analyze_position(boardlibrary.boards["Pristine"].pack(), "b", time_limit=0.01)
+        self.assertGreaterEqual(record["depth"], 1)
+        self.assertIsNotNone(record["move"])
+
+    def test_skip_and_resume(self):
+        positions = [{"id": name, "board": boardlibrary.boards[name].pack(), "player": "b"}
+                     for name in self.names]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"id": "Pristine"}) + "\n")
+                f.write(json.dumps({"id": "KingBlack", "error": "failed"}) + "\n")
+                f.write('{"id": "multih')  # crashed mid-record
+            done = analysis.completed_ids(path)
+            self.assertEqual(done, {"Pristine"})
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(),
+                                 [json.dumps({"id": "Pristine"}),
+                                  json.dumps({"id": "KingBlack", "error": "failed"})])
+
+            records = list(analysis.analyze_positions(positions, depth=2, workers=1, skip=done))
+            self.assertEqual(sorted(r["id"] for r in records), sorted(set(self.names) - done))
+
+
+if __name__ == '__main__':
+    unittest.main()
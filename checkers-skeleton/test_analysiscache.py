@@ -0,0 +1,152 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import ai
+import analysiscache
+import checkerboard
+
+
+def write_entries(path, worker, count):
+    "Entries of one writer process in test_concurrent_writers"
+    cache = analysiscache.AnalysisCache(path)
+    for i in range(count):
+        cache.store("e", ("%d-%d" % (worker, i), 'r'), (2, -i, i, None))
+        # a shared board written by every process
+        cache.store("e", ("shared", 'r'), (worker, 0, 0, None))
+        if i % 10 == 9:
+            cache.flush()
+    cache.close()
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "analysis.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_store_lookup(self):
+        cache = analysiscache.AnalysisCache(self.path)
+        key = ("bbbbbbbbbbbb........rrrrrrrrrrrr", 'r')
+        move = checkerboard.CheckerBoard.encode_action([(5, 0), (4, 1)])
+        self.assertIsNone(cache.lookup("e", key))
+        cache.store("e", key, (3, 12, float("inf"), move))
+        # pending entries are visible before the flush
+        self.assertEqual(cache.lookup("e", key), (3, 12, float("inf"), move))
+        cache.close()
+
+        cache = analysiscache.AnalysisCache(self.path)
+        self.assertEqual(cache.lookup("e", key), (3, 12, float("inf"), move))
+        self.assertIsNone(cache.lookup("other evaluator", key))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate(), 0.5)
+        # a shallower entry does not replace a deeper one
+        cache.store("e", key, (2, 0, 0, None))
+        cache.flush()
+        self.assertEqual(cache.lookup("e", key)[0], 3)
+        cache.store("e", key, (4, 0, 0, None))
+        cache.flush()
+        self.assertEqual(cache.lookup("e", key), (4, 0, 0, None))
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_eviction(self):
+        cache = analysiscache.AnalysisCache(self.path, max_entries=20, evict_fraction=0.5)
+        for i in range(40):
+            cache.store("e", (str(i), 'r'), (1, 0, 0, None))
+            cache.flush()
+        self.assertLessEqual(len(cache), 20)
+        self.assertGreater(cache.evictions, 0)
+        # the most recently written entries are kept
+        self.assertIsNotNone(cache.lookup("e", ("39", 'r')))
+        self.assertIsNone(cache.lookup("e", ("0", 'r')))
+        cache.close()
+        with self.assertRaises(ValueError):
+            analysiscache.AnalysisCache(self.path, max_entries=0)
+
+    def test_eviction_batch(self):
+        "entries written by one flush share their time, only evict_fraction is deleted"
+        cache = analysiscache.AnalysisCache(self.path, max_entries=100, evict_fraction=0.1)
+        for i in range(150):
+            cache.store("e", (str(i), 'r'), (1, 0, 0, None))
+        cache.flush()
+        self.assertEqual(len(cache), 90)
+        self.assertEqual(cache.evictions, 60)
+        cache.clear()
+
+        for i in range(95):
+            cache.store("e", ("old%d" % i, 'r'), (1, 0, 0, None))
+        cache.flush()
+        for i in range(10):
+            cache.store("e", ("new%d" % i, 'r'), (1, 0, 0, None))
+        cache.flush()
+        self.assertEqual(len(cache), 90)
+        # the older batch is evicted first
+        self.assertTrue(all(cache.lookup("e", ("new%d" % i, 'r')) for i in range(10)))
+        cache.close()
+
+    def test_count_estimate(self):
+        cache = analysiscache.AnalysisCache(self.path, max_entries=20)
+        for i in range(15):
+            cache.store("e", (str(i), 'r'), (1, 0, 0, None))
+            cache.flush()
+        self.assertEqual(cache.count, 15)
+        # rewriting one entry overestimates until the limit forces a count
+        for depth in range(10):
+            cache.store("e", ("0", 'r'), (depth, 0, 0, None))
+            cache.flush()
+        # counted at 21 on the sixth flush, then four more
+        self.assertEqual(cache.count, 15 + 4)
+        self.assertEqual(len(cache), 15)
+        self.assertEqual(cache.evictions, 0)
+        cache.close()
+        self.assertEqual(analysiscache.AnalysisCache(self.path).count, 15)
+
+    def test_concurrent_writers(self):
+        analysiscache.AnalysisCache(self.path).close()
+        processes = [multiprocessing.Process(target=write_entries, args=(self.path, worker, 50))
+                     for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        cache = analysiscache.AnalysisCache(self.path)
+        self.assertEqual(len(cache), 4 * 50 + 1)
+        # the deepest entry of the shared board wins
+        self.assertEqual(cache.lookup("e", ("shared", 'r'))[0], 3)
+        cache.close()
+
+    def test_search(self):
+        board = checkerboard.CheckerBoard()
+        cache = analysiscache.AnalysisCache(self.path)
+        cold = ai.AI('r', checkerboard.CheckerBoard, 5, analysis_cache=cache)
+        move = cold.searching_strategy.Search(board)
+        self.assertGreater(len(cache), 0)
+        cold_nodes = cold.searching_strategy.stats["nodes"]
+
+        # a new player (e.g. in the next run) starts from the stored analysis
+        warm = ai.AI('r', checkerboard.CheckerBoard, 5, analysis_cache=cache)
+        self.assertEqual(warm.searching_strategy.Search(board), move)
+        self.assertEqual(warm.searching_strategy.score, cold.searching_strategy.score)
+        self.assertGreater(warm.searching_strategy.stats["analysis_hits"], 0)
+        self.assertLess(warm.searching_strategy.stats["nodes"], cold_nodes)
+
+        # other weights have their own entries
+        other = ai.AI('r', checkerboard.CheckerBoard, 5, weights=(1, 1, 1, 1, 1), analysis_cache=cache)
+        other.searching_strategy.Search(board)
+        self.assertEqual(other.searching_strategy.stats["analysis_hits"], 0)
+        cache.close()
+
+        with self.assertRaises(ValueError):
+            ai.AI('r', checkerboard.CheckerBoard, 5, analysis_cache=cache, transpositions=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
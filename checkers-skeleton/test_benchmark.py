@@ -0,0 +1,52 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import benchmark
+
+
+class TestLatency(unittest.TestCase):
+
+    def test_phase_positions(self):
+        positions = benchmark.phase_positions(3)
+        self.assertEqual(len(positions), 9)
+
+    def test_report(self):
+        samples = [{"phase": "opening", "depth": 4, "time": t / 1000.0, "nodes": n}
+                   for (t, n) in [(1, 10), (2, 20), (3, 30), (4, 40)]]
+        samples.append({"phase": "endgame", "depth": 4, "time": 0.010, "nodes": 100})
+        rows = benchmark.latency_report(samples)
+        self.assertEqual([(row["phase"], row["moves"]) for row in rows],
+                         [("opening", 4), ("endgame", 1), ("all", 5)])
+        opening = rows[0]
+        self.assertEqual((opening["p50_ms"], opening["p90_ms"], opening["max_ms"]), (2, 4, 4))
+        self.assertEqual((opening["p50_nodes"], opening["max_nodes"]), (20, 40))
+        self.assertEqual(rows[2]["max_ms"], 10)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "latency.csv")
+            benchmark.write_csv(rows, benchmark.latency_columns, path)
+            with open(path) as f:
+                read = list(csv.DictReader(f))
+        self.assertEqual(len(read), 3)
+        self.assertEqual(read[2]["phase"], "all")
+
+    def test_measure(self):
+        positions = benchmark.phase_positions(1)
+        samples = benchmark.measure_latency(positions, [2, 3])
+        self.assertEqual(len(samples), 6)
+        self.assertTrue(all(sample["nodes"] > 0 for sample in samples))
+
+
+    def test_symmetry(self):
+        rows = [benchmark.symmetry_selfplay(1, 3, canonical, max_moves=20) for canonical in (False, True)]
+        for row in rows:
+            self.assertGreater(row["nodes"], 0)
+            self.assertGreater(row["eval_lookups"], 0)
+            self.assertLessEqual(row["tt_hits"], row["tt_probes"])
+        self.assertEqual([row["keys"] for row in rows], ["per player", "canonical"])
+
+
+if __name__ == '__main__':
+    unittest.main()
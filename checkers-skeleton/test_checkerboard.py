@@ -1,7 +1,12 @@
+import copy
+import pickle
+import random
 import unittest
 from unittest import TestCase
 
+import boardlibrary
 import checkerboard
+from basicsearch_lib.board import Board
 
 
 class TestCheckerBoard(unittest.TestCase):
@@ -9,6 +14,137 @@ class TestCheckerBoard(unittest.TestCase):
         self.assertTrue(True == True)
         self.assertEqual(14, 14)
 
+    def test_slots(self):
+        board = checkerboard.CheckerBoard()
+        self.assertFalse(hasattr(board, "__dict__"))
+        with self.assertRaises(AttributeError):
+            board.something = 1
+        # geometry is shared by all boards
+        child = board.move(board.get_actions('r')[0])
+        self.assertIs(child.coloffset, board.coloffset)
+        self.assertEqual((child.rows, child.cols, child.drawthreshN), (8, 8, 40))
+        # only the grid and the checkers state are per board
+        slots = [name for cls in type(board).__mro__ for name in getattr(cls, "__slots__", ())]
+        self.assertEqual(sorted(slots), sorted(("board",) + checkerboard.CheckerBoard.__slots__))
+
+        grid = Board(3, 4)
+        grid.place(1, 2, 'x')
+        self.assertEqual((grid.get_rows(), grid.get_cols(), grid.get(1, 2)), (3, 4, 'x'))
+        self.assertIn(" x ", repr(grid))
+        with self.assertRaises(ValueError):
+            Board(3, 4, empty_symbol='-')
+
+    def test_move_copies_state(self):
+        boardlibrary.init_boards()
+        board = boardlibrary.boards["multihop"]
+        before = board.pack()
+        (pawns, kings) = (list(board.pawnsN), list(board.kingsN))
+        action = board.get_actions('r')[0]
+        child = board.move(action)
+        self.assertEqual(board.pack(), before)
+        self.assertEqual((board.pawnsN, board.kingsN), (pawns, kings))
+        self.assertEqual(child.movecount, board.movecount + 1)
+        self.assertNotEqual(child.pack(), before)
+
+    def test_copy_and_pickle(self):
+        boardlibrary.init_boards()
+        board = boardlibrary.boards["StrategyTest1"].move(
+            boardlibrary.boards["StrategyTest1"].get_actions('r')[0])
+        for other in (copy.deepcopy(board), pickle.loads(pickle.dumps(board))):
+            self.assertEqual(other.pack(), board.pack())
+            self.assertEqual((other.pawnsN, other.kingsN, other.movecount, other.lastcapture),
+                             (board.pawnsN, board.kingsN, board.movecount, board.lastcapture))
+            self.assertIsNot(other.board, board.board)
+            self.assertEqual(str(other), str(board))
+
+    def test_pieces(self):
+        "The piece sets follow place and move"
+        def scan(board):
+            return [sum(board.square_bits[(r, c)] for r in range(8) for c in range(8)
+                        if board.board[r][c] in board.players[index]) for index in (0, 1)]
+
+        rng = random.Random(5)
+        board = checkerboard.CheckerBoard()
+        self.assertEqual(board.pieces, scan(board))
+        self.assertEqual(board.locations('b')[:2], ((0, 1), (0, 3)))
+        self.assertEqual(board.pieces, [0xfff00000, 0xfff])
+        player = 'r'
+        for _ in range(150):
+            actions = board.get_actions(player)
+            if not actions or board.is_terminal()[0]:
+                break
+            parent = board.pack()
+            board = board.move(rng.choice(actions))
+            self.assertEqual(board.pieces, scan(board))
+            # the counts kept by move agree with a recount
+            counts = (list(board.pawnsN), list(board.kingsN))
+            board.recount_pieces()
+            self.assertEqual((board.pawnsN, board.kingsN), counts)
+            self.assertEqual(checkerboard.CheckerBoard.unpack(board.pack()).pieces, board.pieces)
+            self.assertEqual(checkerboard.CheckerBoard.unpack(parent).get_actions(player), actions)
+            player = board.other_player(player)
+        self.assertGreater(board.movecount, 20)
+        self.assertEqual(pickle.loads(pickle.dumps(board)).pieces, board.pieces)
+
+        board.place(board.locations('r')[0][0], board.locations('r')[0][1], 'b')
+        self.assertEqual(board.pieces, scan(board))
+        with self.assertRaises(ValueError):
+            board.place(3, 0, 'x')
+        board.clearboard()
+        self.assertEqual(board.pieces, [0, 0])
+        self.assertEqual(list(board), [])
+
+    def test_move_codes(self):
+        boardlibrary.init_boards()
+        C = checkerboard.CheckerBoard
+        action = [(5, 6), (3, 4, (4, 5)), (1, 6, (2, 5))]
+        self.assertEqual(C.encode_action(action), 23 | 7 << 5 | 0x40400 << 10)
+        self.assertEqual(C.decode_action(C.encode_action(action)), action)
+        for board in boardlibrary.boards.values():
+            for player in C.pawns:
+                actions = board.get_actions(player)
+                codes = board.action_codes(player)
+                results = {C.encode_action(a): board.move(a).pack() for a in actions}
+                self.assertEqual(set(results), codes)
+                for action in actions:
+                    code = C.encode_action(action)
+                    # decoding may give another capture path with the same result
+                    self.assertEqual(board.move(C.decode_action(code)).pack(), results[code])
+                    self.assertEqual(board.move(code).pack(), results[code])
+                    self.assertEqual(C.flip_code(code), C.encode_action(C.flip_action(action)))
+                    self.assertEqual(board.move(action, validate=codes).pack(), results[code])
+        # the king tour can be made in both directions, both have the same code
+        tours = boardlibrary.boards["RedKingTour"].get_actions('r')
+        self.assertNotEqual(tours[0], tours[1])
+        self.assertEqual(C.encode_action(tours[0]), C.encode_action(tours[1]))
+        self.assertIn(C.decode_action(C.encode_action(tours[0])), tours)
+
+        board = boardlibrary.boards["Pristine"]
+        codes = board.action_codes('r')
+        with self.assertRaises(ValueError):
+            board.move([(5, 0), (3, 2)], validate=codes)
+        with self.assertRaises(ValueError):
+            board.move([(5, 0), (9, 9)], validate=codes)
+        # a list of actions is still accepted
+        board.move([(5, 0), (4, 1)], validate=board.get_actions('r'))
+
+    def test_canonical(self):
+        boardlibrary.init_boards()
+        C = checkerboard.CheckerBoard
+        self.assertEqual(C.flip_packed("r.B" + "." * 29), "." * 29 + "R.b")
+        for (name, board) in boardlibrary.boards.items():
+            flipped = C.unpack(C.flip_packed(board.pack()))
+            self.assertEqual(C.flip_packed(flipped.pack()), board.pack())
+            # the mirror image with the other player to move is the same position
+            self.assertEqual(board.canonical('r'), flipped.canonical('b'))
+            self.assertEqual(board.canonical_hash('r'), flipped.canonical_hash('b'))
+            self.assertEqual(board.canonical('r'), (board.pack(), 'r'))
+            self.assertEqual(sorted(board.get_actions('r')),
+                             sorted(C.flip_action(action) for action in flipped.get_actions('b')))
+        pristine = boardlibrary.boards["Pristine"]
+        self.assertNotEqual(pristine.canonical_hash('r'),
+                            pristine.move(pristine.get_actions('r')[0]).canonical_hash('r'))
+
 
 if __name__ == '__main__':
     unittest.main()
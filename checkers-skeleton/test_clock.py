@@ -0,0 +1,81 @@
+import time
+import unittest
+
+import ai
+import boardlibrary
+import checkerboard
+import clock
+import server
+
+
+class TestTimeManager(unittest.TestCase):
+
+    def test_phases(self):
+        boardlibrary.init_boards()
+        manager = clock.TimeManager()
+        opening = checkerboard.CheckerBoard()
+        endgame = boardlibrary.boards["EndGame1"]
+        self.assertEqual(manager.phase(opening), "opening")
+        self.assertEqual(manager.phase(endgame), "endgame")
+        self.assertLess(manager.allocate(opening, 60).soft, manager.allocate(endgame, 60).soft)
+
+        budget = manager.allocate(opening, 60, increment=1)
+        self.assertLess(budget.soft, budget.hard)
+        self.assertLessEqual(budget.hard, 60 * manager.max_fraction + 1)
+        # almost no time left still gives a (tiny) budget
+        self.assertEqual(manager.allocate(opening, 0.001).hard, manager.minimum)
+
+    def test_instability(self):
+        budget = clock.MoveBudget(1.0, 4.0)
+        budget.update([(5, 0), (4, 1)], 10, 0.01)
+        self.assertEqual(budget.soft, 1.0)
+        # scores alternate with the parity of the depth
+        budget.update([(5, 0), (4, 1)], 2, 0.02)
+        self.assertEqual(budget.soft, 1.0)
+        budget.update([(5, 0), (4, 1)], 12, 0.02)
+        self.assertEqual(budget.soft, 1.0)
+        # best move changes
+        budget.update([(5, 2), (4, 3)], 3, 0.04)
+        self.assertEqual(budget.soft, 1.5)
+        # score drops below the one two iterations back
+        budget.update([(5, 2), (4, 3)], 5, 0.08)
+        self.assertEqual(budget.soft, 2.25)
+        self.assertFalse(budget.stop())
+        # the next iteration would end after the deadline
+        budget.update([(5, 2), (4, 3)], 5, 3.0)
+        self.assertTrue(budget.stop())
+
+    def test_deadline(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 20)
+        search = player.searching_strategy
+        budget = clock.MoveBudget(10.0, 0.2)
+        # keep deepening until the deadline aborts an iteration
+        budget.stop = lambda: False
+        start = time.monotonic()
+        move = search.Iterative_Deepening_Search(board, budget=budget)
+        elapsed = time.monotonic() - start
+        self.assertIn(move, board.get_actions('r'))
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(search.stats["timeouts"], 1)
+        self.assertGreaterEqual(search.stats["depth"], 2)
+        self.assertIsNone(search.deadline)
+        self.assertEqual(search.max_plies, 20)
+
+        # deadline before even the 2 ply search completes
+        search.deadline_check_interval = 1
+        budget = clock.MoveBudget(0.0, 0.0)
+        move = search.Iterative_Deepening_Search(board, budget=budget)
+        self.assertIn(move, board.get_actions('r'))
+        self.assertEqual(search.stats["depth"], 0)
+
+    def test_timed_search_move(self):
+        board = checkerboard.CheckerBoard()
+        start = time.monotonic()
+        (action, started, finished) = server.search_move(board, 'r', 20, remaining=2.0)
+        self.assertIn(action, board.get_actions('r'))
+        self.assertLess(finished - start, 2.0 * clock.TimeManager().max_fraction)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import multiprocessing
+import socket
+import threading
+import unittest
+
+import ai
+import boardlibrary
+import checkerboard
+import distributed
+
+
+class TestDistributed(unittest.TestCase):
+
+    def setUp(self):
+        boardlibrary.init_boards()
+        self.coordinator = distributed.Coordinator()
+        (host, port) = self.coordinator.address
+        self.processes = [multiprocessing.Process(target=distributed.run_worker, args=(host, port))
+                          for _ in range(2)]
+        for process in self.processes:
+            process.start()
+        self.assertTrue(self.coordinator.wait_for_workers(2, timeout=30))
+
+    def tearDown(self):
+        self.coordinator.close()
+        for process in self.processes:
+            process.join(30)
+
+    def local(self, board, player, depth):
+        search = ai.AI(player, checkerboard.CheckerBoard, depth).searching_strategy
+        return search.Alpha_Beta_Search(board), search.score
+
+    def test_search(self):
+        for (name, player) in [("Pristine", 'r'), ("StrategyTest1", 'b'), ("multihop", 'r')]:
+            board = boardlibrary.boards[name]
+            (move, score) = self.local(board, player, 5)
+            for split_depth in (1, 2):
+                self.assertEqual(self.coordinator.search(board, player, 5, split_depth, timeout=60),
+                                 (move, score))
+                self.assertGreater(self.coordinator.stats["nodes"], 0)
+        self.assertEqual(self.coordinator.stats["resubmitted"], 0)
+
+    def test_worker_lost(self):
+        # a worker which takes a job and disconnects without answering
+        flaky = socket.create_connection(self.coordinator.address)
+        flaky.sendall(b'{"op": "hello"}\n')
+        self.assertTrue(self.coordinator.wait_for_workers(3, timeout=30))
+        board = boardlibrary.boards["Pristine"]
+        expected = self.local(board, 'r', 4)
+        reader = flaky.makefile("r")
+
+        def drop():
+            self.assertEqual(json.loads(reader.readline())["op"], "search")
+            flaky.shutdown(socket.SHUT_RDWR)
+            reader.close()
+            flaky.close()
+
+        thread = threading.Thread(target=drop)
+        thread.start()
+        self.assertEqual(self.coordinator.search(board, 'r', 4, 2, timeout=60), expected)
+        thread.join()
+        self.assertEqual(self.coordinator.stats["resubmitted"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import ai
+import benchmark
+import boardlibrary
+import checkerboard
+import evalcache
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def test_always_replace(self):
+        cache = evalcache.EvalCache(3)
+        self.assertEqual(cache.size, 4)
+        self.assertIsNone(cache.lookup("a"))
+        cache.store("a", 10)
+        self.assertEqual(cache.lookup("a"), 10)
+        self.assertEqual(cache.lookup("a"), 10)
+        # a key with the same slot replaces the entry
+        other = next(k for k in map(str, range(1000))
+                     if hash(k) & cache.mask == hash("a") & cache.mask and k != "a")
+        cache.store(other, -5)
+        self.assertIsNone(cache.lookup("a"))
+        self.assertEqual(cache.lookup(other), -5)
+        self.assertEqual((cache.hits, cache.misses, cache.overwrites), (3, 2, 1))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.hit_rate(), 0.6)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            evalcache.EvalCache(0)
+
+    def test_utility(self):
+        boardlibrary.init_boards()
+        cached = ai.AI('r', checkerboard.CheckerBoard, 4, eval_cache=1024)
+        plain = ai.AI('r', checkerboard.CheckerBoard, 4)
+        boards = [board for (board, _) in benchmark.sample_positions(50)]
+        for board in boards + boards:
+            self.assertEqual(cached.utility(board), plain.utility(board))
+        self.assertGreaterEqual(cached.eval_cache.hits, 40)
+
+        # new weights empty the cache
+        cached.weights = (1, 1, 1, 1, 1)
+        plain.weights = (1, 1, 1, 1, 1)
+        self.assertEqual(len(cached.eval_cache), 0)
+        for board in boards:
+            self.assertEqual(cached.utility(board), plain.utility(board))
+
+    def test_search(self):
+        boardlibrary.init_boards()
+        board = boardlibrary.boards["StrategyTest1"]
+        for player in ['r', 'b']:
+            plain = ai.AI(player, checkerboard.CheckerBoard, 6)
+            cached = ai.AI(player, checkerboard.CheckerBoard, 6, eval_cache=4096)
+            self.assertEqual(cached.searching_strategy.Iterative_Deepening_Search(board),
+                             plain.searching_strategy.Iterative_Deepening_Search(board))
+            self.assertEqual(cached.searching_strategy.score, plain.searching_strategy.score)
+            self.assertGreater(cached.eval_cache.hits, 0)
+
+    def test_shared_canonical(self):
+        # red and black share one cache, mirror images share entries
+        positions = benchmark.sample_positions(50, seed=3)
+        cache = evalcache.EvalCache(4096)
+        red = ai.AI('r', checkerboard.CheckerBoard, 4, eval_cache=cache)
+        black = ai.AI('b', checkerboard.CheckerBoard, 4, eval_cache=cache)
+        plain = {player: ai.AI(player, checkerboard.CheckerBoard, 4) for player in ('r', 'b')}
+        for (board, _) in positions:
+            flipped = checkerboard.CheckerBoard.unpack(board.flip_packed(board.pack()))
+            self.assertEqual(red.utility(board), plain['r'].utility(board))
+            self.assertEqual(black.utility(board), plain['b'].utility(board))
+            self.assertEqual(black.utility(flipped), plain['b'].utility(flipped))
+        self.assertEqual(cache.misses, len({min(b.pack(), b.flip_packed(b.pack())) for (b, _) in positions}))
+
+    def test_plain_keys(self):
+        # without canonical keys every board has its own entry
+        positions = benchmark.sample_positions(50, seed=3)
+        cached = ai.AI('b', checkerboard.CheckerBoard, 4, eval_cache=4096, canonical_keys=False)
+        plain = ai.AI('b', checkerboard.CheckerBoard, 4)
+        for (board, _) in positions:
+            flipped = checkerboard.CheckerBoard.unpack(board.flip_packed(board.pack()))
+            self.assertEqual(cached.utility(board), plain.utility(board))
+            self.assertEqual(cached.utility(flipped), plain.utility(flipped))
+        boards = {b.pack() for (b, _) in positions} | {b.flip_packed(b.pack()) for (b, _) in positions}
+        self.assertEqual(cached.eval_cache.misses, len(boards))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import ai
+import benchmark
+import boardlibrary
+import checkerboard
+import features
+
+
+class TestFeatures(unittest.TestCase):
+
+    def setUp(self):
+        boardlibrary.init_boards()
+        self.positions = benchmark.sample_positions(300) + \
+            [(b, p) for b in boardlibrary.boards.values() for p in "rb"]
+
+    def test_matches_ai_features(self):
+        boards, players = zip(*self.positions)
+        planes, scalars = features.convert(boards, players)
+        self.assertEqual(planes.shape, (len(boards), 5, 32))
+        for board, player, row in zip(boards, players, scalars):
+            expected = ai.AI(player, checkerboard.CheckerBoard, 1).Features(board)
+            self.assertEqual(list(row), expected)
+
+    def test_planes(self):
+        board = boardlibrary.boards["EndGame1"]
+        planes, _ = features.convert([board.pack()], "b")
+        self.assertEqual(planes[0, 1].sum(), 2)  # two red kings
+        self.assertEqual(planes[0, 1, 2], 1)  # (0, 5)
+        self.assertEqual(planes[0, 1, 27], 1)  # (6, 7)
+        self.assertEqual(planes[0, 2, 3], 1)  # black pawn on (0, 7)
+        self.assertEqual(planes[0, [0, 3]].sum(), 0)
+        self.assertEqual(planes[0, 4].sum(), 0)  # black to move
+
+    def test_chunks_and_memmap(self):
+        positions = self.positions[:100]
+        planes, scalars = features.convert(*zip(*positions))
+        streamed = list(features.chunks(iter(positions), chunk=30))
+        self.assertEqual([len(c[0]) for c in streamed], [30, 30, 30, 10])
+        np.testing.assert_array_equal(np.concatenate([c[0] for c in streamed]), planes)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            planes_path = os.path.join(tmp, "planes.npy")
+            scalars_path = os.path.join(tmp, "scalars.npy")
+            features.write_memmap(iter(positions), len(positions), planes_path, scalars_path, chunk=7)
+            np.testing.assert_array_equal(features.load(planes_path), planes)
+            np.testing.assert_array_equal(features.load(scalars_path), scalars)
+            with self.assertRaises(ValueError):
+                features.write_memmap(iter(positions), len(positions) + 1, planes_path, scalars_path)
+
+    def test_bad_input(self):
+        with self.assertRaises(ValueError):
+            features.encode(["x" * 32])
+        with self.assertRaises(ValueError):
+            features.encode(["." * 31])
+
+
+if __name__ == '__main__':
+    unittest.main()
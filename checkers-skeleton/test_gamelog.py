@@ -0,0 +1,108 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import checkerboard
+import gamelog
+
+LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game.txt")
+
+
+def read_log():
+    with open(LOG) as f:
+        return f.read()
+
+
+class TestGameLog(unittest.TestCase):
+
+    def test_parse_action(self):
+        self.assertEqual(gamelog.parse_action("from (5, 2) to (4, 1)"), [(5, 2), (4, 1)])
+        self.assertEqual(gamelog.parse_action("from (4, 7) to (2, 5) capturing (3, 6)a to (0, 7) capturing (1, 6)a"),
+                         [(4, 7), (2, 5, (3, 6)), (0, 7, (1, 6))])
+        with self.assertRaises(ValueError):
+            gamelog.parse_action("from (4, 7)")
+        # parses what CheckerBoard writes
+        action = [(5, 6), (3, 4, (4, 5)), (1, 6, (2, 5))]
+        self.assertEqual(gamelog.parse_action(checkerboard.CheckerBoard.get_action_str(action)), action)
+
+    def test_read_game(self):
+        with open(LOG) as f:
+            games = list(gamelog.read_games(f))
+        self.assertEqual(len(games), 1)
+        game = games[0]
+        self.assertIsNone(game.error)
+        self.assertIsNone(game.winner)
+        self.assertEqual(game.tags["red"], "tonto.Strategy")
+        self.assertEqual(game.start, checkerboard.CheckerBoard().pack())
+        self.assertEqual(len(game.moves), 89)
+        self.assertEqual(game.moves[-1][2], ".....RR...R.......B....rBBB.....")
+        # the positions replay the game
+        positions = list(gamelog.positions(game, "game.txt"))
+        self.assertEqual(len(positions), 89)
+        self.assertEqual(positions[0], {"id": "game.txt:1:0", "board": game.start, "player": "r",
+                                        "move": [(5, 2), (4, 1)], "winner": None})
+        self.assertEqual(positions[1]["player"], "b")
+        json.dumps(positions[-1])
+
+    def test_several_games(self):
+        text = read_log()
+        log = text + text.replace("Game is a draw", "The winner is BLACK player")
+        games = list(gamelog.read_games(io.StringIO(log)))
+        self.assertEqual([game.number for game in games], [1, 2])
+        self.assertEqual([game.winner for game in games], [None, "b"])
+        self.assertEqual([len(game.moves) for game in games], [89, 89])
+
+    def test_invalid(self):
+        text = read_log()
+        # a plain move where a capture is forced
+        bad = text.replace("Move 3 by b: from (1, 2) to (3, 4) capturing (2, 3)a",
+                           "Move 3 by b: from (1, 2) to (2, 1)", 1)
+        self.assertNotEqual(bad, text)
+        (game,) = gamelog.read_games(io.StringIO(bad))
+        self.assertIn("line", game.error)
+        self.assertEqual(len(game.moves), 3)
+        self.assertIsNone(game.winner)
+        with self.assertRaises(gamelog.GameLogError):
+            list(gamelog.read_games(io.StringIO(bad), strict=True))
+
+        # wrong piece counts
+        bad = text.replace("Pawn/King count: r 12 R 0 b 12 B 0", "Pawn/King count: r 11 R 0 b 12 B 0", 1)
+        (game,) = gamelog.read_games(io.StringIO(bad))
+        self.assertIn("piece counts", game.error)
+        # are not checked without validation
+        (game,) = gamelog.read_games(io.StringIO(bad), validate=False)
+        self.assertIsNone(game.error)
+        self.assertEqual(len(game.moves), 89)
+
+    def test_pdn(self):
+        self.assertEqual(gamelog.pdn_move([(5, 2), (4, 1)]), "22-17")
+        self.assertEqual(gamelog.pdn_move([(4, 7), (2, 5, (3, 6)), (0, 7, (1, 6))]), "20x11x4")
+        with open(LOG) as f:
+            (game,) = gamelog.read_games(f)
+        text = gamelog.to_pdn(game)
+        self.assertIn('[Result "1/2-1/2"]', text)
+        self.assertIn('[FEN "W:W21,22,23,24,25,26,27,28,29,30,31,32:B1,2,3,4,5,6,7,8,9,10,11,12"]', text)
+        self.assertIn("1. 22-17 10-14 2. 17x10", text)
+        self.assertTrue(text.rstrip().endswith("45. 28-24 1/2-1/2"))
+        self.assertTrue(all(len(line) <= 80 for line in text.splitlines()))
+
+    def test_convert_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name in ("a.txt", "b.txt"):
+                paths.append(os.path.join(directory, name))
+                with open(paths[-1], "w") as f:
+                    f.write(read_log())
+            summaries = list(gamelog.convert_files(paths, "positions", workers=2))
+            self.assertEqual([s["moves"] for s in summaries], [89, 89])
+            self.assertEqual(summaries[1]["output"], os.path.join(directory, "b.jsonl"))
+            with open(summaries[0]["output"]) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 89)
+            self.assertEqual(records[0]["id"], "a.txt:1:0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import random
+import unittest
+
+import checkerboard
+import mcts
+
+
+def path(node):
+    "path - Nodes from node up to the root"
+    nodes = []
+    while node is not None:
+        nodes.append(node)
+        node = node.parent
+    return nodes
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_play(self):
+        board = checkerboard.CheckerBoard()
+        player = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=100, seed=1)
+        (new_board, action) = player.play(board)
+        self.assertIn(action, board.get_actions('r'))
+        self.assertEqual(new_board.pack(), board.move(action).pack())
+        self.assertEqual(player.stats["playouts"], 100)
+        self.assertEqual(player.stats["reused"], 0)
+        # the subtree of the move played is kept for the next search
+        self.assertEqual(player.root.action, action)
+        self.assertEqual(player.root.player, 'b')
+
+    def test_tree_reuse(self):
+        board = checkerboard.CheckerBoard()
+        player = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=300, seed=2)
+        (board, action) = player.play(board)
+        subtree = player.root
+        reply = max(subtree.children, key=lambda child: child.visits)
+        visits = reply.visits
+        (board, action) = player.play(reply.board)
+        self.assertGreater(visits, 0)
+        self.assertEqual(player.stats["reused"], visits)
+
+        # an unexpected position starts a new tree
+        other = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=50, reuse=False, seed=2)
+        other.play(checkerboard.CheckerBoard())
+        self.assertIsNone(other.root)
+
+    def test_win_in_one(self):
+        # red captures the last black piece
+        board = checkerboard.CheckerBoard()
+        board.clearboard()
+        board.place(4, 3, 'b')
+        board.place(5, 2, 'r')
+        board.place(7, 0, 'r')
+        board.update_counts()
+        player = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=200, seed=3)
+        (new_board, action) = player.play(board)
+        self.assertEqual(new_board.is_terminal(), (True, 'r'))
+
+    def test_heuristic_playouts(self):
+        board = checkerboard.CheckerBoard()
+        player = mcts.Strategy('b', checkerboard.CheckerBoard, 6, playouts=30, heuristic=True, seed=4)
+        (board, action) = player.play(board.move(board.get_actions('r')[0]))
+        self.assertIsNotNone(action)
+        self.assertTrue(0.0 <= player.stats["win_rate"] <= 1.0)
+
+    def test_parallel(self):
+        board = checkerboard.CheckerBoard()
+        for parallelism in ("root", "leaf"):
+            player = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=40, workers=2,
+                                   parallelism=parallelism, seed=5)
+            try:
+                (new_board, action) = player.play(board)
+            finally:
+                player.close()
+            self.assertIn(action, board.get_actions('r'))
+            self.assertEqual(player.stats["playouts"], 40)
+
+    def test_virtual_loss(self):
+        tree = mcts.Tree(mcts.Node(checkerboard.CheckerBoard(), 'r'), rng=random.Random(6))
+        tree.run(200)
+        node = tree.root
+        while node.children and len(path(node)) < 4:
+            node = max(node.children, key=lambda child: child.visits)
+        nodes = path(node)
+        self.assertEqual(len(nodes), 4)
+        before = [(n.visits, n.value) for n in nodes]
+        tree.virtual_loss(node)
+        # a visit without value, a loss for the mover at every level
+        for (n, (visits, value)) in zip(nodes, before):
+            self.assertEqual(n.visits, visits + 1)
+            self.assertEqual(n.value, value)
+            self.assertLess(n.value / n.visits, value / visits)
+        tree.revert(node)
+        self.assertEqual([(n.visits, n.value) for n in nodes], before)
+
+    def test_budget(self):
+        with self.assertRaises(ValueError):
+            mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=None)
+        player = mcts.Strategy('r', checkerboard.CheckerBoard, 6, playouts=None, time_limit=0.1)
+        player.play(checkerboard.CheckerBoard())
+        self.assertLess(player.stats["time"], 0.5)
+        self.assertGreater(player.stats["playouts"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import ai
+import benchmark
+import checkerboard
+import mlp
+
+
+class TestMLP(unittest.TestCase):
+
+    def setUp(self):
+        self.boards = [board for (board, _) in benchmark.sample_positions(40)]
+
+    def test_inputs(self):
+        x = mlp.inputs(self.boards[:1])
+        self.assertEqual(x.shape, (1, mlp.INPUTS))
+        self.assertEqual(x.sum(), 24)  # all pieces of the initial board
+
+    def test_evaluate(self):
+        network = mlp.MLP.random(16, seed=1)
+        red = network.evaluate(self.boards, 'r')
+        black = network.evaluate(self.boards, 'b')
+        self.assertEqual(red, [-u for u in black])
+        self.assertEqual([network.evaluate([board], 'r')[0] for board in self.boards], red)
+        self.assertTrue(all(isinstance(u, int) for u in red))
+
+    def test_save_and_load(self):
+        network = mlp.MLP.random(16, seed=2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.npz")
+            network.save(path)
+            loaded = mlp.MLP.load(path)
+            player = ai.AI('r', checkerboard.CheckerBoard, 2, network=path)
+        x = mlp.inputs(self.boards)
+        np.testing.assert_allclose(loaded.logits(x), network.logits(x), atol=0.02)
+        self.assertEqual(player.network.w1.shape, (mlp.INPUTS, 16))
+
+    def test_train(self):
+        positions = list(mlp.selfplay(4, depth=2, seed=3))
+        x = mlp.inputs([board for (board, _) in positions])
+        y = np.array([1.0 if winner == 'r' else 0.0 if winner == 'b' else 0.5
+                      for (_, winner) in positions])
+        network = mlp.MLP.random(16, seed=3)
+        before = network.loss(x, y)
+        losses = network.train(x, y, epochs=5, batch_size=64)
+        self.assertLess(losses[-1], before)
+
+    def test_search(self):
+        network = mlp.MLP.random(16, seed=4)
+        for (board, player) in benchmark.sample_positions(6, 0, 8, 30):
+            batched = ai.AI(player, checkerboard.CheckerBoard, 4, network=network)
+            single = ai.AI(player, checkerboard.CheckerBoard, 4, network=network)
+            with mock.patch.object(ai.AI, "batch_evaluation", False):
+                move = single.searching_strategy.Search(board)
+            self.assertEqual(batched.searching_strategy.Search(board), move)
+            self.assertEqual(batched.searching_strategy.score, single.searching_strategy.score)
+            self.assertGreater(len(batched.prefetched), 0)
+            self.assertEqual(single.prefetched, {})
+
+    def test_replace_network(self):
+        first = mlp.MLP.random(16, seed=5)
+        second = mlp.MLP.random(16, seed=6)
+        player = ai.AI('r', checkerboard.CheckerBoard, 2, network=first, eval_cache=1024)
+        player.Prefetch(self.boards)
+        for board in self.boards:
+            player.utility(board)
+        # utilities of the old network are neither cached nor prefetched
+        player.network = second
+        self.assertEqual(len(player.eval_cache), 0)
+        self.assertEqual(player.prefetched, {})
+        self.assertEqual([player.utility(board) for board in self.boards], second.evaluate(self.boards, 'r'))
+
+    def test_benchmark(self):
+        network = mlp.MLP.random(16)
+        strategy = ai.AI('r', checkerboard.CheckerBoard, 1)
+        rows = mlp.benchmark(network, self.boards, 'r', strategy.utility, batch_sizes=(1, 8), repeat=1)
+        self.assertEqual([(row["evaluator"], row["batch"]) for row in rows],
+                         [("utility", 1), ("mlp", 1), ("mlp", 8)])
+        self.assertTrue(all(row["evals_per_s"] > 0 for row in rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import ai
+import benchmark
+import boardlibrary
+import checkerboard
+import movecache
+
+
+class TestMoveCache(unittest.TestCase):
+
+    def setUp(self):
+        boardlibrary.init_boards()
+
+    def test_same_actions(self):
+        cache = movecache.MoveCache()
+        for (board, player) in benchmark.library_positions():
+            expected = board.get_actions(player)
+            self.assertEqual(list(cache.get_actions(board, player)), expected)
+            self.assertEqual(list(cache.get_actions(board, player)), expected)
+        self.assertEqual(cache.hits, cache.misses)
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+    def test_lru_eviction(self):
+        cache = movecache.MoveCache(limit=2)
+        (a, b, c) = [board for (board, _) in benchmark.sample_positions(3, seed=1)]
+        cache.get_actions(a, 'r')
+        cache.get_actions(b, 'r')
+        cache.get_actions(a, 'r')  # a is now the most recently used
+        cache.get_actions(c, 'r')  # evicts b
+        self.assertEqual(len(cache), 2)
+        self.assertIn((a.pack(), 'r'), cache.entries)
+        self.assertNotIn((b.pack(), 'r'), cache.entries)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        # the player is part of the key
+        cache.get_actions(a, 'b')
+        self.assertEqual(cache.misses, 4)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            movecache.MoveCache(limit=0)
+
+    def test_shared_by_searches(self):
+        cache = movecache.MoveCache(limit=50000)
+        board = boardlibrary.boards["StrategyTest1"]
+        for options in ({}, {"driver": "mtdf"},
+                        {"move_ordering": True, "late_move_reductions": True}):
+            plain = ai.AI('r', checkerboard.CheckerBoard, 6, **options).searching_strategy
+            cached = ai.AI('r', checkerboard.CheckerBoard, 6, move_cache=cache,
+                           **options).searching_strategy
+            self.assertEqual(cached.Iterative_Deepening_Search(board),
+                             plain.Iterative_Deepening_Search(board))
+            self.assertEqual(cached.score, plain.score)
+            self.assertEqual(cached.stats["nodes"], plain.stats["nodes"])
+        self.assertGreater(cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+import ai
+import checkerboard
+import profiling
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_disabled_is_untouched(self):
+        originals = [cls.__dict__[method] for (cls, method) in profiling.targets]
+        with profiling.profiled():
+            self.assertIsNotNone(profiling.active)
+            self.assertIsNot(checkerboard.CheckerBoard.__dict__["get_actions"], originals[1])
+            with self.assertRaises(RuntimeError):
+                profiling.enable()
+        self.assertIsNone(profiling.active)
+        self.assertEqual([cls.__dict__[method] for (cls, method) in profiling.targets], originals)
+
+    def test_spans(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 3)
+        with profiling.profiled() as profile:
+            move = player.searching_strategy.Iterative_Deepening_Search(board)
+        self.assertIn(move, board.get_actions('r'))
+        spans = profile.to_dict()["spans"]
+        for name in ("Minimax.Search", "CheckerBoard.get_actions", "CheckerBoard.move", "AI.utility",
+                     "AI.Edge_Piece_Count"):
+            self.assertGreater(spans[name]["calls"], 0, name)
+        self.assertEqual(spans["Minimax.Search"]["calls"], 2)
+        self.assertEqual(spans["AI.utility"]["calls"], spans["AI.Features"]["calls"])
+        # inclusive time covers the nested spans
+        self.assertGreaterEqual(spans["AI.utility"]["total_us"], spans["AI.Features"]["total_us"])
+        span = profile.spans["AI.utility"]
+        self.assertLessEqual(span.percentile(50), span.percentile(99))
+        self.assertLessEqual(span.percentile(99), span.max)
+
+        searches = profile.to_dict()["searches"]
+        self.assertEqual(len(searches), 2)
+        self.assertEqual(sum(search["AI.utility"]["calls"] for search in searches), spans["AI.utility"]["calls"])
+
+        # self times add up to the time of the outermost spans
+        total = sum(profile.stacks.values())
+        self.assertAlmostEqual(total, profile.spans["Minimax.Search"].total, places=6)
+        for line in profile.collapsed():
+            (stack, micros) = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("Minimax.Search"))
+            self.assertGreaterEqual(int(micros), 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            profile.write_json(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["spans"].keys(), spans.keys())
+            path = os.path.join(directory, "profile.folded")
+            profile.write_collapsed(path)
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(), profile.collapsed())
+        self.assertIn("AI.utility", profile.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
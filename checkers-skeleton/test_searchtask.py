@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import ai
+import checkerboard
+import searchtask
+
+
+class TestSearchTask(unittest.TestCase):
+
+    def test_result_and_iterations(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 4)
+        seen = []
+        task = player.search(board, on_iteration=lambda *update: seen.append(update))
+        updates = list(task.iterations())
+        (new_board, move) = task.result()
+        self.assertEqual([depth for (depth, _, _) in updates], [2, 3, 4])
+        self.assertEqual(updates, seen)
+        self.assertEqual(updates[-1][1], move)
+        self.assertEqual(new_board.pack(), board.move(move).pack())
+        self.assertTrue(task.done())
+        self.assertFalse(task.cancelled())
+
+    def test_cancel(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 30)
+        with ThreadPoolExecutor(1) as executor:
+            task = player.search(board, executor=executor)
+            depth = next(task.iterations())[0]
+            self.assertEqual(depth, 2)
+            start = time.monotonic()
+            task.cancel()
+            (new_board, move) = task.result(timeout=5)
+            self.assertLess(time.monotonic() - start, 0.5)
+        self.assertIn(move, board.get_actions('r'))
+        self.assertEqual(player.searching_strategy.stats["cancelled"], 1)
+        self.assertIsNone(player.searching_strategy.cancel_token)
+        self.assertEqual(player.searching_strategy.max_plies, 30)
+
+    def test_cancel_queued(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 3)
+        release = threading.Event()
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(release.wait)  # keeps the only worker busy
+            task = player.search(board, executor=executor)
+            self.assertTrue(task.future.cancel())
+            release.set()
+            # the iterations end although run never started
+            self.assertEqual(list(task.iterations()), [])
+        self.assertTrue(task.done())
+
+    def test_await(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('b', checkerboard.CheckerBoard, 3)
+
+        async def main():
+            return await player.search(board)
+
+        (new_board, move) = asyncio.run(main())
+        self.assertIn(move, board.get_actions('b'))
+
+    def test_play(self):
+        board = checkerboard.CheckerBoard()
+        player = ai.AI('r', checkerboard.CheckerBoard, 3)
+        (new_board, move) = player.play(board)
+        self.assertIn(move, board.get_actions('r'))
+        self.assertEqual(new_board.pack(), board.move(move).pack())
+        self.assertEqual(player.searching_strategy.stats["depth"], 3)
+
+    def test_token(self):
+        token = searchtask.CancelToken()
+        self.assertFalse(token.cancelled())
+        token.cancel()
+        self.assertTrue(token.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
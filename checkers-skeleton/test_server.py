@@ -0,0 +1,107 @@
+import asyncio
+import json
+import unittest
+
+import checkerboard
+import server
+
+
+def no_move(*args):
+    "A search_move which finds no move"
+    return None, 0.0, 0.0
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.gameserver = server.GameServer(workers=2, maxplies=2)
+        listener = await self.gameserver.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.gameserver.close()
+
+    async def request(self, **request):
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def test_play_moves(self):
+        response = await self.request(op="new", player="r", maxplies=2)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["board"], checkerboard.CheckerBoard().pack())
+        sid = response["session"]
+
+        actions = (await self.request(op="actions", session=sid))["actions"]
+        response = await self.request(op="move", session=sid, action=actions[0])
+        self.assertTrue(response["ok"])
+        self.assertIsNotNone(response["engine_move"])
+        self.assertEqual(response["turn"], "r")
+
+        # the engine has moved, so the client can move again
+        response = await self.request(op="move", session=sid, action=actions[0])
+        self.assertFalse(response["ok"])
+
+        stats = (await self.request(op="stats"))["stats"]
+        self.assertEqual(stats["searches"], 1)
+        self.assertEqual(stats["moves"], 1)
+        self.assertIsNotNone(stats["queue_latency"]["p99"])
+
+    async def test_engine_moves_first(self):
+        response = await self.request(op="new", player="b", maxplies=2, id=7)
+        self.assertEqual(response["id"], 7)
+        self.assertIsNotNone(response["engine_move"])
+        self.assertEqual(response["turn"], "b")
+
+    async def test_time_forfeit(self):
+        response = await self.request(op="new", player="r", maxplies=2, clock=0)
+        sid = response["session"]
+        actions = (await self.request(op="actions", session=sid))["actions"]
+        response = await self.request(op="move", session=sid, action=actions[0])
+        self.assertTrue(response["over"])
+        self.assertEqual(response["winner"], "b")
+        self.assertEqual(response["reason"], "time")
+
+    async def test_bad_requests(self):
+        self.assertFalse((await self.request(op="move", session=99))["ok"])
+        self.assertFalse((await self.request(op="new", player="x"))["ok"])
+        self.assertFalse((await self.request(op="bogus"))["ok"])
+        # a one ply search returns no move, bool is not a depth, deep
+        # untimed searches would occupy the workers
+        for maxplies in (1, True, 0, "3", 40):
+            response = await self.request(op="new", player="b", maxplies=maxplies)
+            self.assertFalse(response["ok"], maxplies)
+            self.assertIn("maxplies", response["error"])
+        for (name, value) in (("clock", "abc"), ("clock", -1), ("increment", "1"),
+                              ("increment", True), ("clock", 1e400)):
+            response = await self.request(op="new", player="r", **{name: value})
+            self.assertFalse(response["ok"], (name, value))
+            self.assertIn(name, response["error"])
+
+    async def test_internal_error(self):
+        "an unexpected exception is reported, the connection keeps working"
+        response = await self.request(op="new", player="r")
+        self.gameserver.sessions[response["session"]].board = None
+        response = await self.request(op="actions", session=response["session"])
+        self.assertFalse(response["ok"])
+        self.assertIn("error", response)
+        self.assertTrue((await self.request(op="stats"))["ok"])
+
+    async def test_no_forfeit_with_moves(self):
+        "the engine plays a legal move when its search returns none"
+        session = server.Session(1, "b", 2)
+        original = server.search_move
+        server.search_move = no_move
+        try:
+            action = await self.gameserver.engine_move(session)
+        finally:
+            server.search_move = original
+        self.assertIn(action, checkerboard.CheckerBoard().get_actions("r"))
+        self.assertFalse(session.over)
+        self.assertEqual(session.turn, "b")
+
+
+if __name__ == '__main__':
+    unittest.main()
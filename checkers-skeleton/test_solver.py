@@ -0,0 +1,70 @@
+import unittest
+
+import boardlibrary
+import checkerboard
+import solver
+
+
+class TestSolver(unittest.TestCase):
+
+    def setUp(self):
+        boardlibrary.init_boards()
+
+    def check_line(self, board, player, line):
+        "the line is legal and ends with a win of player"
+        mover = player
+        for action in line:
+            self.assertIn(action, board.get_actions(mover))
+            board = board.move(action)
+            mover = board.other_player(mover)
+        (terminal, winner) = board.is_terminal()
+        if terminal:
+            self.assertEqual(winner, player)
+        else:
+            # the defender has no move left
+            self.assertEqual(board.get_actions(mover), [])
+            self.assertNotEqual(mover, player)
+
+    def test_endgame(self):
+        board = boardlibrary.boards["EndGame1"]
+        result = solver.solve(board, 'r')
+        self.assertEqual(result["status"], "proven")
+        self.check_line(board, 'r', result["line"])
+        self.assertGreater(result["memory_bytes"], 0)
+        self.assertEqual(solver.solve(board, 'b')["status"], "disproven")
+
+    def test_garbage_collection(self):
+        (board, player, best) = boardlibrary.tactics["Tactic9"]
+        full = solver.solve(board, player)
+        self.assertEqual(full["status"], "proven")
+        self.assertEqual(full["gc_runs"], 0)
+        self.assertEqual(full["line"][0], best)
+        self.check_line(board, player, full["line"])
+
+        small = solver.solve(board, player, table_limit=full["peak_entries"] // 3)
+        self.assertEqual(small["status"], "proven")
+        self.assertGreater(small["gc_runs"], 0)
+        self.assertLessEqual(small["peak_entries"], full["peak_entries"] // 3)
+        self.check_line(board, player, small["line"])
+
+    def test_line_after_node_limit(self):
+        # the proof is collected after the node limit has been used up
+        (board, player, _) = boardlibrary.tactics["Tactic9"]
+        search = solver.Solver(player, node_limit=100000)
+        self.assertEqual(search.solve(board)[0], 0)
+        limit = search.node_limit = search.nodes
+        search.table.clear()
+        line = search.winning_line(board)
+        self.assertTrue(line)
+        self.check_line(board, player, line)
+        self.assertEqual(search.node_limit, limit)
+
+    def test_node_limit(self):
+        result = solver.solve(checkerboard.CheckerBoard(), 'r', node_limit=200)
+        self.assertEqual(result["status"], "unknown")
+        self.assertEqual(result["line"], [])
+        self.assertLessEqual(result["nodes"], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import io
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import ai
+import checkerboard
+import checkers
+import human
+import strategies
+
+
+class TestStrategies(unittest.TestCase):
+
+    def test_resolve(self):
+        self.assertIs(strategies.resolve("ai"), ai.AI)
+        self.assertIs(strategies.resolve("human"), human.Strategy)
+        self.assertIs(strategies.resolve("ai:Minimax"), ai.Minimax)
+        with self.assertRaises(KeyError):
+            strategies.resolve("nosuch")
+        with self.assertRaises(ImportError):
+            strategies.resolve("nosuch_module:Strategy")
+
+    def test_human_hints(self):
+        board = checkerboard.CheckerBoard()
+        player = human.Strategy('r', checkerboard.CheckerBoard, 4)
+        suggested = player.suggestions(board)
+        self.assertEqual(len(suggested), human.Strategy.hint_moves)
+        output = io.StringIO()
+        with mock.patch("charIO.getch", return_value="a"), redirect_stdout(output):
+            (new_board, action) = player.play(board)
+        self.assertEqual(action, board.get_actions('r')[0])
+        self.assertIn("(hint 1, score %d)" % suggested[0][1], output.getvalue())
+
+    def test_register(self):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return ai.AI
+        strategies.register("lazy", loader)
+        try:
+            self.assertEqual(calls, [])  # not loaded until resolved
+            self.assertIn("lazy", strategies.names())
+            self.assertIs(strategies.resolve("lazy"), ai.AI)
+            self.assertIs(strategies.resolve("lazy"), ai.AI)
+            self.assertEqual(calls, [1])
+        finally:
+            del strategies.registry["lazy"]
+            del strategies.resolved["lazy"]
+
+    def test_missing_compiled_module(self):
+        with self.assertRaises(ImportError):
+            strategies.load_compiled("nosuch", "__pycache__/nosuch.cpython-00.pyc")
+
+    def test_lazy_import(self):
+        # importing the entry point loads no strategy and does not touch the terminal
+        code = ("import sys, checkers, charIO; "
+                "print(sorted(m for m in ('ai', 'human', 'termios', 'tty', 'imp', 'boardlibrary') "
+                "if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-W", "error::DeprecationWarning", "-c", code],
+                                capture_output=True, text=True, stdin=subprocess.DEVNULL,
+                                check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_game_and_match(self):
+        with redirect_stdout(io.StringIO()) as output:
+            winner = checkers.Game("ai", "ai", maxplies=2, verbose=False)
+            results = checkers.Match("ai", ai.AI, games=2, maxplies=2)
+        self.assertIn(winner, ('r', 'b', None))
+        self.assertEqual(sum(results.values()), 2)
+        self.assertIn("game 2: ai.AI (red) vs ai (black)", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import ai
+import boardlibrary
+import checkerboard
+import tuner
+
+
+class TestTuner(unittest.TestCase):
+
+    def test_extract_features(self):
+        boardlibrary.init_boards()
+        red = ai.AI('r', checkerboard.CheckerBoard, 1)
+        positions = [(board.pack(), 'r') for board in boardlibrary.boards.values()]
+        X, y = tuner.extract_features(positions, chunk=4)
+        self.assertEqual(X.shape, (len(positions), len(tuner.FEATURES)))
+        self.assertTrue(np.all(y == 1.0))
+        for row, board in zip(X, boardlibrary.boards.values()):
+            self.assertEqual(list(row), red.Features(board))
+            self.assertEqual(int(row @ np.array(ai.AI.default_weights)), red.utility(board))
+
+    def test_fit_recovers_weights(self):
+        rng = np.random.default_rng(1)
+        X = rng.normal(0, [50, 50, 10, 10, 10], size=(20000, 5))
+        true_weights = np.array([3.0, 1.0, 4.0, 8.0, -2.0])
+        K = 0.01
+        y = (rng.random(len(X)) < 1 / (1 + np.exp(-K * (X @ true_weights)))).astype(float)
+
+        weights, K_fit, final = tuner.fit(X, y, K=K)
+        self.assertLess(final, tuner.loss(X, y, ai.AI.default_weights, K))
+        np.testing.assert_allclose(weights, true_weights, rtol=0.2)
+
+        # minibatches give the same answer
+        batched, _, _ = tuner.fit(X, y, K=K, batch_size=3000)
+        np.testing.assert_allclose(batched, weights, rtol=1e-6)
+
+        # fitted scale is positive and improves on the starting scale
+        K_scaled = tuner.fit_scale(X, y, true_weights, K=0.1)
+        self.assertLess(abs(K_scaled - K), 0.002)
+
+    def test_weight_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "weights.json")
+            tuner.save_weights(path, [1.5, 2, 3, 4, 5], K=0.01)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["K"], 0.01)
+            strategy = ai.AI('b', checkerboard.CheckerBoard, 2, weights=path)
+            self.assertEqual(strategy.weights, (1.5, 2, 3, 4, 5))
+        with self.assertRaises(ValueError):
+            ai.AI('b', checkerboard.CheckerBoard, 2, weights=[1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
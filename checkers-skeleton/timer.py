@@ -1,24 +1,36 @@
-import time
-
-class Timer:
-    """Timer class
-    Usage:
-      t = Timer()
-      # figure out how long it takes to do stuff...
-      elapsed_s = t.elapsed_s() OR elapsed_min = t.elapsed_min()
-    """
-    def __init__(self):
-        "Timer - Start a timer"
-        self.s_per_min = 60.0  # Number seconds per minute
-        self.start = time.time()
-
-    def elapsed_s(self):
-        "elapsed_s - Seconds elapsed since start (wall clock time)"
-        return time.time() - self.start
-
-    def elapsed_min(self):
-        "elapsed_min - Minutes elapsed since start (wall clock time)"
-
-        # Get elapsed seconds and convert to minutes
-        return self.elapsed_s() / self.s_per_min
-
+import time
+
+class Timer:
+    """Timer class
+    Usage:
+      t = Timer()
+      # figure out how long it takes to do stuff...
+      elapsed_s = t.elapsed_s() OR elapsed_min = t.elapsed_min()
+    """
+    def __init__(self):
+        "Timer - Start a timer"
+        self.s_per_min = 60.0  # Number seconds per minute
+        self.start = time.time()
+
+    def elapsed_s(self):
+        "elapsed_s - Seconds elapsed since start (wall clock time)"
+        return time.time() - self.start
+
+    def elapsed_min(self):
+        "elapsed_min - Minutes elapsed since start (wall clock time)"
+
+        # Get elapsed seconds and convert to minutes
+        return self.elapsed_s() / self.s_per_min
+
+
+def percentile(samples, pct):
+    """percentile(samples, pct) - Nearest-rank percentile of a sequence
+    of timings, e.g. percentile(times, 99).  Returns None when there are
+    no samples.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    # nearest rank, 1-based
+    rank = max(1, int(-(-pct * len(ordered) // 100)))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,215 @@
+'''
+tuner - Texel style tuning of the ai.AI evaluation weights
+
+The utility of ai.AI is a weighted sum of five features (see
+AI.Features).  Given a large set of positions labelled with the result
+of the game they were taken from, the weights are fitted by minimizing
+the logistic loss between the game result and
+
+    sigmoid(K * utility(position))
+
+where K scales utilities to winning probabilities.  K is first fitted
+with the current weights and then held fixed, so the tuned weights stay
+in the same units as the hand picked ones and can be used directly by
+the search.
+
+All arithmetic is vectorized with NumPy.  The fit makes Newton steps on
+the five weights, the gradient and Hessian are accumulated over
+minibatches so that very large datasets (e.g. memory-mapped arrays)
+never have to be copied in one piece.
+
+Dataset files are JSON lines, one labelled position per line:
+    {"board": "bbbbbbbbbbbb........rrrrrrrrrrrr", "winner": "r"}
+where board is in CheckerBoard.pack() format and winner is "r", "b" or
+null for a draw.
+
+Usage:
+    python tuner.py positions.jsonl -o weights.json
+    then ai.AI('r', checkerboard.CheckerBoard, 8, weights="weights.json")
+'''
+
+import argparse
+import itertools
+import json
+
+import numpy as np
+
+import ai
+import checkerboard
+import features
+from features import FEATURES  # names of the features of AI.Features
+
+
+def label(winner):
+    "label - Game result from red's point of view, 1 win, 0.5 draw, 0 loss"
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == checkerboard.CheckerBoard.pawns[0] else 0.0
+
+
+def extract_features(positions, chunk=65536):
+    """extract_features - Build the feature matrix and labels
+    positions - iterable of (board, winner) where board is a CheckerBoard
+        or a packed string and winner is 'r', 'b' or None
+    chunk - positions converted at a time
+    Returns (X, y), X is an N x 5 array of features from red's point of
+    view (computed in bulk by features.scalar_features) and y holds the
+    labels (see label()).  The evaluation is antisymmetric so black's
+    utility is the negation of red's.
+    """
+    red = checkerboard.CheckerBoard.pawns[0]
+    Xs = []
+    ys = []
+    positions = iter(positions)
+    while True:
+        block = list(itertools.islice(positions, chunk))
+        if not block:
+            break
+        (boards, winners) = zip(*block)
+        codes = features.encode(boards)
+        Xs.append(features.scalar_features(codes, features.player_indices(red, len(codes))))
+        ys.append(np.array([label(w) for w in winners]))
+    if not Xs:
+        return (np.empty((0, len(FEATURES))), np.empty(0))
+    return (np.concatenate(Xs), np.concatenate(ys))
+
+
+def batches(n, batch_size):
+    "batches - slices covering range(n) in steps of batch_size"
+    step = batch_size or max(n, 1)
+    return [slice(i, min(i + step, n)) for i in range(0, n, step)]
+
+
+def loss(X, y, weights, K, batch_size=None):
+    """loss - Mean logistic loss (cross entropy) of the predictions
+    sigmoid(K * X . weights) against the labels y
+    """
+    weights = np.asarray(weights, dtype=float)
+    total = 0.0
+    for s in batches(len(y), batch_size):
+        z = K * (X[s] @ weights)
+        # log(sigmoid(z)) = -log(1 + exp(-z)), computed without overflow
+        total += np.sum(y[s] * np.logaddexp(0, -z) +
+                        (1 - y[s]) * np.logaddexp(0, z))
+    return total / len(y)
+
+
+def fit_scale(X, y, weights, K=0.01, iterations=50, batch_size=None):
+    """fit_scale - Find the scale K minimizing the loss for fixed weights
+    Newton's method on K with step halving.
+    """
+    weights = np.asarray(weights, dtype=float)
+    current = loss(X, y, weights, K, batch_size)
+    for _ in range(iterations):
+        gradient = hessian = 0.0
+        for s in batches(len(y), batch_size):
+            u = X[s] @ weights
+            p = 1.0 / (1.0 + np.exp(-K * u))
+            gradient += np.sum((p - y[s]) * u)
+            hessian += np.sum(p * (1 - p) * u * u)
+        if hessian <= 0:
+            break
+        step = gradient / hessian
+        while True:
+            candidate = K - step
+            if candidate > 0:
+                new = loss(X, y, weights, candidate, batch_size)
+                if new <= current:
+                    break
+            step /= 2
+            if abs(step) < 1e-12:
+                return K
+        converged = abs(candidate - K) < 1e-9 * K
+        (K, current) = (candidate, new)
+        if converged:
+            break
+    return K
+
+
+def fit(X, y, weights=None, K=None, iterations=25, batch_size=None,
+        ridge=1e-6, tolerance=1e-9):
+    """fit - Tune the weights by minimizing the logistic loss
+    X, y - features and labels (see extract_features), may be memmaps
+    weights - starting weights (default AI.default_weights)
+    K - utility scale, fitted to the starting weights when None
+    iterations - maximum Newton steps
+    batch_size - rows per minibatch when accumulating the gradient and
+        Hessian (default all rows at once)
+    ridge - small L2 penalty keeping the Hessian invertible, e.g. when
+        a feature is always zero in the dataset
+    Returns (weights, K, loss)
+    """
+    weights = np.array(ai.AI.default_weights if weights is None else weights,
+                       dtype=float)
+    if K is None:
+        K = fit_scale(X, y, weights, batch_size=batch_size)
+    n = len(y)
+    current = loss(X, y, weights, K, batch_size)
+    for _ in range(iterations):
+        gradient = np.zeros_like(weights)
+        hessian = np.zeros((len(weights), len(weights)))
+        for s in batches(n, batch_size):
+            Xs = X[s]
+            p = 1.0 / (1.0 + np.exp(-K * (Xs @ weights)))
+            gradient += K * (Xs.T @ (p - y[s]))
+            hessian += K * K * ((Xs.T * (p * (1 - p))) @ Xs)
+        gradient = gradient / n + ridge * weights
+        hessian = hessian / n + ridge * np.eye(len(weights))
+        step = np.linalg.solve(hessian, gradient)
+        # Newton step, halved until the loss does not increase
+        scale = 1.0
+        while scale > 1e-6:
+            candidate = weights - scale * step
+            new = loss(X, y, candidate, K, batch_size)
+            if new <= current:
+                break
+            scale /= 2
+        else:
+            break
+        (weights, improvement, current) = (candidate, current - new, new)
+        if improvement < tolerance:
+            break
+    return (weights, K, current)
+
+
+def save_weights(path, weights, **info):
+    """save_weights - Write a weight file loadable with
+    ai.AI(..., weights=path).  Additional keyword arguments are stored
+    for reference (e.g. K and loss).
+    """
+    record = {"weights": [float(w) for w in weights], "features": FEATURES}
+    record.update(info)
+    with open(path, "w") as f:
+        json.dump(record, f, indent=2)
+
+
+def read_dataset(f):
+    "read_dataset - Lazily read (packed board, winner) pairs from JSON lines"
+    for line in f:
+        if line.strip():
+            position = json.loads(line)
+            yield (position["board"], position.get("winner"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune AI evaluation weights")
+    parser.add_argument("dataset", help="JSON lines labelled positions")
+    parser.add_argument("-o", "--output", required=True, help="weight file")
+    parser.add_argument("--weights", help="starting weight file")
+    parser.add_argument("--iterations", type=int, default=25)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.dataset) as f:
+        (X, y) = extract_features(read_dataset(f))
+    start = ai.AI.Load_Weights(args.weights) if args.weights else ai.AI.default_weights
+    (weights, K, final) = fit(X, y, start, iterations=args.iterations,
+                              batch_size=args.batch_size)
+    print("%d positions, K %g, loss %.6f -> %.6f" % (
+        len(y), K, loss(X, y, start, K), final))
+    print(", ".join("%s %.4f" % item for item in zip(FEATURES, weights)))
+    save_weights(args.output, weights, K=K, loss=final, positions=len(y))
+
+
+if __name__ == "__main__":
+    main()